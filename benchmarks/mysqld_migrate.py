@@ -0,0 +1,73 @@
+# Applies a generated migration set against a throwaway local MySQL instance
+# once per connection mode and prints the wall time of each run.
+#
+#   python benchmarks/mysqld_migrate.py --migrations 200 --rows 500
+#
+# Requires mysqld-integration-test and a local mysqld binary.
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from mysqld_integration_test import Mysqld
+
+from pyway.configfile import ConfigFile
+from pyway.migrate import Migrate
+
+MODES: Dict[str, Dict[str, str]] = {
+    "pure": {"mysql_use_pure": "true", "mysql_compress": "false"},
+    "cext": {"mysql_use_pure": "false", "mysql_compress": "false"},
+    "cext+compress": {"mysql_use_pure": "false", "mysql_compress": "true"},
+}
+
+
+def generate_migrations(path: str, migrations: int, rows: int) -> None:
+    for i in range(1, migrations + 1):
+        statements: List[str] = [f"CREATE TABLE bench_{i} (id INT PRIMARY KEY, payload VARCHAR(255));"]
+        for row in range(rows):
+            statements.append(f"INSERT INTO bench_{i} (id, payload) VALUES ({row}, '{'x' * 200}');")
+        major, minor = divmod(i, 100)
+        with open(os.path.join(path, f"V{major + 1:02}_{minor:02}__bench_{i}.sql"), "w", encoding="utf-8") as f:
+            f.write("\n".join(statements))
+
+
+def run_mode(migration_dir: str, options: Dict[str, str]) -> float:
+    mysqld = Mysqld().run()
+    config = ConfigFile()
+    config.database_type = "mysql"
+    config.database_host = mysqld.host
+    config.database_username = mysqld.username
+    config.database_password = mysqld.password
+    config.database_port = mysqld.port
+    config.database_name = "test"
+    config.database_table = "pyway"
+    config.database_migration_dir = migration_dir
+    for key, value in options.items():
+        setattr(config, key, value)
+
+    start = time.perf_counter()
+    Migrate(config).run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--migrations", type=int, default=100, help="Number of migration files")
+    parser.add_argument("--rows", type=int, default=500, help="Insert statements per migration file")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes to run")
+    args = parser.parse_args()
+
+    migration_dir = tempfile.mkdtemp(prefix="pyway-bench-")
+    try:
+        generate_migrations(migration_dir, args.migrations, args.rows)
+        for mode in args.modes.split(","):
+            elapsed = run_mode(migration_dir, MODES[mode])
+            print(f"{mode:<15} {elapsed:8.2f}s  ({args.migrations} migrations, {args.rows} statements each)")
+    finally:
+        shutil.rmtree(migration_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import re
+from typing import Any, List
+
+from pyway.log import logger
+from pyway.splitter import LEADING
+
+
+NAME = r"((?:[\w$]+|\"[^\"]+\"|`[^`]+`)(?:\.(?:[\w$]+|\"[^\"]+\"|`[^`]+`))*)"
+# Statements that change the rows (or the physical layout) of a table
+TOUCHING = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+    r"INSERT\s+(?:IGNORE\s+|OR\s+\w+\s+)?INTO\s+" + NAME,
+    r"REPLACE\s+INTO\s+" + NAME,
+    r"UPDATE\s+(?:ONLY\s+)?" + NAME,
+    r"DELETE\s+FROM\s+(?:ONLY\s+)?" + NAME,
+    r"MERGE\s+INTO\s+" + NAME,
+    r"TRUNCATE\s+(?:TABLE\s+)?" + NAME,
+    r"COPY\s+" + NAME + r"\s*(?:\([^)]*\))?\s+FROM\b",
+    r"LOAD\s+DATA\s+.*?\bINTO\s+TABLE\s+" + NAME,
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?" + NAME + r"\s+AS\b",
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\b[^;]*?\bON\s+(?:ONLY\s+)?" + NAME,
+    r"ALTER\s+TABLE\s+(?:ONLY\s+)?" + NAME,
+)]
+ANALYZE_STATEMENTS = {
+    "postgres": "ANALYZE {table}",
+    "psycopg": "ANALYZE {table}",
+    "sqlite": "ANALYZE {table}",
+    "duckdb": "ANALYZE {table}",
+    "mysql": "ANALYZE TABLE {table}",
+    "oracle": "BEGIN DBMS_STATS.GATHER_TABLE_STATS({owner}, {table}); END;",
+}
+# Run once after the tables were analyzed
+ANALYZE_FINALLY = {"sqlite": ["PRAGMA optimize"]}
+
+
+# Refreshes planner statistics of the tables a run of migrations wrote to, so
+# queries do not run on stale plans until autovacuum (or its equivalent)
+# catches up. Tables are found by matching the statements of .sql migrations
+# and the targets of data files; Python migrations are not looked into.
+class Analyze():
+
+    def __init__(self, db: Any, dialect: str) -> None:
+        self._db = db
+        self.dialect = dialect
+
+    @staticmethod
+    def tables(statements: List[str]) -> List[str]:
+        tables: List[str] = []
+        for statement in statements:
+            statement = statement[LEADING.match(statement).end():]  # type: ignore[union-attr]
+            for pattern in TOUCHING:
+                match = pattern.match(statement)
+                if match is not None:
+                    if match.group(1) not in tables:
+                        tables.append(match.group(1))
+                    break
+        return tables
+
+    def run(self, tables: List[str]) -> None:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            for table in tables:
+                # Statistics are an optimization; a table dropped later in the run must not fail it
+                try:
+                    self._execute(cnx, cursor, self.statement(table))
+                    logger.info(f"  analyzed {table}")
+                except Exception as error:
+                    logger.error(f"  could not analyze {table}: {error}")
+                    if self.dialect != "duckdb":
+                        cnx.rollback()
+            for statement in ANALYZE_FINALLY.get(self.dialect, []):
+                self._execute(cnx, cursor, statement)
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+
+    def statement(self, table: str) -> str:
+        if self.dialect != "oracle":
+            return ANALYZE_STATEMENTS[self.dialect].format(table=table)
+        # DBMS_STATS takes the owner and table as names, upper case unless quoted
+        names = [name[1:-1] if name.startswith('"') else name.upper() for name in table.split(".")]
+        owner = f"'{names[0]}'" if len(names) > 1 else "USER"
+        return ANALYZE_STATEMENTS[self.dialect].format(owner=owner, table=f"'{names[-1]}'")
+
+    @staticmethod
+    def _execute(cnx: Any, cursor: Any, statement: str) -> None:
+        cursor.execute(statement)
+        if cursor.description is not None:
+            cursor.fetchall()
+        cnx.commit()
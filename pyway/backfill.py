@@ -0,0 +1,168 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Set, Tuple
+
+from pyway.batch import placeholders
+from pyway.errors import BACKFILL_RANGE_MISSING
+from pyway.log import logger
+from pyway.throttle import Throttle
+
+
+BACKFILL_CHUNK_SIZE = 10000
+BACKFILL_WORKERS = 1
+BACKFILL_TABLE_SUFFIX = "_backfill"
+PROGRESS_INTERVAL = 5.0
+CREATE_BACKFILL_TABLE = "create table %s ("\
+    "name varchar(250) NOT NULL,"\
+    "chunk_start %s NOT NULL,"\
+    "chunk_end %s NOT NULL,"\
+    "rows_affected %s NOT NULL,"\
+    "PRIMARY KEY (name, chunk_start)"\
+    ")"
+BIGINT_TYPES = {"oracle": "number(19)"}
+SELECT_CHECKPOINTS = "select chunk_start from %s where name = %s"
+INSERT_CHECKPOINT = "insert into %s (name, chunk_start, chunk_end, rows_affected) values (%s)"
+DELETE_CHECKPOINTS = "delete from %s where name = %s"
+SELECT_KEY_RANGE = "select min(%s), max(%s) from %s"
+
+
+# Runs an UPDATE over an integer key range in chunks of chunk_size keys. Each
+# chunk commits on its own together with a checkpoint row, so a killed run
+# skips the finished chunks next time. Workers use separate connections and
+# wait on the throttle, if any, between chunks.
+class Backfill():
+
+    def __init__(self, db: Any, dialect: str, paramstyle: str, version_table: str, name: str,
+                 throttle: Optional[Throttle] = None) -> None:
+        self._db = db
+        self.throttle = throttle
+        self.dialect = dialect
+        self.paramstyle = paramstyle
+        self.checkpoint_table = f"{version_table}{BACKFILL_TABLE_SUFFIX}"
+        self.name = name
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+
+    def run(self, table: str, key: str, statement: str, chunk_size: int = BACKFILL_CHUNK_SIZE,
+            workers: int = BACKFILL_WORKERS) -> int:
+        if "{start}" not in statement or "{end}" not in statement:
+            raise ValueError(BACKFILL_RANGE_MISSING % self.name)
+
+        low, high = self._key_range(table, key)
+        if low is None:
+            return 0
+        # Chunks are aligned on multiples of chunk_size so a resumed run gets the same boundaries
+        first = int(low) // chunk_size * chunk_size
+        done = self._checkpoints()
+        pending: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+        for start in range(first, int(high) + 1, chunk_size):
+            if start not in done:
+                pending.put((start, start + chunk_size))
+
+        self.total = pending.qsize()
+        self.chunks = 0
+        self.rows = 0
+        self._started = self._reported = time.monotonic()
+        logger.info(f"  backfill {self.name}: {self.total} chunks of {chunk_size} on {table}.{key}"
+                    f" ({len(done)} done before), {workers} workers")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._work, pending, statement) for _ in range(min(workers, self.total))]
+            for future in futures:
+                future.result()
+
+        self.clear()
+        return self.rows
+
+    def _work(self, pending: "queue.Queue[Tuple[int, int]]", statement: str) -> None:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            while not self._failed.is_set():
+                try:
+                    start, end = pending.get_nowait()
+                except queue.Empty:
+                    return
+                if self.dialect == "duckdb":
+                    cnx.begin()
+                cursor.execute(statement.replace("{start}", str(start)).replace("{end}", str(end)))
+                # DuckDB reports the updated row count as a result row
+                rows = cursor.fetchone()[0] if self.dialect == "duckdb" else max(cursor.rowcount, 0)
+                cursor.execute(INSERT_CHECKPOINT % (self.checkpoint_table, placeholders(self.paramstyle, 4)),
+                               [self.name, start, end, rows])
+                cnx.commit()
+                self._progress(rows)
+                if self.throttle is not None:
+                    self.throttle.wait()
+        except Exception:
+            self._failed.set()
+            raise
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+            if self.throttle is not None:
+                self.throttle.release()
+
+    def _progress(self, rows: int) -> None:
+        with self._lock:
+            self.chunks += 1
+            self.rows += rows
+            now = time.monotonic()
+            if self.chunks < self.total and now - self._reported < PROGRESS_INTERVAL:
+                return
+            self._reported = now
+            elapsed = now - self._started
+            rate = self.rows / elapsed if elapsed > 0 else 0.0
+            eta = elapsed / self.chunks * (self.total - self.chunks)
+            logger.info(f"  backfill {self.name}: {self.chunks}/{self.total} chunks, {self.rows} rows,"
+                        f" {rate:.0f} rows/s, ETA {eta:.0f}s")
+
+    def _key_range(self, table: str, key: str) -> Tuple[Any, Any]:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(SELECT_KEY_RANGE % (key, key, table))
+            low, high = cursor.fetchone()
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+        return low, high
+
+    def _checkpoints(self) -> Set[int]:
+        # The checkpoint table is created on first use, next to the version table
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            try:
+                cursor.execute(SELECT_CHECKPOINTS % (self.checkpoint_table, placeholders(self.paramstyle, 1)),
+                               [self.name])
+                done = {int(row[0]) for row in cursor.fetchall()}
+            except Exception:
+                if self.dialect != "duckdb":
+                    cnx.rollback()
+                bigint = BIGINT_TYPES.get(self.dialect, "bigint")
+                cursor.execute(CREATE_BACKFILL_TABLE % (self.checkpoint_table, bigint, bigint, bigint))
+                done = set()
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+        return done
+
+    def clear(self) -> None:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(DELETE_CHECKPOINTS % (self.checkpoint_table, placeholders(self.paramstyle, 1)),
+                           [self.name])
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
@@ -0,0 +1,132 @@
+import re
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple, Union
+
+
+BATCH_SIZE = 1000
+# Single-row "INSERT INTO t (a, b) VALUES (1, 'x')" with literal values only
+INSERT_VALUES = re.compile(r"INSERT\s+INTO\s+([^\s(]+)\s*(\([^()]*\))?\s*VALUES\s*\((.*)\)$",
+                           re.IGNORECASE | re.DOTALL)
+LITERAL = re.compile(r"\s*(?:'((?:[^']|'')*)'|([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(NULL))\s*(,|$)",
+                     re.IGNORECASE | re.DOTALL)
+PLACEHOLDERS = {"format": "%s", "qmark": "?"}
+
+
+def placeholders(paramstyle: str, count: int, offset: int = 0) -> str:
+    if paramstyle == "numeric":
+        return ", ".join(f":{offset + i + 1}" for i in range(count))
+    return ", ".join([PLACEHOLDERS[paramstyle]] * count)
+
+
+class Batch():
+    def __init__(self, table: str, columns: str, rows: List[Tuple]) -> None:
+        self.table = table
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def width(self) -> int:
+        return len(self.rows[0])
+
+    def sql(self, paramstyle: str, rows: int = 1) -> str:
+        # One placeholder group per row, for executemany or a multi-row VALUES list
+        groups = [placeholders(paramstyle, self.width, row * self.width) for row in range(rows)]
+        columns = f" {self.columns}" if self.columns else ""
+        values = ", ".join(f"({group})" for group in groups)
+        return f"INSERT INTO {self.table}{columns} VALUES {values}"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __str__(self) -> str:
+        return f"INSERT INTO {self.table} ({len(self.rows)} rows)"
+
+
+# Collapses runs of same-shape single-row INSERTs into batches that can be
+# sent with executemany. Anything it does not fully understand is left as is.
+class Batcher():
+
+    def __init__(self, dialect: str, batch_size: int = BATCH_SIZE) -> None:
+        self.dialect = dialect
+        self.batch_size = batch_size
+
+    def group(self, statements: List[str]) -> List[Union[str, Batch]]:
+        grouped: List[Union[str, Batch]] = []
+        pending: List[Tuple[str, Tuple]] = []
+        shape: Tuple = ()
+        for statement in statements:
+            parsed = self.parse(statement)
+            if pending:
+                merged = self._merge(shape, parsed[0]) if parsed is not None else None
+                if merged is None or len(pending) >= self.batch_size:
+                    self._flush(grouped, pending, shape)
+                else:
+                    shape = merged
+            if parsed is None:
+                grouped.append(statement)
+                continue
+            if not pending:
+                shape = parsed[0]
+            pending.append((statement, parsed[1]))
+        if pending:
+            self._flush(grouped, pending, shape)
+        return grouped
+
+    @staticmethod
+    def _merge(shape: Tuple, other: Tuple) -> Optional[Tuple]:
+        # NULL fits any column; otherwise table, columns and literal kinds must match
+        if shape[:2] != other[:2] or len(shape[2]) != len(other[2]):
+            return None
+        kinds = []
+        for kind, other_kind in zip(shape[2], other[2]):
+            if kind != other_kind and "null" not in (kind, other_kind):
+                return None
+            kinds.append(other_kind if kind == "null" else kind)
+        return shape[0], shape[1], tuple(kinds)
+
+    @staticmethod
+    def _flush(grouped: List[Union[str, Batch]], pending: List[Tuple[str, Tuple]], shape: Tuple) -> None:
+        if len(pending) == 1:
+            grouped.append(pending[0][0])
+        else:
+            grouped.append(Batch(shape[0], shape[1], [row for _, row in pending]))
+        pending.clear()
+
+    def parse(self, statement: str) -> Optional[Tuple[Tuple, Tuple]]:
+        match = INSERT_VALUES.match(statement)
+        if match is None:
+            return None
+        table, columns, values = match.group(1), match.group(2) or "", match.group(3)
+
+        row: List[Any] = []
+        kinds: List[str] = []
+        pos = 0
+        separator = ","
+        while separator == ",":
+            literal = LITERAL.match(values, pos)
+            if literal is None:
+                return None
+            string, number, null, separator = literal.groups()
+            if string is not None:
+                if self.dialect == "mysql" and "\\" in string:
+                    return None
+                row.append(string.replace("''", "'"))
+                kinds.append("str")
+            elif number is not None:
+                row.append(self._number(number))
+                kinds.append("num")
+            else:
+                row.append(None)
+                kinds.append("null")
+            pos = literal.end()
+            if separator == "," and pos >= len(values):
+                return None
+
+        shape = (table, " ".join(columns.split()), tuple(kinds))
+        return shape, tuple(row)
+
+    def _number(self, literal: str) -> Any:
+        if literal.lstrip("+-").isdigit():
+            return int(literal)
+        # sqlite3 cannot bind Decimal; SQLite reads non-integer literals as REAL anyway
+        return float(literal) if self.dialect == "sqlite" else Decimal(literal)
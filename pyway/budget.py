@@ -0,0 +1,70 @@
+import time
+from typing import Dict, List, Optional
+
+from pyway.configfile import ConfigFile
+from pyway.directives import Directives
+from pyway.helpers import Utils
+from pyway.log import logger
+from pyway.migration import Migration
+
+
+# Databases whose pending migrations can be timed by a dry run
+DRY_RUN_DIALECTS = ("sqlite", "duckdb", "postgres", "psycopg")
+
+
+# Keeps migrate inside a fixed maintenance window: a migration only starts
+# when its predicted duration fits in what is left of the budget, otherwise
+# the run stops at that migration boundary. Predictions come from the
+# "-- pyway:estimate=<duration>" directive of a migration, else from the
+# execution time recorded for its failed attempts, else, with budget_dry_run,
+# from a dry run of the pending migrations where the database supports one.
+# The budget counts from the start of migrate, the dry run included. A
+# migration without a prediction starts as long as any budget is left.
+class Budget():
+
+    def __init__(self, seconds: float, dry_run: bool = False) -> None:
+        self.seconds = seconds
+        self.dry_run = dry_run
+        self.started = time.monotonic()
+        self.predictions: Dict[str, Optional[float]] = {}
+
+    @staticmethod
+    def from_config(config: ConfigFile) -> Optional['Budget']:
+        if not config.time_budget:
+            return None
+        return Budget(Utils.to_milliseconds(config.time_budget) / 1000, Utils.to_bool(config.budget_dry_run))
+
+    def remaining(self) -> float:
+        return self.seconds - (time.monotonic() - self.started)
+
+    def predict(self, config: ConfigFile, migrations: List[Migration], paths: List[str],
+                history: Optional[List[Migration]] = None) -> None:
+        # Rows of pending migrations are failed attempts, which ran for at least that long
+        recorded: Dict[str, float] = {}
+        for row in history or []:
+            if row.execution_time_ms is not None:
+                recorded[row.version] = max(recorded.get(row.version, 0.0), row.execution_time_ms / 1000)
+        for migration, path in zip(migrations, paths):
+            estimate = Directives.read(path)[0].get("estimate")
+            self.predictions[migration.name] = Utils.to_milliseconds(estimate) / 1000 if estimate \
+                else recorded.get(migration.version)
+        if self.dry_run and str(config.database_type) in DRY_RUN_DIALECTS \
+                and any(self.predictions[m.name] is None for m in migrations):
+            # The dry run imports Migrate, which uses the budget
+            from pyway.dryrun import DryRun
+            dry_run = DryRun(config)
+            dry_run.run()
+            for name, seconds in dry_run.timings.items():
+                if self.predictions.get(name) is None:
+                    self.predictions[name] = seconds
+            logger.info(f"Dry run took {dry_run.elapsed:.1f}s")
+
+    def refuse(self, stage: List[Migration]) -> Optional[str]:
+        # Returns why the stage must not start, if it must not. A group runs
+        # concurrently, so it takes as long as its slowest migration.
+        predicted = max(self.predictions.get(m.name) or 0.0 for m in stage)
+        remaining = self.remaining()
+        if remaining > 0 and predicted <= remaining:
+            return None
+        return f"Stopping before {stage[0].name}: predicted {predicted:.1f}s, " \
+               f"{max(remaining, 0):.1f}s of the time budget left"
@@ -0,0 +1,125 @@
+from typing import Any, Dict, List, Tuple
+
+from pyway.configfile import ConfigFile
+from pyway.errors import BULK_INTEGRITY_FAILED, DIRECTIVE_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.log import logger
+
+
+# Session settings for loading data fast: the query reading the current value,
+# the statement setting it (formatted with the value) and the bulk value.
+# SQLite's journal mode is stored in the database file; the rest only lasts as
+# long as the connection (DuckDB's holds for the open database).
+BULK_SETTINGS = {
+    "sqlite": [("PRAGMA journal_mode", "PRAGMA journal_mode = {}", "WAL"),
+               ("PRAGMA synchronous", "PRAGMA synchronous = {}", "OFF"),
+               ("PRAGMA foreign_keys", "PRAGMA foreign_keys = {}", "OFF")],
+    "mysql": [("SELECT @@SESSION.foreign_key_checks", "SET SESSION foreign_key_checks = {}", "0"),
+              ("SELECT @@SESSION.unique_checks", "SET SESSION unique_checks = {}", "0")],
+    "postgres": [("SHOW session_replication_role", "SET session_replication_role = {}", "replica"),
+                 ("SHOW synchronous_commit", "SET synchronous_commit = {}", "off")],
+    "duckdb": [("SELECT current_setting('preserve_insertion_order')", "SET preserve_insertion_order = {}", "false")],
+}
+BULK_SETTINGS["psycopg"] = BULK_SETTINGS["postgres"]
+# Foreign keys that were not enforced while loading; SQLite checks them itself, for MySQL and
+# Postgres each constraint is checked with an anti-join (child table, columns, parent table, columns)
+FOREIGN_KEY_CHECK = "PRAGMA foreign_key_check"
+FOREIGN_KEYS = {
+    "mysql": "SELECT constraint_name, CONCAT('`', table_schema, '`.`', table_name, '`'), "
+             "GROUP_CONCAT(CONCAT('`', column_name, '`') ORDER BY ordinal_position), "
+             "CONCAT('`', referenced_table_schema, '`.`', referenced_table_name, '`'), "
+             "GROUP_CONCAT(CONCAT('`', referenced_column_name, '`') ORDER BY ordinal_position) "
+             "FROM information_schema.key_column_usage "
+             "WHERE table_schema = DATABASE() AND referenced_table_name IS NOT NULL "
+             "GROUP BY constraint_name, table_schema, table_name, referenced_table_schema, referenced_table_name",
+    "postgres": "SELECT c.conname, c.conrelid::regclass::text, "
+                "(SELECT string_agg(quote_ident(a.attname), ',' ORDER BY k.n) FROM unnest(c.conkey) "
+                "WITH ORDINALITY k(attnum, n) JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum), "
+                "c.confrelid::regclass::text, "
+                "(SELECT string_agg(quote_ident(a.attname), ',' ORDER BY k.n) FROM unnest(c.confkey) "
+                "WITH ORDINALITY k(attnum, n) JOIN pg_attribute a ON a.attrelid = c.confrelid AND a.attnum = k.attnum) "
+                "FROM pg_constraint c JOIN pg_namespace s ON s.oid = c.connamespace "
+                "WHERE c.contype = 'f' AND s.nspname NOT IN ('pg_catalog', 'information_schema')",
+}
+FOREIGN_KEYS["psycopg"] = FOREIGN_KEYS["postgres"]
+
+
+# Runs data migrations with the database's safety nets lowered (no foreign
+# key checks, no waiting for the disk on commit) and puts the settings back
+# afterwards. The constraints that were skipped are checked once, after all
+# migrations of the run.
+class BulkLoad():
+
+    def __init__(self, dialect: str) -> None:
+        self.dialect = dialect
+        self.restore: List[str] = []
+
+    @staticmethod
+    def enabled(config: ConfigFile, directives: Dict[str, str], name: str) -> bool:
+        # "-- pyway:bulk=" of a migration wins over bulk_load; only the directive insists on support
+        dialect = str(config.database_type)
+        if "bulk" in directives:
+            bulk = bool(Utils.to_bool(directives["bulk"]))
+            if bulk and dialect not in BULK_SETTINGS:
+                raise ValueError(DIRECTIVE_NOT_SUPPORTED % (name, "bulk", dialect))
+            return bulk
+        return bool(Utils.to_bool(config.bulk_load)) and dialect in BULK_SETTINGS
+
+    def apply(self, cursor: Any) -> None:
+        for query, statement, value in BULK_SETTINGS.get(self.dialect, []):
+            cursor.execute(query)
+            current = cursor.fetchone()[0]
+            cursor.execute(statement.format(value))
+            if cursor.description is not None:
+                cursor.fetchall()
+            self.restore.append(statement.format(current))
+
+    def reset(self, cursor: Any) -> None:
+        # Runs after the migration committed or failed; the connection is closed next either way
+        for statement in reversed(self.restore):
+            try:
+                cursor.execute(statement)
+                if cursor.description is not None:
+                    cursor.fetchall()
+            except Exception as error:
+                logger.error(f"  could not restore [{statement}]: {error}")
+        self.restore = []
+
+    @staticmethod
+    def check(db: Any, dialect: str) -> None:
+        cnx = db.connect()
+        cursor = cnx if dialect == "duckdb" else cnx.cursor()
+        try:
+            violations = BulkLoad._violations(cursor, dialect)
+            if dialect != "duckdb":
+                cnx.rollback()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+        if violations:
+            raise ValueError(BULK_INTEGRITY_FAILED % ", ".join(f"{name} ({count} rows)" for name, count in violations))
+
+    @staticmethod
+    def _violations(cursor: Any, dialect: str) -> List[Tuple[str, int]]:
+        if dialect == "sqlite":
+            cursor.execute(FOREIGN_KEY_CHECK)
+            counts: Dict[str, int] = {}
+            for table, _, parent, _ in cursor.fetchall():
+                counts[f"{table} -> {parent}"] = counts.get(f"{table} -> {parent}", 0) + 1
+            return list(counts.items())
+        if dialect not in FOREIGN_KEYS:
+            return []
+
+        cursor.execute(FOREIGN_KEYS[dialect])
+        violations = []
+        for name, table, columns, parent, keys in cursor.fetchall():
+            columns, keys = columns.split(","), keys.split(",")
+            present = " AND ".join(f"c.{column} IS NOT NULL" for column in columns)
+            join = " AND ".join(f"p.{key} = c.{column}" for key, column in zip(keys, columns))
+            cursor.execute(f"SELECT count(*) FROM {table} c WHERE {present} "
+                           f"AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE {join})")
+            count = cursor.fetchone()[0]
+            if count:
+                violations.append((f"{name} on {table}", count))
+        return violations
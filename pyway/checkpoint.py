@@ -0,0 +1,119 @@
+import zlib
+from typing import Any, List
+
+from pyway.batch import placeholders
+from pyway.errors import CHECKPOINT_CHANGED
+from pyway.log import logger
+from pyway.migration import Migration
+
+
+CHECKPOINT_TABLE_SUFFIX = "_progress"
+CREATE_CHECKPOINT_TABLE = "create table %s ("\
+    "name varchar(250) NOT NULL PRIMARY KEY,"\
+    "checksum varchar(25) NOT NULL,"\
+    "statement_index integer NOT NULL"\
+    ")"
+SELECT_CHECKPOINT = "select statement_index, checksum from %s where name = %s"
+INSERT_CHECKPOINT = "insert into %s (name, checksum, statement_index) values (%s)"
+UPDATE_CHECKPOINT = "update %s set statement_index = %s, checksum = %s where name = %s"
+DELETE_CHECKPOINT = "delete from %s where name = %s"
+# Errors for a table that does not exist: SQLSTATE for Postgres, error numbers for MySQL
+# and Oracle, the message for SQLite and DuckDB
+UNDEFINED_TABLE = {
+    "postgres": "42P01",
+    "psycopg": "42P01",
+    "mysql": 1146,
+    "oracle": 942,
+    "sqlite": "no such table",
+    "duckdb": "Table with name",
+}
+
+
+# Remembers how many statements of a migration were committed, together with
+# a checksum over those statements. A migration that failed half way resumes
+# after them, as long as they are unchanged; later statements may be fixed.
+class StatementCheckpoints():
+
+    def __init__(self, db: Any, dialect: str, paramstyle: str, version_table: str) -> None:
+        self._db = db
+        self.dialect = dialect
+        self.paramstyle = paramstyle
+        self.checkpoint_table = f"{version_table}{CHECKPOINT_TABLE_SUFFIX}"
+        self.index = 0
+        self.crc = 0
+
+    def start(self, migration: Migration, statements: List[str]) -> int:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            row = self._select(cnx, cursor, migration)
+            if row is None:
+                cursor.execute(INSERT_CHECKPOINT % (self.checkpoint_table, placeholders(self.paramstyle, 3)),
+                               [migration.name, self.checksum, 0])
+            else:
+                index, checksum = int(row[0]), row[1]
+                crc = self._advance(0, statements[:index])
+                if index > len(statements) or "%X" % crc != checksum:
+                    raise ValueError(CHECKPOINT_CHANGED % (migration.name, index, self.checkpoint_table))
+                self.index, self.crc = index, crc
+                logger.info(f"  resuming {migration.name} after statement {index} of {len(statements)}")
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+        return self.index
+
+    def save(self, cursor: Any, migration: Migration, statements: List[str]) -> None:
+        # Runs in the transaction of the statements it accounts for
+        self.index += len(statements)
+        self.crc = self._advance(self.crc, statements)
+        params = [placeholders(self.paramstyle, 1, i) for i in range(3)]
+        cursor.execute(UPDATE_CHECKPOINT % (self.checkpoint_table, *params),
+                       [self.index, self.checksum, migration.name])
+
+    def clear(self, migration: Migration) -> None:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(DELETE_CHECKPOINT % (self.checkpoint_table, placeholders(self.paramstyle, 1)),
+                           [migration.name])
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+
+    @property
+    def checksum(self) -> str:
+        return "%X" % self.crc
+
+    def _select(self, cnx: Any, cursor: Any, migration: Migration) -> Any:
+        # The checkpoint table is created on first use, next to the version table
+        try:
+            cursor.execute(SELECT_CHECKPOINT % (self.checkpoint_table, placeholders(self.paramstyle, 1)),
+                           [migration.name])
+            return cursor.fetchone()
+        except Exception as error:
+            # Anything else, e.g. a lost connection, must not restart the migration from its first statement
+            if not self.is_undefined_table(error):
+                raise
+            if self.dialect != "duckdb":
+                cnx.rollback()
+            cursor.execute(CREATE_CHECKPOINT_TABLE % self.checkpoint_table)
+            return None
+
+    def is_undefined_table(self, error: Exception) -> bool:
+        if self.dialect in ("sqlite", "duckdb"):
+            return str(UNDEFINED_TABLE[self.dialect]) in str(error)
+        if self.dialect == "oracle":
+            code = getattr(error.args[0], "code", None) if error.args else None
+        else:
+            code = getattr(error, "pgcode", None) or getattr(error, "sqlstate", None) or getattr(error, "errno", None)
+        return code == UNDEFINED_TABLE.get(self.dialect)
+
+    @staticmethod
+    def _advance(crc: int, statements: List[str]) -> int:
+        for statement in statements:
+            crc = zlib.crc32(statement.encode("utf-8"), crc)
+        return crc
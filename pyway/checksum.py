@@ -29,7 +29,7 @@ class Checksum():
         # Generate new checksum
         version: str = Utils.get_version_from_name(self.checksum_file)
         migration: Migration = self._db.get_schema_migration(version)
-        migration.checksum = Utils.load_checksum_from_name(self.checksum_file, self.migration_dir)
+        migration.checksum = Migration.load_checksum(self.checksum_file, self.migration_dir)
 
         self._db.update_checksum(migration)
 
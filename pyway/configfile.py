@@ -1,5 +1,5 @@
 import os
-from typing import Any, Union
+from typing import Any, Dict, List, Union
 
 
 class ConfigFile():
@@ -13,8 +13,30 @@ class ConfigFile():
         self.database_username = os.environ.get('PYWAY_DATABASE_USERNAME', kwargs.get('database_username'))
         self.database_password = os.environ.get('PYWAY_DATABASE_PASSWORD', kwargs.get('database_password'))
         self.database_collation = os.environ.get('PYWAY_DATABASE_COLLATION', 'utf8mb4_general_ci')
+        self.mysql_use_pure = os.environ.get('PYWAY_MYSQL_USE_PURE', 'true')
+        self.mysql_compress = os.environ.get('PYWAY_MYSQL_COMPRESS', 'false')
+        self.insert_batch_size = os.environ.get('PYWAY_INSERT_BATCH_SIZE')
+        self.duckdb_threads = os.environ.get('PYWAY_DUCKDB_THREADS')
+        self.parallel_workers = os.environ.get('PYWAY_PARALLEL_WORKERS')
+        self.lock_timeout = os.environ.get('PYWAY_LOCK_TIMEOUT')
+        self.lock_retries = os.environ.get('PYWAY_LOCK_RETRIES')
+        self.lock_retry_delay = os.environ.get('PYWAY_LOCK_RETRY_DELAY')
+        self.throttle_latency = os.environ.get('PYWAY_THROTTLE_LATENCY')
+        self.throttle_probe = os.environ.get('PYWAY_THROTTLE_PROBE')
+        self.statement_checkpoints = os.environ.get('PYWAY_STATEMENT_CHECKPOINTS', 'false')
+        self.bulk_load = os.environ.get('PYWAY_BULK_LOAD', 'false')
+        self.tuning_profile = os.environ.get('PYWAY_TUNING_PROFILE')
+        self.analyze_tables = os.environ.get('PYWAY_ANALYZE_TABLES', 'false')
+        self.dry_run = os.environ.get('PYWAY_DRY_RUN')
+        self.time_budget = os.environ.get('PYWAY_TIME_BUDGET')
+        self.budget_dry_run = os.environ.get('PYWAY_BUDGET_DRY_RUN')
+        self.hooks: Union[str, List[str], None] = os.environ.get('PYWAY_HOOKS')
+        self.trace_file = os.environ.get('PYWAY_TRACE_FILE')
+        self.tuning_profiles: Union[Dict[str, Dict[str, Any]], None] = None
         self.schema_file: Union[str, None] = None
         self.checksum_file = None
+        self.files: Union[List[str], None] = None
+        self.lint_format: Union[str, None] = None
         self.config = os.environ.get('PYWAY_CONFIG_FILE', '.pyway.conf')
         self.version = False
         self.cmd = None
@@ -0,0 +1,30 @@
+from typing import Any, Optional
+
+from pyway.backfill import Backfill, BACKFILL_CHUNK_SIZE, BACKFILL_WORKERS
+from pyway.configfile import ConfigFile
+from pyway.log import logger
+from pyway.migration import Migration
+from pyway.throttle import Throttle
+
+
+# Second argument of migrate(conn, ctx) in Python migrations
+class MigrationContext():
+
+    def __init__(self, db: Any, config: ConfigFile, migration: Migration, paramstyle: str) -> None:
+        self.config = config
+        self.migration = migration
+        self.dialect = config.database_type
+        self.paramstyle = paramstyle
+        self.log = logger
+        self._db = db
+
+    def connect(self) -> Any:
+        # Another connection to the same database, committed and closed by the caller
+        return self._db.connect()
+
+    def backfill(self, table: str, key: str, statement: str, chunk_size: int = BACKFILL_CHUNK_SIZE,
+                 workers: int = BACKFILL_WORKERS, name: Optional[str] = None) -> int:
+        # statement gets {start} and {end} replaced by each chunk's key range [start, end)
+        backfill = Backfill(self._db, str(self.dialect), self.paramstyle, str(self.config.database_table),
+                            name or self.migration.name, Throttle.from_config(self._db, self.config))
+        return backfill.run(table, key, statement, chunk_size, workers)
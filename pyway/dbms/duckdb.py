@@ -2,11 +2,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import duckdb
 
+from pyway.directives import Directives
+from pyway.errors import EXTENSION_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.history import History
 from pyway.migration import Migration
+from pyway.splitter import Splitter
 from pyway.configfile import ConfigFile
 
 CREATE_VERSION_MIGRATIONS_SEQ = "create sequence if not exists migration_seq;"
@@ -16,13 +21,21 @@ CREATE_VERSION_MIGRATIONS = "create table if not exists %s ("\
     "extension varchar(20) NOT NULL,"\
     "name varchar(125) NOT NULL,"\
     "checksum varchar(25) NOT NULL,"\
-    "apply_timestamp timestamp DEFAULT NOW()"\
+    "apply_timestamp timestamp DEFAULT NOW(),"\
+    "execution_time_ms bigint,"\
+    "rows_affected bigint,"\
+    "success boolean,"\
+    "installed_by varchar(100)"\
     ");"
-SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp")
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
 ORDER_BY_FIELD_ASC = "installed_rank"
 ORDER_BY_FIELD_DESC = "installed_rank desc"
-INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum) values ('%s', '%s', '%s', '%s');"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values ('%s', '%s', '%s', '%s', %s, %s, %s, %s);"
 UPDATE_CHECKSUM = "update %s set checksum='%s' where version='%s';"
+# Data migrations loaded with DuckDB's (parallel) file readers
+DATA_READERS = {"PARQUET": "read_parquet", "CSV": "read_csv_auto", "TSV": "read_csv_auto"}
 
 
 class Duckdb():
@@ -30,9 +43,15 @@ class Duckdb():
     def __init__(self, args: ConfigFile) -> None:
         self.args = args
         self.version_table = args.database_table
-        self._db = duckdb.connect(f"{self.args.database_name}")
+        self._db = duckdb.connect(f"{self.args.database_name}", config=self._connect_config())
         self.create_version_table_if_not_exists()
 
+    def _connect_config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = {}
+        if self.args.duckdb_threads:
+            config['threads'] = int(self.args.duckdb_threads)
+        return config
+
     def connect(self) -> duckdb.DuckDBPyConnection:
         return self._db.cursor()  # noqa: E501
 
@@ -42,11 +61,21 @@ class Duckdb():
     def create_version_table_if_not_exists(self) -> None:
         self.execute(CREATE_VERSION_MIGRATIONS_SEQ)
         self.execute(CREATE_VERSION_MIGRATIONS % self.version_table)
+        History.upgrade(self, "duckdb", str(self.version_table))
 
-    def execute(self, script: str) -> None:
+    def execute(self, script: str, migration: Optional[Migration] = None) -> None:
         cur = self.connect()
         cur.begin()
-        cur.execute(script)
+        if migration is None:
+            cur.execute(script)
+        else:
+            # Each statement reports the rows it changed as a Count result
+            migration.rows_affected = 0
+            for statement in Splitter("duckdb").split(script):
+                cur.execute(statement)
+                rows = cur.fetchall() if cur.description is not None else []
+                if rows and cur.description[0][0] == "Count":
+                    migration.rows_affected += rows[0][0]
         cur.commit()
 
     def get_all_schema_migrations(self) -> List[Migration]:
@@ -54,7 +83,7 @@ class Duckdb():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}")
         migrations = []
         for row in cursor.fetchall():
-            migrations.append(Migration(row[0], row[1], row[2], row[3], row[4]))
+            migrations.append(Migration(*row))
         cursor.close()
         return migrations
 
@@ -63,14 +92,54 @@ class Duckdb():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} WHERE version=?", [version])
         row = cursor.fetchone()
         if row is not None:
-            migration = Migration(row[0], row[1], row[2], row[3], row[4])
+            migration = Migration(*row)
         cursor.close()
         return migration
 
     def upgrade_version(self, migration: Migration) -> None:
         self.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
                                                migration.extension, migration.name,
-                                               migration.checksum))
+                                               migration.checksum, *self._history(migration)))
 
     def update_checksum(self, migration: Migration) -> None:
         self.execute(UPDATE_CHECKSUM % (self.version_table, migration.checksum, migration.version))
+
+    def _history(self, migration: Migration) -> List[str]:
+        return History.literals("duckdb", History.values(migration, self.args))
+
+    def load_data(self, path: str, migration: Migration, settings: Optional[List[Any]] = None) -> None:
+        if migration.extension not in DATA_READERS:
+            raise ValueError(EXTENSION_NOT_SUPPORTED % (migration.name, migration.extension, "duckdb"))
+        reader = DATA_READERS[migration.extension]
+        arguments = "?"
+        params: List[Any] = [path]
+        directives: Dict[str, str] = {}
+        if reader == "read_csv_auto":
+            directives, _, lines = Directives.read_header(path)
+            params += [lines, Utils.to_bool(directives.get("header", "true"))]
+            delimiter = directives.get("delimiter", "\\t" if migration.extension == "TSV" else ",")
+            params.append(delimiter.replace("\\t", "\t"))
+            arguments += ", skip=?, header=?, delim=?"
+        # Parquet files carry no header, so the table defaults to the migration description
+        table = directives.get("table") or Utils.get_description_from_name(migration.name)
+        target = f"{table} ({directives['columns']})" if directives.get("columns") else f"{table} BY NAME"
+
+        cur = self.connect()
+        # Session settings are shared by all cursors of the database, so they are put back afterwards
+        settings = settings or []
+        for setting in settings:
+            setting.apply(cur)
+        try:
+            cur.begin()
+            cur.execute(f"INSERT INTO {target} SELECT * FROM {reader}({arguments})", params)
+            migration.rows_affected = (cur.fetchone() or [None])[0]
+            cur.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
+                                                  migration.extension, migration.name,
+                                                  migration.checksum, *self._history(migration)))
+            cur.commit()
+        except Exception:
+            cur.rollback()
+            raise
+        finally:
+            for setting in reversed(settings):
+                setting.reset(cur)
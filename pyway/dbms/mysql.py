@@ -3,9 +3,15 @@ from mysql.connector.connection import MySQLConnection
 from mysql.connector.connection import MySQLConnectionAbstract
 from mysql.connector.connection_cext import CMySQLConnection
 from mysql.connector.pooling import PooledMySQLConnection
-from typing import List, Union
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from pyway.directives import Directives
+from pyway.errors import DATA_TABLE_MISSING, EXTENSION_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.history import History
 from pyway.migration import Migration
+from pyway.splitter import Splitter
 from pyway.configfile import ConfigFile
 
 
@@ -15,13 +21,22 @@ CREATE_VERSION_MIGRATIONS = "create table if not exists %s ("\
     "extension varchar(20) NOT NULL,"\
     "name varchar(125) NOT NULL,"\
     "checksum varchar(25) NOT NULL,"\
-    "apply_timestamp timestamp DEFAULT NOW()"\
+    "apply_timestamp timestamp DEFAULT NOW(),"\
+    "execution_time_ms bigint,"\
+    "rows_affected bigint,"\
+    "success boolean,"\
+    "installed_by varchar(100)"\
     ");"
-SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp")
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
 ORDER_BY_FIELD_ASC = "installed_rank"
 ORDER_BY_FIELD_DESC = "installed_rank desc"
-INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum) values ('%s', '%s', '%s', '%s');"
-UPDATE_CHECKSUM = "update %s set checksum='%s' where version='%s';"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values (%%s, %%s, %%s, %%s, %%s, %%s, %%s, %%s)"
+UPDATE_CHECKSUM = "update %s set checksum=%%s where version=%%s"
+# Data migrations applied with LOAD DATA LOCAL INFILE, with their default field delimiter
+DATA_DELIMITERS = {"CSV": ",", "TSV": "\\t"}
+DATA_ENCLOSURE = '"'
 
 
 class Mysql():
@@ -31,12 +46,14 @@ class Mysql():
         self.version_table = config.database_table
         self.create_version_table_if_not_exists()
 
-    def connect(self) -> Union[PooledMySQLConnection, MySQLConnection, CMySQLConnection, MySQLConnectionAbstract]:
+    def connect(self, **options: Any) -> Union[PooledMySQLConnection, MySQLConnection, CMySQLConnection,
+                                               MySQLConnectionAbstract]:
         connection_params = {
             'host': self.config.database_host,
             'database': self.config.database_name,
             'user': self.config.database_username,
-            'use_pure': True,
+            'use_pure': Utils.to_bool(self.config.mysql_use_pure),
+            'compress': Utils.to_bool(self.config.mysql_compress),
             'collation': self.config.database_collation
         }
 
@@ -46,44 +63,107 @@ class Mysql():
         if self.config.database_port:
             connection_params['port'] = self.config.database_port
 
+        connection_params.update(options)
         return mysql.connector.connect(**connection_params)
 
     def create_version_table_if_not_exists(self) -> None:
         self.execute(CREATE_VERSION_MIGRATIONS % self.version_table)
+        History.upgrade(self, "mysql", str(self.version_table))
 
-    def execute(self, script: str) -> None:
+    def execute(self, script: str, migration: Optional[Migration] = None) -> None:
+        # Statement by statement through a cursor, as the C extension has no cmd_query_iter
         cnx = self.connect()
-        for _ in cnx.cmd_query_iter(script):
-            pass
+        cursor = cnx.cursor()
+        rows_affected = 0
+        for statement in Splitter("mysql").split(script):
+            cursor.execute(statement)
+            if cursor.description is not None:
+                cursor.fetchall()
+            else:
+                rows_affected += max(cursor.rowcount, 0)
+        if migration is not None:
+            migration.rows_affected = rows_affected
         cnx.commit()
+        cursor.close()
         cnx.close()
 
+    # History queries go through server-side prepared statements (binary protocol)
     def get_all_schema_migrations(self) -> List[Migration]:
         cnx = self.connect()
-        cursor = cnx.cursor()
+        cursor = cnx.cursor(prepared=True)
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}")
         migrations = []
         for row in cursor.fetchall():
-            migrations.append(Migration(row[0], row[1], row[2], row[3], row[4]))
+            migrations.append(Migration(*row))
         cursor.close()
         cnx.close()
         return migrations
 
     def get_schema_migration(self, version: str) -> Migration:
         cnx = self.connect()
-        cursor = cnx.cursor(buffered=True)
+        cursor = cnx.cursor(prepared=True)
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} WHERE version=%s", [version])
-        row = cursor.fetchone()
+        # Prepared cursors are unbuffered, read the whole result before closing
+        rows = cursor.fetchall()
+        row = rows[0] if rows else None
         if row is not None:
-            migration = Migration(row[0], row[1], row[2], row[3], row[4])
+            migration = Migration(*row)
         cursor.close()
         cnx.close()
         return migration
 
     def upgrade_version(self, migration: Migration) -> None:
-        self.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
-                                               migration.extension, migration.name,
-                                               migration.checksum))
+        self._execute_prepared(INSERT_VERSION_MIGRATE % self.version_table,
+                               (migration.version, migration.extension, migration.name, migration.checksum,
+                                *History.values(migration, self.config)))
 
     def update_checksum(self, migration: Migration) -> None:
-        self.execute(UPDATE_CHECKSUM % (self.version_table, migration.checksum, migration.version))
+        self._execute_prepared(UPDATE_CHECKSUM % self.version_table, (migration.checksum, migration.version))
+
+    def _execute_prepared(self, query: str, params: Tuple) -> None:
+        cnx = self.connect()
+        cursor = cnx.cursor(prepared=True)
+        cursor.execute(query, params)
+        cnx.commit()
+        cursor.close()
+        cnx.close()
+
+    def load_data(self, path: str, migration: Migration, settings: Optional[List[Any]] = None) -> None:
+        if migration.extension not in DATA_DELIMITERS:
+            raise ValueError(EXTENSION_NOT_SUPPORTED % (migration.name, migration.extension, "mysql"))
+        directives, _, lines = Directives.read_header(path)
+        if not directives.get("table"):
+            raise ValueError(DATA_TABLE_MISSING % migration.name)
+        if Utils.to_bool(directives.get("header", "false")):
+            lines += 1
+
+        # Local infile is only allowed for files inside the migration directory
+        cnx = self.connect(allow_local_infile_in_path=os.path.dirname(os.path.abspath(path)))
+        cursor = cnx.cursor()
+        # Session settings (bulk loading, tuning profiles) end with the connection
+        for setting in settings or []:
+            setting.apply(cursor)
+        cursor.execute(self._load_statement(directives, DATA_DELIMITERS[migration.extension], lines),
+                       (os.path.abspath(path),))
+        migration.rows_affected = cursor.rowcount
+        cursor.execute(INSERT_VERSION_MIGRATE % self.version_table,
+                       (migration.version, migration.extension, migration.name, migration.checksum,
+                        *History.values(migration, self.config)))
+        cnx.commit()
+        cursor.close()
+        cnx.close()
+
+    @staticmethod
+    def _load_statement(directives: Dict[str, str], delimiter: str, ignore_lines: int) -> str:
+        def quote(value: str) -> str:
+            return "'" + value.replace("'", "\\'") + "'"
+
+        statement = f"LOAD DATA LOCAL INFILE %s INTO TABLE {directives['table']}"
+        if directives.get("encoding"):
+            statement += f" CHARACTER SET {directives['encoding']}"
+        statement += f" FIELDS TERMINATED BY {quote(directives.get('delimiter', delimiter))}"
+        statement += f" OPTIONALLY ENCLOSED BY {quote(directives.get('enclosed', DATA_ENCLOSURE))}"
+        statement += f" IGNORE {ignore_lines} LINES"
+        if directives.get("columns"):
+            statement += f" ({directives['columns']})"
+        return statement
@@ -1,8 +1,13 @@
 import oracledb
 import os
-from typing import List
+import time
+from typing import List, Optional
 
+from pyway.batch import BATCH_SIZE, Batch, Batcher
+from pyway.log import logger
+from pyway.history import History
 from pyway.migration import Migration
+from pyway.splitter import Splitter
 from pyway.configfile import ConfigFile
 
 
@@ -12,12 +17,18 @@ CREATE_VERSION_MIGRATIONS = "create table %s ("\
     "extension varchar2(20) NOT NULL,"\
     "name varchar2(125) NOT NULL,"\
     "checksum varchar2(25) NOT NULL,"\
-    "apply_timestamp timestamp DEFAULT CURRENT_TIMESTAMP"\
+    "apply_timestamp timestamp DEFAULT CURRENT_TIMESTAMP,"\
+    "execution_time_ms NUMBER(19),"\
+    "rows_affected NUMBER(19),"\
+    "success NUMBER(1),"\
+    "installed_by varchar2(100)"\
     ")"
-SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp")
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
 ORDER_BY_FIELD_ASC = "installed_rank"
 ORDER_BY_FIELD_DESC = "installed_rank desc"
-INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum) values ('%s', '%s', '%s', '%s')"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values ('%s', '%s', '%s', '%s', %s, %s, %s, %s)"
 UPDATE_CHECKSUM = "update %s set checksum='%s' where version='%s'"
 
 
@@ -131,14 +142,43 @@ class Oracle():
         finally:
             cursor.close()
             cnx.close()
+        History.upgrade(self, "oracle", str(self.version_table))
 
     def execute(self, script: str) -> None:
+        self._execute_statements(script)
+
+    def apply_migration(self, script: str, migration: Migration) -> None:
+        self._execute_statements(script, migration)
+
+    def _execute_statements(self, script: str, migration: Optional[Migration] = None) -> None:
+        # Statements run one by one on a single cursor; runs of simple INSERTs are
+        # sent with executemany array binding. Timings are reported for migrations.
+        batch_size = int(self.config.insert_batch_size or BATCH_SIZE)
+        statements = Batcher("oracle", batch_size).group(Splitter("oracle").split(script))
         cnx = self.connect()
         cursor = cnx.cursor()
-        cursor.execute(script)
-        cnx.commit()
-        cursor.close()
-        cnx.close()
+        rows_affected = 0
+        try:
+            for index, statement in enumerate(statements, start=1):
+                start = time.perf_counter()
+                if isinstance(statement, Batch):
+                    cursor.executemany(statement.sql("numeric"), statement.rows)
+                else:
+                    cursor.execute(statement)
+                rows_affected += max(cursor.rowcount, 0)
+                if migration is not None:
+                    elapsed = time.perf_counter() - start
+                    summary = " ".join(str(statement).split())[:80]
+                    logger.info(f"  [{index}/{len(statements)}] {elapsed:.3f}s {summary}")
+            if migration is not None:
+                migration.rows_affected = rows_affected
+                cursor.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
+                                                         migration.extension, migration.name,
+                                                         migration.checksum, *self._history(migration)))
+            cnx.commit()
+        finally:
+            cursor.close()
+            cnx.close()
 
     def get_all_schema_migrations(self) -> List[Migration]:
         cnx = self.connect()
@@ -146,7 +186,7 @@ class Oracle():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}")
         migrations = []
         for row in cursor.fetchall():
-            migrations.append(Migration(row[0], row[1], row[2], row[3], row[4]))
+            migrations.append(Migration(*row))
         cursor.close()
         cnx.close()
         return migrations
@@ -160,7 +200,7 @@ class Oracle():
         )
         row = cursor.fetchone()
         if row is not None:
-            migration = Migration(row[0], row[1], row[2], row[3], row[4])
+            migration = Migration(*row)
         cursor.close()
         cnx.close()
         return migration
@@ -168,7 +208,10 @@ class Oracle():
     def upgrade_version(self, migration: Migration) -> None:
         self.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
                                                migration.extension, migration.name,
-                                               migration.checksum))
+                                               migration.checksum, *self._history(migration)))
 
     def update_checksum(self, migration: Migration) -> None:
         self.execute(UPDATE_CHECKSUM % (self.version_table, migration.checksum, migration.version))
+
+    def _history(self, migration: Migration) -> List[str]:
+        return History.literals("oracle", History.values(migration, self.config))
@@ -1,7 +1,12 @@
 import psycopg2
-from typing import List
+from typing import Any, Dict, List, Optional
 
+from pyway.directives import Directives
+from pyway.errors import DATA_TABLE_MISSING, EXTENSION_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.history import History
 from pyway.migration import Migration
+from pyway.splitter import Splitter
 from pyway.configfile import ConfigFile
 
 
@@ -11,13 +16,22 @@ CREATE_VERSION_MIGRATIONS = "create table if not exists %s ("\
     "extension varchar(20) NOT NULL,"\
     "name varchar(125) NOT NULL,"\
     "checksum varchar(25) NOT NULL,"\
-    "apply_timestamp timestamp DEFAULT NOW()"\
+    "apply_timestamp timestamp DEFAULT NOW(),"\
+    "execution_time_ms bigint,"\
+    "rows_affected bigint,"\
+    "success boolean,"\
+    "installed_by varchar(100)"\
     ");"
-SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp")
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
 ORDER_BY_FIELD_ASC = "installed_rank"
 ORDER_BY_FIELD_DESC = "installed_rank desc"
-INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum) values ('%s', '%s', '%s', '%s');"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values ('%s', '%s', '%s', '%s', %s, %s, %s, %s);"
 UPDATE_CHECKSUM = "update %s set checksum='%s' where version='%s';"
+# Data migrations streamed with COPY ... FROM STDIN: CSV, or COPY's own text format
+DATA_FORMATS = {"CSV": "csv", "COPY": "text"}
+COPY_BUFFER_SIZE = 1024 * 1024
 
 
 class Postgres():
@@ -41,11 +55,20 @@ class Postgres():
 
     def create_version_table_if_not_exists(self) -> None:
         self.execute(CREATE_VERSION_MIGRATIONS % self.version_table)
+        History.upgrade(self, "postgres", str(self.version_table))
 
-    def execute(self, script: str) -> None:
+    def execute(self, script: str, migration: Optional[Migration] = None) -> None:
         conn = self.connect()
         cur = conn.cursor()
-        cur.execute(script)
+        if migration is None:
+            cur.execute(script)
+        else:
+            # A script sent whole only reports the rows of its last statement
+            migration.rows_affected = 0
+            for statement in Splitter("postgres").split(script):
+                cur.execute(statement)
+                if cur.description is None:
+                    migration.rows_affected += max(cur.rowcount, 0)
         conn.commit()
 
     def get_all_schema_migrations(self) -> List[Migration]:
@@ -54,7 +77,7 @@ class Postgres():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}")
         migrations = []
         for row in cursor.fetchall():
-            migrations.append(Migration(row[0], row[1], row[2], row[3], row[4]))
+            migrations.append(Migration(*row))
         cursor.close()
         cnx.close()
         return migrations
@@ -65,7 +88,7 @@ class Postgres():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} WHERE version=%s", [version])
         row = cursor.fetchone()
         if row is not None:
-            migration = Migration(row[0], row[1], row[2], row[3], row[4])
+            migration = Migration(*row)
         cursor.close()
         cnx.close()
         return migration
@@ -73,7 +96,47 @@ class Postgres():
     def upgrade_version(self, migration: Migration) -> None:
         self.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
                                                migration.extension, migration.name,
-                                               migration.checksum))
+                                               migration.checksum, *self._history(migration)))
 
     def update_checksum(self, migration: Migration) -> None:
         self.execute(UPDATE_CHECKSUM % (self.version_table, migration.checksum, migration.version))
+
+    def _history(self, migration: Migration) -> List[str]:
+        return History.literals("postgres", History.values(migration, self.args))
+
+    def load_data(self, path: str, migration: Migration, settings: Optional[List[Any]] = None) -> None:
+        if migration.extension not in DATA_FORMATS:
+            raise ValueError(EXTENSION_NOT_SUPPORTED % (migration.name, migration.extension, "postgres"))
+        directives, offset = Directives.read(path)
+        if not directives.get("table"):
+            raise ValueError(DATA_TABLE_MISSING % migration.name)
+
+        cnx = self.connect()
+        cursor = cnx.cursor()
+        # Session settings (bulk loading, tuning profiles) end with the connection
+        for setting in settings or []:
+            setting.apply(cursor)
+        with open(path, "rb") as datafile:
+            datafile.seek(offset)
+            cursor.copy_expert(self._copy_statement(directives, DATA_FORMATS[migration.extension]),
+                               datafile, size=COPY_BUFFER_SIZE)
+        migration.rows_affected = cursor.rowcount
+        # History row is written in the same transaction as the data
+        cursor.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
+                                                 migration.extension, migration.name,
+                                                 migration.checksum, *self._history(migration)))
+        cnx.commit()
+        cursor.close()
+        cnx.close()
+
+    @staticmethod
+    def _copy_statement(directives: Dict[str, str], data_format: str) -> str:
+        columns = f" ({directives['columns']})" if directives.get("columns") else ""
+        options = [f"FORMAT {data_format}"]
+        if data_format == "csv" and Utils.to_bool(directives.get("header", "false")):
+            options.append("HEADER true")
+        for option in ("delimiter", "null", "encoding"):
+            if option in directives:
+                value = directives[option].replace("\\t", "\t").replace("'", "''")
+                options.append(f"{option.upper()} '{value}'")
+        return f"COPY {directives['table']}{columns} FROM STDIN WITH ({', '.join(options)})"
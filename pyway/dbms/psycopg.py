@@ -0,0 +1,135 @@
+import psycopg
+from typing import List, Optional, Union
+
+from pyway.batch import Batch
+from pyway.executor import Executor
+from pyway.history import History
+from pyway.migration import Migration
+from pyway.configfile import ConfigFile
+
+
+CREATE_VERSION_MIGRATIONS = "create table if not exists %s ("\
+    "installed_rank serial PRIMARY KEY,"\
+    "version varchar(20) NOT NULL,"\
+    "extension varchar(20) NOT NULL,"\
+    "name varchar(125) NOT NULL,"\
+    "checksum varchar(25) NOT NULL,"\
+    "apply_timestamp timestamp DEFAULT NOW(),"\
+    "execution_time_ms bigint,"\
+    "rows_affected bigint,"\
+    "success boolean,"\
+    "installed_by varchar(100)"\
+    ");"
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
+ORDER_BY_FIELD_ASC = "installed_rank"
+ORDER_BY_FIELD_DESC = "installed_rank desc"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values (%%s, %%s, %%s, %%s, %%s, %%s, %%s, %%s)"
+UPDATE_CHECKSUM = "update %s set checksum=%%s where version=%%s"
+
+
+# Postgres backend on psycopg 3. A single connection is kept open so the
+# history queries stay server-side prepared, and statements are sent in
+# pipeline mode instead of waiting for one round trip each.
+class Psycopg():
+
+    def __init__(self, args: ConfigFile) -> None:
+        self.args = args
+        self.version_table = args.database_table
+        self._cnx: Optional[psycopg.Connection] = None
+        self._executor = Executor(self, args)
+        self.create_version_table_if_not_exists()
+
+    def connect(self) -> psycopg.Connection:
+        conninfo = f"dbname={self.args.database_name} user={self.args.database_username}"
+        conninfo += f" host={self.args.database_host}"
+
+        if self.args.database_password:
+            conninfo += f" password={self.args.database_password}"
+
+        if self.args.database_port:
+            conninfo += f" port={self.args.database_port}"
+
+        return psycopg.connect(conninfo)
+
+    def disconnect(self) -> None:
+        if self._cnx is not None:
+            self._cnx.close()
+            self._cnx = None
+
+    def _connection(self) -> psycopg.Connection:
+        if self._cnx is None or self._cnx.closed:
+            self._cnx = self.connect()
+        return self._cnx
+
+    def create_version_table_if_not_exists(self) -> None:
+        self.execute(CREATE_VERSION_MIGRATIONS % self.version_table)
+        History.upgrade(self, "psycopg", str(self.version_table))
+
+    def execute(self, script: str) -> None:
+        self._pipeline(self._executor.statements(script))
+
+    def apply_migration(self, script: str, migration: Migration) -> None:
+        # Migration statements and the history insert share one pipeline and one transaction
+        self._pipeline(self._executor.statements(script), migration)
+
+    def _pipeline(self, statements: List[Union[str, Batch]], migration: Optional[Migration] = None) -> None:
+        cnx = self._connection()
+        # A cursor per statement keeps each row count once the pipeline has synced
+        cursors: List[psycopg.Cursor] = []
+        try:
+            with cnx.pipeline() as pipeline, cnx.cursor() as cursor:
+                for statement in statements:
+                    cursors.append(cnx.cursor())
+                    if isinstance(statement, Batch):
+                        cursors[-1].executemany(statement.sql("format"), statement.rows)
+                    else:
+                        cursors[-1].execute(statement)
+                if migration is not None:
+                    # The history row holds the count, so the statements' results are read first
+                    pipeline.sync()
+                    migration.rows_affected = sum(max(c.rowcount, 0) for c in cursors if c.description is None)
+                    cursor.execute(INSERT_VERSION_MIGRATE % self.version_table,
+                                   [migration.version, migration.extension, migration.name, migration.checksum,
+                                    *History.values(migration, self.args)],
+                                   prepare=True)
+            cnx.commit()
+        except Exception:
+            cnx.rollback()
+            raise
+        finally:
+            for statement_cursor in cursors:
+                statement_cursor.close()
+
+    def get_all_schema_migrations(self) -> List[Migration]:
+        cnx = self._connection()
+        with cnx.cursor() as cursor:
+            cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}",
+                           prepare=True)
+            migrations = []
+            for row in cursor.fetchall():
+                migrations.append(Migration(*row))
+        cnx.commit()
+        return migrations
+
+    def get_schema_migration(self, version: str) -> Migration:
+        cnx = self._connection()
+        with cnx.cursor() as cursor:
+            cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} WHERE version=%s", [version],
+                           prepare=True)
+            row = cursor.fetchone()
+            if row is not None:
+                migration = Migration(*row)
+        cnx.commit()
+        return migration
+
+    def upgrade_version(self, migration: Migration) -> None:
+        self._pipeline([], migration)
+
+    def update_checksum(self, migration: Migration) -> None:
+        cnx = self._connection()
+        with cnx.cursor() as cursor:
+            cursor.execute(UPDATE_CHECKSUM % self.version_table, [migration.checksum, migration.version],
+                           prepare=True)
+        cnx.commit()
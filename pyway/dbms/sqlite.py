@@ -1,6 +1,7 @@
 import sqlite3
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 
+from pyway.history import History
 from pyway.migration import Migration
 from pyway.configfile import ConfigFile
 
@@ -11,12 +12,18 @@ CREATE_VERSION_MIGRATIONS = "create table if not exists %s ("\
     "extension varchar(20) NOT NULL,"\
     "name varchar(125) NOT NULL,"\
     "checksum varchar(25) NOT NULL,"\
-    "apply_timestamp timestamp DEFAULT CURRENT_TIMESTAMP"\
+    "apply_timestamp timestamp DEFAULT CURRENT_TIMESTAMP,"\
+    "execution_time_ms integer,"\
+    "rows_affected integer,"\
+    "success boolean,"\
+    "installed_by varchar(100)"\
     ");"
-SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp")
+SELECT_FIELDS = ("version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms", "rows_affected",
+                 "success", "installed_by")
 ORDER_BY_FIELD_ASC = "installed_rank"
 ORDER_BY_FIELD_DESC = "installed_rank desc"
-INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum) values ('%s', '%s', '%s', '%s');"
+INSERT_VERSION_MIGRATE = "insert into %s (version, extension, name, checksum, execution_time_ms, rows_affected, "\
+    "success, installed_by) values ('%s', '%s', '%s', '%s', %s, %s, %s, %s);"
 UPDATE_CHECKSUM = "update %s set checksum='%s' where version='%s';"
 
 
@@ -33,11 +40,15 @@ class Sqlite():
 
     def create_version_table_if_not_exists(self) -> None:
         self.execute(CREATE_VERSION_MIGRATIONS % self.version_table)
+        History.upgrade(self, "sqlite", str(self.version_table))
 
-    def execute(self, script: str) -> List[Tuple]:
+    def execute(self, script: str, migration: Optional[Migration] = None) -> List[Tuple]:
         cnx = self.connect()
         cursor = cnx.cursor()
         cursor.executescript(script)
+        # executescript leaves no rowcount, but the connection counts the rows it changed
+        if migration is not None:
+            migration.rows_affected = cnx.total_changes
         rows = cursor.fetchall()
         cnx.commit()
         cnx.close()
@@ -49,7 +60,7 @@ class Sqlite():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} ORDER BY {ORDER_BY_FIELD_ASC}")
         migrations = []
         for row in cursor.fetchall():
-            migrations.append(Migration(row[0], row[1], row[2], row[3], row[4]))
+            migrations.append(Migration(*row))
         cursor.close()
         cnx.close()
         return migrations
@@ -60,7 +71,7 @@ class Sqlite():
         cursor.execute(f"SELECT {','.join(SELECT_FIELDS)} FROM {self.version_table} WHERE version='{version}'")
         row = cursor.fetchone()
         if row is not None:
-            migration = Migration(row[0], row[1], row[2], row[3], row[4])
+            migration = Migration(*row)
         cursor.close()
         cnx.close()
         return migration
@@ -68,7 +79,10 @@ class Sqlite():
     def upgrade_version(self, migration: Migration) -> None:
         self.execute(INSERT_VERSION_MIGRATE % (self.version_table, migration.version,
                                                migration.extension, migration.name,
-                                               migration.checksum))
+                                               migration.checksum, *self._history(migration)))
 
     def update_checksum(self, migration: Migration) -> None:
         self.execute(UPDATE_CHECKSUM % (self.version_table, migration.checksum, migration.version))
+
+    def _history(self, migration: Migration) -> List[str]:
+        return History.literals("sqlite", History.values(migration, self.config))
@@ -0,0 +1,46 @@
+import re
+from typing import Dict, Tuple
+
+
+# Header lines such as "-- pyway:table=countries" (or "# pyway:...") at the top of a migration file
+DIRECTIVE = re.compile(rb"^\s*(?:--|#)\s*pyway:([A-Za-z_]+)\s*=\s*(.*?)\s*$")
+MAX_LINE = 4096
+# Directives of .sql migrations that change how the executor runs them
+EXECUTION_DIRECTIVES = ("transaction", "statement_timeout", "lock_timeout", "bulk", "tuning")
+
+
+class Directives():
+
+    @staticmethod
+    def read(path: str) -> Tuple[Dict[str, str], int]:
+        # Returns the directives and the byte offset where the file body starts
+        directives, offset, _ = Directives.read_header(path)
+        return directives, offset
+
+    @staticmethod
+    def from_script(script: str) -> Dict[str, str]:
+        # Same as read, for a script already in memory
+        directives: Dict[str, str] = {}
+        for line in script.splitlines():
+            match = DIRECTIVE.match(line.encode("utf-8"))
+            if match is None:
+                break
+            directives[match.group(1).decode("utf-8").lower()] = match.group(2).decode("utf-8")
+        return directives
+
+    @staticmethod
+    def read_header(path: str) -> Tuple[Dict[str, str], int, int]:
+        # Same as read, plus the number of header lines
+        directives: Dict[str, str] = {}
+        offset = 0
+        lines = 0
+        with open(path, "rb") as f:
+            while True:
+                line = f.readline(MAX_LINE)
+                match = DIRECTIVE.match(line)
+                if match is None:
+                    break
+                directives[match.group(1).decode("utf-8").lower()] = match.group(2).decode("utf-8")
+                offset += len(line)
+                lines += 1
+        return directives, offset, lines
@@ -0,0 +1,168 @@
+import copy
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from tabulate import tabulate
+
+from pyway.configfile import ConfigFile
+from pyway.directives import Directives
+from pyway.errors import DRY_RUN_NOT_SUPPORTED
+from pyway.executor import Executor
+from pyway.helpers import Utils
+from pyway.migrate import Migrate, SCRIPT_EXTENSION, PYTHON_EXTENSION
+from pyway.migration import Migration
+from pyway.splitter import Splitter
+
+
+# File databases are copied and migrated for real; Postgres runs everything in one transaction that is rolled back
+SHADOW_DIALECTS = ("sqlite", "duckdb")
+ROLLBACK_DIALECTS = ("postgres", "psycopg")
+SAVEPOINT = "pyway_dry_run"
+STATEMENT_WIDTH = 60
+
+
+# Applies the pending migrations to a shadow of the database and reports how
+# long each statement took and which ones failed, leaving the database itself
+# alone. A failed statement is reported and the run goes on with the next one.
+class DryRun():
+
+    def __init__(self, config: ConfigFile) -> None:
+        self.config = config
+        self.dialect = str(config.database_type)
+        if self.dialect not in SHADOW_DIALECTS + ROLLBACK_DIALECTS:
+            raise ValueError(DRY_RUN_NOT_SUPPORTED % self.dialect)
+        self.headers = ["migration", "statement", "ms", "result"]
+        self.tablefmt = "psql"
+        self.statements = 0
+        self.failures = 0
+        self.elapsed = 0.0
+        # Seconds each migration took, for the time budget of migrate
+        self.timings: Dict[str, float] = {}
+
+    def run(self) -> str:
+        if self.dialect in SHADOW_DIALECTS:
+            with tempfile.TemporaryDirectory() as directory:
+                rows = self._shadow(directory)
+        else:
+            rows = self._rollback()
+        if not rows:
+            return "Nothing to do"
+        return tabulate(rows, headers=self.headers, tablefmt=self.tablefmt, floatfmt=".1f") + \
+            f"\n{self.statements} statements, {self.failures} failed, {self.elapsed:.2f}s"
+
+    def _shadow(self, directory: str) -> List[List[Any]]:
+        shadow = copy.copy(self.config)
+        shadow.database_name = os.path.join(directory, os.path.basename(str(self.config.database_name)))
+        self._copy(str(self.config.database_name), shadow.database_name)
+        migrate = Migrate(shadow)
+        rows: List[List[Any]] = []
+        try:
+            for migration in migrate._get_migration_files_to_be_executed():
+                path = migrate._path(migration)
+                if migration.extension == SCRIPT_EXTENSION:
+                    cnx = migrate._db.connect()
+                    if self.dialect == "sqlite":
+                        cnx.isolation_level = None
+                    try:
+                        rows += self._script(cnx, migration, path, savepoints=False)
+                    finally:
+                        cnx.close()
+                else:
+                    rows += self._whole(migrate, shadow, migration, path)
+        finally:
+            if self.dialect == "duckdb":
+                migrate._db.disconnect()
+        return rows
+
+    def _copy(self, source: str, target: str) -> None:
+        if not os.path.exists(source):
+            return
+        if self.dialect == "sqlite":
+            # The backup API copies a consistent snapshot even while others write
+            src, dst = sqlite3.connect(f"file:{source}?mode=ro", uri=True), sqlite3.connect(target)
+            try:
+                src.backup(dst)
+            finally:
+                src.close()
+                dst.close()
+            return
+        shutil.copyfile(source, target)
+        if os.path.exists(f"{source}.wal"):
+            shutil.copyfile(f"{source}.wal", f"{target}.wal")
+
+    def _rollback(self) -> List[List[Any]]:
+        migrate = Migrate(self.config)
+        rows: List[List[Any]] = []
+        cnx = migrate._db.connect()
+        try:
+            for migration in migrate._get_migration_files_to_be_executed():
+                path = migrate._path(migration)
+                if migration.extension != SCRIPT_EXTENSION:
+                    rows.append(self._row(migration, "", None, "skipped: only .sql migrations can be rolled back"))
+                elif not Utils.to_bool(Directives.read(path)[0].get("transaction", "true")):
+                    rows.append(self._row(migration, "", None, "skipped: runs outside a transaction"))
+                else:
+                    rows += self._script(cnx, migration, path, savepoints=True)
+        finally:
+            cnx.rollback()
+            cnx.close()
+        return rows
+
+    def _script(self, cnx: Any, migration: Migration, path: str, savepoints: bool) -> List[List[Any]]:
+        with open(path, "r", encoding='utf-8') as sqlfile:
+            statements = Splitter(self.dialect).split(sqlfile.read())
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        rows = []
+        total = 0.0
+        for statement in statements:
+            started = time.monotonic()
+            try:
+                if savepoints:
+                    cursor.execute(f"SAVEPOINT {SAVEPOINT}")
+                cursor.execute(statement)
+                if cursor.description is not None:
+                    cursor.fetchall()
+                result = "ok"
+            except Exception as error:
+                # Later statements still run, against the state before the failed one
+                if savepoints:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+                result = f"failed: {' '.join(str(error).split())}"
+                self.failures += 1
+            elapsed = time.monotonic() - started
+            total += elapsed
+            self.statements += 1
+            rows.append(self._row(migration, statement, elapsed, result))
+        if cursor is not cnx:
+            cursor.close()
+        self.elapsed += total
+        self.timings[migration.name] = total
+        rows.append(self._row(migration, "(total)", total, ""))
+        return rows
+
+    def _whole(self, migrate: Migrate, shadow: ConfigFile, migration: Migration, path: str) -> List[List[Any]]:
+        # Python migrations and data files run as they would in migrate, on the shadow copy
+        started = time.monotonic()
+        try:
+            if migration.extension == PYTHON_EXTENSION:
+                Executor(migrate._db, shadow).run_python(path, migration)
+            else:
+                migrate._load_data(path, migration)
+            result = "ok"
+        except Exception as error:
+            result = f"failed: {' '.join(str(error).split())}"
+            self.failures += 1
+        elapsed = time.monotonic() - started
+        self.elapsed += elapsed
+        self.timings[migration.name] = elapsed
+        self.statements += 1
+        return [self._row(migration, "(total)", elapsed, result)]
+
+    @staticmethod
+    def _row(migration: Migration, statement: str, elapsed: Any, result: str) -> List[Any]:
+        return [migration.name, " ".join(statement.split())[:STATEMENT_WIDTH],
+                None if elapsed is None else elapsed * 1000, result]
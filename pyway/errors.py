@@ -8,3 +8,19 @@ DIRECTORY_NOT_FOUND: str = "ERROR: directory not found ('%s')"
 MIGRATIONS_MISSING: str = "ERROR: Missing local migration file (%s)"
 MIGRATIONS_NOT_FOUND: str = "ERROR: no local migration files found in (%s) folder"
 MIGRATIONS_NOT_STARTED: str = "ERROR: no migrations applied yet, no validation necessary."
+DATA_TABLE_MISSING: str = "ERROR: Data migration [%s] does not declare a target table (-- pyway:table=<name>)"
+EXTENSION_NOT_SUPPORTED: str = "ERROR: Migration [%s] has extension [%s] which is not supported by %s"
+PYTHON_MIGRATE_MISSING: str = "ERROR: Python migration [%s] does not define migrate(conn, ctx)"
+BACKFILL_RANGE_MISSING: str = "ERROR: Backfill [%s] statement must bound the key with {start} and {end}"
+CHECKPOINT_CHANGED: str = "ERROR: Migration [%s] stopped after statement %s, but the statements run so far changed" \
+                          " since - delete its row from %s to run it from the start"
+DIRECTIVE_NOT_SUPPORTED: str = "ERROR: Migration [%s] has directive [%s] which is not supported by %s"
+INVALID_DURATION: str = "ERROR: Invalid duration [%s] - expected a number with an optional ms, s, m or h unit"
+ONLINE_ALTER_ONLY: str = "ERROR: Online migration [%s] must hold exactly one ALTER TABLE statement"
+ONLINE_NOT_SUPPORTED: str = "ERROR: Online migration [%s] is not supported for %s"
+BULK_INTEGRITY_FAILED: str = "ERROR: Foreign keys not checked during bulk loading are violated: %s"
+TUNING_PROFILE_MISSING: str = "ERROR: Migration [%s] uses tuning profile [%s] which is not in tuning_profiles"
+TUNING_SETTING_INVALID: str = "ERROR: Tuning profile [%s] has an invalid setting name [%s]"
+DRY_RUN_NOT_SUPPORTED: str = "ERROR: Dry runs are not supported for %s"
+HOOK_NOT_FOUND: str = "ERROR: Hook [%s] not found - expected a dotted path such as mypackage.hooks.Profiler"
+TRACING_NOT_INSTALLED: str = "ERROR: Tracing to an OTLP collector needs the OpenTelemetry SDK - pip install pyway[otlp]"
@@ -0,0 +1,249 @@
+import importlib.util
+import math
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from pyway.batch import Batch, Batcher
+from pyway.bulk import BulkLoad
+from pyway.checkpoint import StatementCheckpoints
+from pyway.context import MigrationContext
+from pyway.directives import Directives, EXECUTION_DIRECTIVES
+from pyway.errors import PYTHON_MIGRATE_MISSING, DIRECTIVE_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.hooks import Hooks
+from pyway.migration import Migration
+from pyway.retry import LockRetry, LOCK_RETRY_DELAY, LOCK_RETRY_TIMEOUT, SAVEPOINTS
+from pyway.splitter import Splitter
+from pyway.throttle import Throttle
+from pyway.tracing import tracer, STATEMENT_WIDTH
+from pyway.tuning import Tuning
+from pyway.configfile import ConfigFile
+
+
+PARAMSTYLES = {"postgres": "format", "psycopg": "format", "mysql": "format",
+               "sqlite": "qmark", "duckdb": "qmark", "oracle": "numeric"}
+# Dialects where a multi-row VALUES list beats executemany
+MULTIROW_DIALECTS = ("postgres", "psycopg", "mysql", "duckdb")
+MAX_PARAMETERS = 32767
+# Session statements for the timeout directives, formatted with milliseconds and whole seconds
+TIMEOUTS = {
+    "postgres": {"statement_timeout": ["SET statement_timeout = {ms}"], "lock_timeout": ["SET lock_timeout = {ms}"]},
+    "psycopg": {"statement_timeout": ["SET statement_timeout = {ms}"], "lock_timeout": ["SET lock_timeout = {ms}"]},
+    # max_execution_time only bounds SELECT, so MySQL has no statement_timeout
+    "mysql": {"lock_timeout": ["SET SESSION lock_wait_timeout = {s}", "SET SESSION innodb_lock_wait_timeout = {s}"]},
+    "sqlite": {"lock_timeout": ["PRAGMA busy_timeout = {ms}"]},
+    "oracle": {"lock_timeout": ["ALTER SESSION SET DDL_LOCK_TIMEOUT = {s}"]},
+}
+
+
+# Runs a migration statement by statement on one connection of the backend,
+# sending runs of simple INSERTs as batches when insert_batch_size is set.
+# With statement_checkpoints each statement commits on its own so a failed
+# migration resumes where it stopped, and with lock_retries each statement
+# that times out waiting for a lock is retried, under a savepoint so the rest
+# of the migration's transaction is kept. A throttle paces statements while
+# the database is slow to respond, and hooks are called and a span is traced
+# around each statement. Header directives of the script set timeouts,
+# autocommit, bulk loading and tuning profiles for its connection. Python
+# migrations get the open connection instead.
+class Executor():
+
+    def __init__(self, db: Any, config: ConfigFile, hooks: Optional[Hooks] = None) -> None:
+        self._db = db
+        self.config = config
+        self.hooks = hooks
+        self.dialect = str(config.database_type)
+        self.paramstyle = PARAMSTYLES[self.dialect]
+        self.splitter = Splitter(self.dialect)
+        self.batcher = Batcher(self.dialect, int(config.insert_batch_size)) if config.insert_batch_size else None
+        self.retry = None
+        retries = int(config.lock_retries or 0)
+        if retries > 0:
+            self.retry = LockRetry(db, self.dialect, retries,
+                                   Utils.to_milliseconds(config.lock_retry_delay or LOCK_RETRY_DELAY) / 1000)
+
+        self.throttle = Throttle.from_config(db, config)
+        self.rows_affected = 0
+
+    @staticmethod
+    def required(config: ConfigFile, script: str) -> bool:
+        # Whether a .sql script needs to run statement by statement rather than as a whole
+        return bool(Utils.to_bool(config.statement_checkpoints) or int(config.lock_retries or 0) > 0
+                    or config.lock_timeout or config.throttle_latency or Utils.to_bool(config.bulk_load)
+                    or config.tuning_profile
+                    or any(d in Directives.from_script(script) for d in EXECUTION_DIRECTIVES))
+
+    def statements(self, script: str) -> List[Union[str, Batch]]:
+        return self._group(self.splitter.split(script))
+
+    def _group(self, statements: List[str]) -> List[Union[str, Batch]]:
+        if self.batcher is None:
+            return list(statements)
+        return self.batcher.group(statements)
+
+    def run(self, script: str, migration: Migration, record: bool = True) -> None:
+        statements = self.splitter.split(script)
+        checkpoints = None
+        done = 0
+        if Utils.to_bool(self.config.statement_checkpoints):
+            checkpoints = StatementCheckpoints(self._db, self.dialect, self.paramstyle, str(self.config.database_table))
+            done = checkpoints.start(migration, statements)
+
+        directives = Directives.from_script(script)
+        transactional = Utils.to_bool(directives.get("transaction", "true"))
+        settings = self.session_settings(self.config, directives, migration.name)
+        cnx = self._db.connect()
+        # DuckDB hands out cursors of its shared database, which already are connections
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            self._session(cnx, cursor, migration, directives, transactional, settings)
+            if self.dialect == "duckdb" and transactional:
+                cnx.begin()
+            for i, statement in enumerate(self._group(statements[done:])):
+                if self.throttle is not None and i > 0:
+                    self.throttle.wait()
+                if self.hooks is not None:
+                    self.hooks.emit("before_statement", migration, statement=str(statement), size=self._size(statement))
+                started = time.monotonic()
+                attributes = self._span_attributes(migration, statement) if tracer.enabled else None
+                with tracer.span("statement", attributes) as span:
+                    before = self.rows_affected
+                    if self.retry is not None:
+                        self.retry.call(cnx, lambda: self._execute(cursor, statement), str(statement)[:60],
+                                        cursor if transactional else None)
+                        span.set("db.lock_wait_ms", round(self.retry.waited * 1000))
+                    else:
+                        self._execute(cursor, statement)
+                    span.set("db.rows_affected", self.rows_affected - before)
+                if self.hooks is not None:
+                    self.hooks.emit("after_statement", migration, statement=str(statement), size=self._size(statement),
+                                    elapsed=time.monotonic() - started)
+                # Checkpoints, and lock retries without savepoints, work on statements committed one at a time
+                if checkpoints is not None or (self.retry is not None and self.dialect not in SAVEPOINTS):
+                    count = len(statement) if isinstance(statement, Batch) else 1
+                    if checkpoints is not None:
+                        checkpoints.save(cursor, migration, statements[done:done + count])
+                    done += count
+                    cnx.commit()
+                    if self.dialect == "duckdb" and transactional:
+                        cnx.begin()
+            cnx.commit()
+        except Exception:
+            # Session settings are restored on the same connection, which needs to leave the failed transaction
+            if settings and (self.dialect != "duckdb" or transactional):
+                cnx.rollback()
+            raise
+        finally:
+            # Probe connections are closed first, as SQLite only leaves WAL mode with no other connection open
+            if self.throttle is not None:
+                self.throttle.release()
+            for setting in reversed(settings):
+                setting.reset(cursor)
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
+        migration.rows_affected = self.rows_affected
+        if record:
+            self._db.upgrade_version(migration)
+        if checkpoints is not None:
+            checkpoints.clear(migration)
+
+    def _session(self, cnx: Any, cursor: Any, migration: Migration, directives: Dict[str, str],
+                 transactional: bool, settings: List[Any]) -> None:
+        if not transactional:
+            # e.g. CREATE INDEX CONCURRENTLY, which Postgres refuses inside a transaction
+            if self.dialect == "sqlite":
+                cnx.isolation_level = None
+            elif self.dialect != "duckdb":
+                cnx.autocommit = True
+        # Directives override the configured lock timeout, which lock retries keep short by default
+        defaults = {"lock_timeout": self.config.lock_timeout or (LOCK_RETRY_TIMEOUT if self.retry else None)}
+        for name in ("statement_timeout", "lock_timeout"):
+            value = directives.get(name) or defaults.get(name)
+            if not value:
+                continue
+            milliseconds = Utils.to_milliseconds(value)
+            if self.dialect == "oracle" and name == "statement_timeout":
+                cnx.call_timeout = milliseconds
+                continue
+            if name not in TIMEOUTS.get(self.dialect, {}):
+                if name not in directives:
+                    continue
+                raise ValueError(DIRECTIVE_NOT_SUPPORTED % (migration.name, name, self.dialect))
+            for statement in TIMEOUTS[self.dialect][name]:
+                cursor.execute(statement.format(ms=milliseconds, s=math.ceil(milliseconds / 1000)))
+        for setting in settings:
+            setting.apply(cursor)
+
+    @staticmethod
+    def session_settings(config: ConfigFile, directives: Dict[str, str], name: str) -> List[Any]:
+        # Settings (bulk loading, a tuning profile) applied to a migration's connection and restored afterwards
+        settings: List[Any] = []
+        if BulkLoad.enabled(config, directives, name):
+            settings.append(BulkLoad(str(config.database_type)))
+        tuning = Tuning.from_config(config, directives, name)
+        if tuning is not None:
+            settings.append(tuning)
+        return settings
+
+    def _span_attributes(self, migration: Migration, statement: Union[str, Batch]) -> Dict[str, Any]:
+        return {"db.system": self.dialect, "pyway.migration": migration.name,
+                "db.statement": str(statement)[:STATEMENT_WIDTH], "pyway.statement.size": self._size(statement)}
+
+    @staticmethod
+    def _size(statement: Union[str, Batch]) -> int:
+        if isinstance(statement, Batch):
+            return sum(len(str(value).encode("utf-8")) for row in statement.rows for value in row)
+        return len(statement.encode("utf-8"))
+
+    def _execute(self, cursor: Any, statement: Union[str, Batch]) -> None:
+        if isinstance(statement, Batch):
+            self._execute_batch(cursor, statement)
+        else:
+            cursor.execute(statement)
+            self._count(cursor)
+
+    def _execute_batch(self, cursor: Any, batch: Batch) -> None:
+        if self.dialect not in MULTIROW_DIALECTS:
+            cursor.executemany(batch.sql(self.paramstyle), batch.rows)
+            self._count(cursor)
+            return
+        per_statement = max(1, MAX_PARAMETERS // batch.width)
+        for start in range(0, len(batch.rows), per_statement):
+            rows = batch.rows[start:start + per_statement]
+            cursor.execute(batch.sql(self.paramstyle, len(rows)), [value for row in rows for value in row])
+            self._count(cursor)
+
+    def _count(self, cursor: Any) -> None:
+        # Adds the rows the last statement changed to rows_affected, reading any result it returned
+        if cursor.description is None:
+            self.rows_affected += max(cursor.rowcount, 0)
+            return
+        rows = cursor.fetchall()
+        # DuckDB reports the rows a statement changed as its result
+        if self.dialect == "duckdb" and rows and cursor.description[0][0] == "Count":
+            self.rows_affected += rows[0][0]
+
+    def run_python(self, path: str, migration: Migration) -> None:
+        spec = importlib.util.spec_from_file_location(f"pyway_migration_{migration.version.replace('.', '_')}", path)
+        module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+        spec.loader.exec_module(module)  # type: ignore[union-attr]
+        if not callable(getattr(module, "migrate", None)):
+            raise AttributeError(PYTHON_MIGRATE_MISSING % migration.name)
+
+        tuning = Tuning.from_config(self.config, Directives.read(path)[0], migration.name)
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" or tuning is None else cnx.cursor()
+        try:
+            if tuning is not None:
+                tuning.apply(cursor)
+            module.migrate(cnx, MigrationContext(self._db, self.config, migration, self.paramstyle))
+            cnx.commit()
+        finally:
+            if tuning is not None:
+                tuning.reset(cursor)
+            if cursor is not cnx:
+                cursor.close()
+            # Closing without a commit discards the work of a failed migration
+            cnx.close()
+        self._db.upgrade_version(migration)
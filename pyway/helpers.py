@@ -4,7 +4,12 @@ import zlib
 from typing import Any, Dict, List, Iterable
 
 from pyway import settings
-from pyway.errors import VALID_NAME_ERROR, DIRECTORY_NOT_FOUND, OUT_OF_DATE_ERROR
+from pyway.errors import VALID_NAME_ERROR, DIRECTORY_NOT_FOUND, OUT_OF_DATE_ERROR, INVALID_DURATION
+
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+# "30m", "2s", "500ms"; a bare number is milliseconds, as in Postgres
+DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$", re.IGNORECASE)
+DURATION_UNITS = {"ms": 1, "s": 1000, "m": 60 * 1000, "h": 60 * 60 * 1000}
 
 
 class bcolors():
@@ -36,10 +41,15 @@ class Utils():
         return f'{settings.SQL_MIGRATION_PREFIX}{{major}}_{{minor}}{settings.SQL_MIGRATION_SEPARATOR}' \
                 f'{{description}}{settings.SQL_MIGRATION_SUFFIXES}'
 
+    @staticmethod
+    def migration_suffixes() -> List[str]:
+        return [settings.SQL_MIGRATION_SUFFIXES, settings.PYTHON_MIGRATION_SUFFIX, *settings.DATA_MIGRATION_SUFFIXES]
+
     @staticmethod
     def is_file_name_valid(name: str) -> bool:
-        _pattern = r"%s\d+[._]\d+|\d+[._]\d+__%s\.%s$" % \
-            (settings.SQL_MIGRATION_PREFIX, settings.SQL_MIGRATION_SEPARATOR, settings.SQL_MIGRATION_SUFFIXES)
+        suffixes = "|".join(re.escape(suffix.lstrip('.')) for suffix in Utils.migration_suffixes())
+        _pattern = r"^%s\d+(?:[._]\d+)+%s.+?\.(?:%s)$" % \
+            (re.escape(settings.SQL_MIGRATION_PREFIX), re.escape(settings.SQL_MIGRATION_SEPARATOR), suffixes)
         return re.match(_pattern, name, re.IGNORECASE) is not None
 
     @staticmethod
@@ -53,7 +63,10 @@ class Utils():
         for migration in migrations:
             migration_list.append({'version': Utils.format_version(migration.version), 'extension': migration.extension,
                                    'name': migration.name, 'checksum': migration.checksum,
-                                   'apply_timestamp': migration.apply_timestamp})
+                                   'apply_timestamp': migration.apply_timestamp,
+                                   'execution_time_ms': migration.execution_time_ms,
+                                   'rows_affected': migration.rows_affected, 'success': migration.success,
+                                   'installed_by': migration.installed_by})
         return migration_list
 
     @staticmethod
@@ -74,13 +87,20 @@ class Utils():
     def get_extension_from_name(name: str) -> str:
         return name.split('.')[-1].upper()
 
+    @staticmethod
+    def get_description_from_name(name: str) -> str:
+        return name.split(settings.SQL_MIGRATION_SEPARATOR, 1)[-1].rsplit('.', 1)[0]
+
     @staticmethod
     def load_checksum_from_name(name: str, path: str) -> str:
         fullname = os.path.join(os.getcwd(), path, name)
         prev = 0
         try:
-            for line in open(fullname, "rb"):
-                prev = zlib.crc32(line, prev)
+            # CRC32 is incremental, so fixed-size chunks give the same checksum as
+            # reading by line while keeping memory flat for large binary files
+            with open(fullname, "rb") as f:
+                for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_SIZE), b""):
+                    prev = zlib.crc32(chunk, prev)
             return "%X" % (prev & 0xFFFFFFFF)
         except FileNotFoundError:
             raise FileNotFoundError(OUT_OF_DATE_ERROR % fullname.split("/")[-1])
@@ -94,9 +114,9 @@ class Utils():
         path = Utils.basepath(d)
         dir_list = []
         try:
-            # Skip any hidden files
+            # Skip any hidden files, and directories such as the __pycache__ of Python migrations
             for f in os.listdir(path):
-                if not f.startswith('.'):
+                if not f.startswith('.') and not os.path.isdir(os.path.join(path, f)):
                     dir_list.append(f)
         except OSError:
             raise FileNotFoundError(DIRECTORY_NOT_FOUND % path)
@@ -121,6 +141,20 @@ class Utils():
             raise KeyError(f"Missing configuration options: {', '.join(missing_keys)}")
         return True
 
+    @staticmethod
+    def to_bool(value: Any) -> bool:
+        # Config values come as strings from env vars and as booleans from the config file
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+
+    @staticmethod
+    def to_milliseconds(value: str) -> int:
+        match = DURATION.match(value)
+        if match is None:
+            raise ValueError(INVALID_DURATION % value)
+        return int(float(match.group(1)) * DURATION_UNITS[(match.group(2) or "ms").lower()])
+
     @staticmethod
     def format_version(version: str) -> str:
         return ".".join(f"{int(v):02}" for v in version.split("."))
@@ -0,0 +1,109 @@
+import getpass
+import time
+from typing import Any, List
+
+from pyway.batch import placeholders
+from pyway.configfile import ConfigFile
+from pyway.executor import PARAMSTYLES
+from pyway.log import logger
+from pyway.migration import Migration
+
+
+# Columns added to the history table after its first release, with their type per dialect.
+# They are nullable without a default, so adding them only changes the catalog.
+HISTORY_COLUMNS = ("execution_time_ms", "rows_affected", "success", "installed_by")
+HISTORY_COLUMN_TYPES = {
+    "postgres": ("bigint", "bigint", "boolean", "varchar(100)"),
+    "psycopg": ("bigint", "bigint", "boolean", "varchar(100)"),
+    "mysql": ("bigint", "bigint", "boolean", "varchar(100)"),
+    "duckdb": ("bigint", "bigint", "boolean", "varchar(100)"),
+    "sqlite": ("integer", "integer", "boolean", "varchar(100)"),
+    "oracle": ("NUMBER(19)", "NUMBER(19)", "NUMBER(1)", "varchar2(100)"),
+}
+ADD_HISTORY_COLUMN = "alter table %s add %s %s"
+SELECT_HISTORY_COLUMNS = "select * from %s where 1 = 0"
+DELETE_FAILED = "delete from %s where version = %s and success = %s"
+
+
+# Execution time, rows affected, outcome and user of each migration in the
+# history table. Tables created before these columns existed get them added
+# when pyway starts. Failed migrations are recorded with success false; they
+# count as pending and their rows are removed once they succeed.
+class History():
+
+    @staticmethod
+    def upgrade(db: Any, dialect: str, version_table: str) -> None:
+        missing = [c for c in HISTORY_COLUMNS if c not in History.columns(db, dialect, version_table)]
+        for column in missing:
+            column_type = HISTORY_COLUMN_TYPES[dialect][HISTORY_COLUMNS.index(column)]
+            try:
+                History._execute(db, dialect, ADD_HISTORY_COLUMN % (version_table, column, column_type), [])
+                logger.info(f"Added column {column} to {version_table}")
+            except Exception:
+                # Another pyway process may have added it meanwhile
+                if column not in History.columns(db, dialect, version_table):
+                    raise
+
+    @staticmethod
+    def columns(db: Any, dialect: str, version_table: str) -> List[str]:
+        cnx = db.connect()
+        cursor = cnx if dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(SELECT_HISTORY_COLUMNS % version_table)
+            cursor.fetchall()
+            return [column[0].lower() for column in cursor.description]
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+                cnx.rollback()
+            cnx.close()
+
+    @staticmethod
+    def values(migration: Migration, config: ConfigFile) -> List[Any]:
+        # Values of the history columns, in the order of HISTORY_COLUMNS
+        elapsed = migration.execution_time_ms
+        if elapsed is None and migration.started is not None:
+            elapsed = round((time.monotonic() - migration.started) * 1000)
+        return [elapsed, migration.rows_affected, migration.success is not False, History.installed_by(config)]
+
+    @staticmethod
+    def literals(dialect: str, values: List[Any]) -> List[str]:
+        # Same as values, as SQL literals for the backends that format their history insert
+        literals = []
+        for value in values:
+            if value is None:
+                literals.append("NULL")
+            elif isinstance(value, bool):
+                literals.append(("1" if value else "0") if dialect == "oracle" else str(value).upper())
+            elif isinstance(value, int):
+                literals.append(str(value))
+            else:
+                literals.append("'" + str(value).replace("'", "''") + "'")
+        return literals
+
+    @staticmethod
+    def installed_by(config: ConfigFile) -> Any:
+        if config.database_username:
+            return config.database_username
+        try:
+            return getpass.getuser()
+        except Exception:
+            return None
+
+    @staticmethod
+    def forget_failures(db: Any, dialect: str, version_table: str, migration: Migration) -> None:
+        false = History.literals(dialect, [False])[0]
+        History._execute(db, dialect, DELETE_FAILED % (version_table, placeholders(PARAMSTYLES[dialect], 1), false),
+                         [migration.version])
+
+    @staticmethod
+    def _execute(db: Any, dialect: str, statement: str, params: List[Any]) -> None:
+        cnx = db.connect()
+        cursor = cnx if dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(statement, params)
+            cnx.commit()
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+            cnx.close()
@@ -0,0 +1,86 @@
+from importlib import metadata
+from pydoc import locate
+from typing import Any, Dict, List, Optional
+
+from pyway.configfile import ConfigFile
+from pyway.errors import HOOK_NOT_FOUND
+from pyway.log import logger
+from pyway.migration import Migration
+
+
+HOOK_EVENTS = ("before_migration", "after_migration", "before_statement", "after_statement", "on_error")
+HOOK_ENTRY_POINTS = "pyway.hooks"
+
+
+# What a hook is called with. elapsed is in seconds and size in bytes: the
+# migration file for migration events, the statement text (or the values of
+# a batch) for statement events. connection describes the database, without
+# the password.
+class HookEvent():
+
+    def __init__(self, name: str, migration: Migration, connection: Dict[str, Any], statement: Optional[str] = None,
+                 size: Optional[int] = None, elapsed: Optional[float] = None, rows_affected: Optional[int] = None,
+                 error: Optional[BaseException] = None) -> None:
+        self.name = name
+        self.migration = migration
+        self.connection = connection
+        self.statement = statement
+        self.size = size
+        self.elapsed = elapsed
+        self.rows_affected = rows_affected
+        self.error = error
+
+
+# Calls user code around migrations and statements, for profilers, tracers
+# and metrics. A hook is any object with some of the HOOK_EVENTS methods, each
+# taking a HookEvent; classes are instantiated without arguments. Hooks are
+# named by their dotted path in the hooks setting, or registered by installed
+# packages under the "pyway.hooks" entry point group. A failing hook is
+# logged and does not fail the migration.
+class Hooks():
+
+    def __init__(self, hooks: List[Any], config: ConfigFile) -> None:
+        self.hooks = hooks
+        self.connection = {"type": config.database_type, "host": config.database_host,
+                           "port": config.database_port, "name": config.database_name,
+                           "user": config.database_username}
+
+    @staticmethod
+    def from_config(config: ConfigFile) -> 'Hooks':
+        names = config.hooks or []
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(",") if name.strip()]
+        hooks = []
+        for name in names:
+            hook = locate(name)
+            if hook is None:
+                raise ValueError(HOOK_NOT_FOUND % name)
+            hooks.append(hook)
+        hooks += [point.load() for point in Hooks.entry_points()]
+        return Hooks([hook() if isinstance(hook, type) else hook for hook in hooks], config)
+
+    @staticmethod
+    def entry_points() -> List[Any]:
+        points = metadata.entry_points()
+        # Python 3.9 returns a dict of groups
+        if hasattr(points, "select"):
+            return list(points.select(group=HOOK_ENTRY_POINTS))
+        return list(points.get(HOOK_ENTRY_POINTS, []))  # type: ignore[attr-defined]
+
+    @property
+    def statements(self) -> bool:
+        # Statement events need the migration run statement by statement
+        return any(hasattr(hook, "before_statement") or hasattr(hook, "after_statement") for hook in self.hooks)
+
+    def emit(self, name: str, migration: Migration, **fields: Any) -> None:
+        if not self.hooks:
+            return
+        event = HookEvent(name, migration, self.connection, **fields)
+        for hook in self.hooks:
+            callback = getattr(hook, name, None)
+            if callback is None:
+                continue
+            try:
+                callback(event)
+            except Exception as error:
+                logger.error(f"Hook {getattr(hook, '__name__', type(hook).__name__)}.{name} failed: {error}")
@@ -5,6 +5,7 @@ from typing import List
 from pyway.helpers import Utils
 from pyway.log import bcolors
 from pyway.migration import Migration
+from pyway.tracing import tracer
 from pyway.dbms.database import factory
 from pyway.configfile import ConfigFile
 from pyway.errors import (MIGRATIONS_MISSING)
@@ -14,7 +15,8 @@ class Info():
     def __init__(self, config: ConfigFile) -> None:
         self.migration_dir = config.database_migration_dir
         self._db = factory(config.database_type)(config)
-        self.headers = ["version", "extension", "name", "checksum", "apply_timestamp"]
+        self.headers = ["version", "extension", "name", "checksum", "apply_timestamp", "execution_time_ms",
+                        "rows_affected", "success", "installed_by"]
         self.tablefmt = "psql"
         self.config = config
 
@@ -29,7 +31,10 @@ class Info():
 
     def get_table_info(self) -> List:
         # Get remote migrations (and validate that the files exist)
-        db_migrations = self._db.get_all_schema_migrations()
+        with tracer.span("history fetch", {"db.system": self.config.database_type,
+                                           "db.sql.table": self.config.database_table}) as span:
+            db_migrations = self._db.get_all_schema_migrations()
+            span.set("pyway.migrations", len(db_migrations))
         for m in db_migrations:
             if not os.path.exists(os.path.join(self.config.database_migration_dir, m.name)):
                 raise RuntimeError(MIGRATIONS_MISSING % m.name)
@@ -40,7 +45,9 @@ class Info():
         return db_migrations + local_migrations
 
     def get_new_local_migrations(self, db_migrations: List, migration_dir: str) -> List:
-        local_files = Utils.get_local_files(migration_dir)
+        with tracer.span("local scan", {"pyway.migration_dir": migration_dir}) as span:
+            local_files = Utils.get_local_files(migration_dir)
+            span.set("pyway.migrations", len(local_files))
         if not local_files:
             return []
 
@@ -0,0 +1,133 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pyway import settings
+from pyway.configfile import ConfigFile
+from pyway.directives import Directives
+from pyway.helpers import Utils
+from pyway.splitter import LEADING, Splitter
+
+
+# Rule code, message and the dialects it applies to (None for all)
+LINT_RULES: Dict[str, Tuple[str, Optional[Tuple[str, ...]]]] = {
+    "PW001": ("CREATE INDEX without CONCURRENTLY blocks writes to the table while the index builds",
+              ("postgres", "psycopg")),
+    "PW002": ("CREATE INDEX CONCURRENTLY needs '-- pyway:transaction=false'", ("postgres", "psycopg")),
+    "PW003": ("ADD COLUMN with a DEFAULT rewrites the table on Postgres before 11 and MySQL before 8.0, "
+              "and on any version for a volatile default", None),
+    "PW004": ("changing a column type rewrites the table and blocks it meanwhile", None),
+    "PW005": ("UPDATE or DELETE without WHERE touches every row", None),
+    "PW006": ("foreign key without an index on its columns makes deletes on the referenced table scan this one",
+              ("postgres", "psycopg", "sqlite", "oracle", "duckdb")),
+}
+CREATE_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?"
+                          r"(?:\S+\s+)?ON\s+(?:ONLY\s+)?([^\s(]+)\s*(?:USING\s+\w+\s*)?\(([^)]*)\)",
+                          re.IGNORECASE | re.DOTALL)
+ADD_COLUMN_DEFAULT = re.compile(r"ALTER\s+TABLE\b.*\bADD\s+(?:COLUMN\s+)?[^,]*\bDEFAULT\b", re.IGNORECASE | re.DOTALL)
+ALTER_TYPE = re.compile(r"ALTER\s+TABLE\b.*\b(?:ALTER\s+(?:COLUMN\s+)?\S+\s+(?:SET\s+DATA\s+)?TYPE|MODIFY|CHANGE)\b",
+                        re.IGNORECASE | re.DOTALL)
+NO_WHERE = re.compile(r"(?:UPDATE|DELETE)\b(?!.*\bWHERE\b)", re.IGNORECASE | re.DOTALL)
+TABLE = re.compile(r"(?:CREATE\s+(?:TEMP\w*\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?|ALTER\s+TABLE\s+(?:ONLY\s+)?)"
+                   r"([^\s(]+)", re.IGNORECASE)
+FOREIGN_KEY = re.compile(r"FOREIGN\s+KEY\s*\(([^)]*)\)", re.IGNORECASE)
+INLINE_REFERENCES = re.compile(r"(?:[(,]|\bADD\s+(?:COLUMN\s+)?)\s*([\w\"`]+)\s+[\w\s]*?\bREFERENCES\b", re.IGNORECASE)
+KEY_COLUMNS = re.compile(r"(?:PRIMARY\s+KEY|UNIQUE)\s*\(([^)]*)\)", re.IGNORECASE)
+INLINE_KEY = re.compile(r"[(,]\s*([\w\"`]+)\s+[\w\s]*?\b(?:PRIMARY\s+KEY|UNIQUE)\b", re.IGNORECASE)
+# String literals, blanked before matching so their contents do not look like keywords
+LITERAL = re.compile(r"'(?:[^']|'')*'", re.DOTALL)
+LITERAL_BACKSLASH = re.compile(r"'(?:[^'\\]|\\.|'')*'", re.DOTALL)
+
+
+# Looks for known performance hazards in migration files without a database
+# connection, fast enough for a pre-commit hook: each file is split into
+# statements and every statement is matched against the rules above.
+class Lint():
+
+    def __init__(self, config: ConfigFile) -> None:
+        self.config = config
+        self.dialect = str(config.database_type or "postgres")
+        self.splitter = Splitter(self.dialect)
+        self.literal = LITERAL_BACKSLASH if self.dialect == "mysql" else LITERAL
+
+    def run(self, files: Optional[List[str]] = None) -> Tuple[str, int]:
+        # Returns the report and the number of findings
+        findings: List[Dict[str, Any]] = []
+        for path in files or self.migration_files():
+            findings += self.check_file(path)
+        if self.config.lint_format == "json":
+            return json.dumps(findings, indent=2), len(findings)
+        return "\n".join(f"{f['file']}:{f['line']}: {f['code']} {f['message']}" for f in findings), len(findings)
+
+    def migration_files(self) -> List[str]:
+        directory = str(self.config.database_migration_dir)
+        return [os.path.join(directory, name) for name in Utils.get_local_files(directory)
+                if name.lower().endswith(settings.SQL_MIGRATION_SUFFIXES.lower())]
+
+    def check_file(self, path: str) -> List[Dict[str, Any]]:
+        with open(path, "r", encoding="utf-8") as sqlfile:
+            script = sqlfile.read()
+        return [{"file": path, "line": line, "code": code, "message": LINT_RULES[code][0]}
+                for line, code in self.check(script)]
+
+    def check(self, script: str) -> List[Tuple[int, str]]:
+        transactional = Utils.to_bool(Directives.from_script(script).get("transaction", "true"))
+        found: List[Tuple[int, str]] = []
+        foreign_keys: List[Tuple[int, str, List[str]]] = []
+        indexed: Set[Tuple[str, str]] = set()
+        pos = 0
+        for statement in self.splitter.split(script):
+            # Statements are slices of the script, which gives their line numbers
+            start = script.find(statement, pos)
+            pos = start + len(statement) if start >= 0 else pos
+            leading = LEADING.match(statement).end()  # type: ignore[union-attr]
+            statement = self.literal.sub("''", statement[leading:])
+            line = script.count("\n", 0, max(start, 0) + leading) + 1
+
+            codes = []
+            index = CREATE_INDEX.match(statement)
+            if index is not None:
+                if not index.group(1):
+                    codes.append("PW001")
+                elif transactional:
+                    codes.append("PW002")
+                indexed.add((self._name(index.group(2)), self._columns(index.group(3))[0]))
+            if ADD_COLUMN_DEFAULT.match(statement):
+                codes.append("PW003")
+            if ALTER_TYPE.match(statement):
+                codes.append("PW004")
+            if NO_WHERE.match(statement):
+                codes.append("PW005")
+            table = TABLE.match(statement)
+            if table is not None:
+                name = self._name(table.group(1))
+                for keys in KEY_COLUMNS.findall(statement):
+                    indexed.add((name, self._columns(keys)[0]))
+                for column in INLINE_KEY.findall(statement):
+                    indexed.add((name, self._name(column)))
+                columns = [self._columns(c) for c in FOREIGN_KEY.findall(statement)]
+                columns += [[self._name(c)] for c in INLINE_REFERENCES.findall(statement)]
+                # A column may both reference its table inline and be named in a FOREIGN KEY clause
+                for key in columns:
+                    if (line, name, key) not in foreign_keys:
+                        foreign_keys.append((line, name, key))
+            found += [(line, code) for code in codes if self._applies(code)]
+
+        # Foreign keys need an index led by their first column somewhere in the same file
+        if self._applies("PW006"):
+            found += [(line, "PW006") for line, table, columns in foreign_keys if (table, columns[0]) not in indexed]
+        return sorted(found)
+
+    def _applies(self, code: str) -> bool:
+        dialects = LINT_RULES[code][1]
+        return dialects is None or self.dialect in dialects
+
+    @staticmethod
+    def _name(name: str) -> str:
+        # Unqualified and unquoted, so "public.orders" and orders compare equal
+        return name.strip().rsplit(".", 1)[-1].strip("\"`").lower()
+
+    @staticmethod
+    def _columns(columns: str) -> List[str]:
+        return [Lint._name(c.split()[0]) if c.split() else "" for c in columns.split(",")]
@@ -1,13 +1,31 @@
 import os
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
+from pyway import settings
 from pyway.helpers import Utils
+from pyway.analyze import Analyze
+from pyway.budget import Budget
+from pyway.bulk import BulkLoad
+from pyway.directives import Directives
+from pyway.executor import Executor, PARAMSTYLES
+from pyway.history import History
+from pyway.hooks import Hooks
+from pyway.log import logger
+from pyway.online import OnlineSchemaChange
+from pyway.splitter import Splitter
+from pyway.tracing import tracer
 from pyway.migration import Migration
 from pyway.dbms.database import factory
-from pyway.errors import MIGRATIONS_NOT_FOUND
+from pyway.errors import MIGRATIONS_NOT_FOUND, EXTENSION_NOT_SUPPORTED
 from pyway.helpers import bcolors
 from pyway.configfile import ConfigFile
 
+SCRIPT_EXTENSION = settings.SQL_MIGRATION_SUFFIXES.lstrip('.').upper()
+PYTHON_EXTENSION = settings.PYTHON_MIGRATION_SUFFIX.lstrip('.').upper()
+
 
 class Migrate():
 
@@ -15,37 +33,221 @@ class Migrate():
         self._db = factory(args.database_type)(args)
         self.migration_dir = args.database_migration_dir
         self.args = args
+        self.bulk_loaded = False
+        self.touched: List[str] = []
+        # Workers of a parallel group record bulk loads and touched tables concurrently
+        self._lock = threading.Lock()
+        self.failed: List[str] = []
+        self.history: List[Migration] = []
+        self.hooks = Hooks.from_config(args)
 
     def run(self) -> str:
         output = ''
+        # The time budget covers the whole run, from reading the history on
+        budget = Budget.from_config(self.args)
         migrations_to_be_executed = self._get_migration_files_to_be_executed()
         if not migrations_to_be_executed:
             output += Utils.color("Nothing to do\n", bcolors.FAIL)
             return output
 
-        for migration in migrations_to_be_executed:
+        if budget is not None:
+            budget.predict(self.args, migrations_to_be_executed, [self._path(m) for m in migrations_to_be_executed],
+                           self.history)
+        workers = int(self.args.parallel_workers or 1)
+        for stage in self._stages(migrations_to_be_executed, workers):
+            stop = budget.refuse(stage) if budget is not None else None
+            if stop:
+                output += Utils.color(f"{stop}\n", bcolors.FAIL)
+                break
+            if len(stage) > 1:
+                output += self._run_group(stage, workers)
+                continue
+            migration = stage[0]
             output += Utils.color(f"Migrating --> {migration.name}\n", bcolors.OKBLUE)
             try:
-                with open(os.path.join(os.getcwd(),
-                          self.migration_dir, migration.name), "r", encoding='utf-8') as sqlfile:
-                    self._db.execute(sqlfile.read())
-                self._db.upgrade_version(migration)
-                output += Utils.color(f"{migration.name} SUCCESS\n", bcolors.OKBLUE)
+                self._run_one(migration)
+            except Exception as error:
+                raise RuntimeError(error)
+            output += Utils.color(f"{migration.name} SUCCESS\n", bcolors.OKBLUE)
+        if self.touched:
+            Analyze(self._db, str(self.args.database_type)).run(self.touched)
+        if self.bulk_loaded:
+            # Constraints skipped while bulk loading are checked once, after the last migration
+            try:
+                BulkLoad.check(self._db, str(self.args.database_type))
             except Exception as error:
                 raise RuntimeError(error)
         return output
 
+    def _run_one(self, migration: Migration) -> None:
+        path = self._path(migration)
+        size = os.path.getsize(path)
+        with tracer.span("migration", self._span_attributes(migration, size)) as span:
+            self.hooks.emit("before_migration", migration, size=size)
+            migration.started = time.monotonic()
+            try:
+                if migration.extension == SCRIPT_EXTENSION:
+                    with open(path, "r", encoding='utf-8') as sqlfile:
+                        self._apply(sqlfile.read(), migration)
+                elif migration.extension == PYTHON_EXTENSION:
+                    Executor(self._db, self.args).run_python(path, migration)
+                else:
+                    self._load_data(path, migration)
+            except Exception as error:
+                self._record_failure(migration)
+                self.hooks.emit("on_error", migration, size=size, elapsed=time.monotonic() - migration.started,
+                                error=error)
+                raise
+            span.set("db.rows_affected", migration.rows_affected)
+            self.hooks.emit("after_migration", migration, size=size, elapsed=time.monotonic() - migration.started,
+                            rows_affected=migration.rows_affected)
+            self._forget_failures(migration)
+
+    def _span_attributes(self, migration: Migration, size: int) -> Dict[str, Any]:
+        return {"pyway.migration": migration.name, "pyway.migration.version": migration.version,
+                "pyway.migration.extension": migration.extension, "pyway.file.size": size,
+                "db.system": self.args.database_type, "db.name": self.args.database_name}
+
+    def _path(self, migration: Migration) -> str:
+        return os.path.join(os.getcwd(), self.migration_dir, migration.name)
+
+    def _stages(self, migrations: List[Migration], workers: int) -> List[List[Migration]]:
+        # Consecutive .sql migrations declaring the same "-- pyway:group=<name>" form one stage
+        # that may run concurrently; everything else is a stage of its own
+        stages: List[List[Migration]] = []
+        previous = None
+        for migration in migrations:
+            group = None
+            if workers > 1 and migration.extension == SCRIPT_EXTENSION:
+                group = Directives.read(self._path(migration))[0].get('group') or None
+            if group is not None and group == previous:
+                stages[-1].append(migration)
+            else:
+                stages.append([migration])
+            previous = group
+        return stages
+
+    def _run_group(self, stage: List[Migration], workers: int) -> str:
+        # Each migration runs on its own connection; history rows are written afterwards,
+        # in version order, for the ones that succeeded
+        output = ''
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._apply_unrecorded, migration) for migration in stage]
+        errors = []
+        for migration, future in zip(stage, futures):
+            output += Utils.color(f"Migrating --> {migration.name}\n", bcolors.OKBLUE)
+            error = future.exception()
+            if error is not None:
+                errors.append(error)
+                self._record_failure(migration)
+                continue
+            self._db.upgrade_version(migration)
+            self._forget_failures(migration)
+            output += Utils.color(f"{migration.name} SUCCESS\n", bcolors.OKBLUE)
+        if errors:
+            raise RuntimeError(errors[0])
+        return output
+
+    def _apply_unrecorded(self, migration: Migration) -> None:
+        # Hooks are called from the worker threads
+        with open(self._path(migration), "r", encoding='utf-8') as sqlfile:
+            script = sqlfile.read()
+        size = len(script.encode("utf-8"))
+        with tracer.span("migration", self._span_attributes(migration, size)) as span:
+            self.hooks.emit("before_migration", migration, size=size)
+            migration.started = time.monotonic()
+            self._bulk(Directives.from_script(script), migration)
+            try:
+                Executor(self._db, self.args, self.hooks).run(script, migration, record=False)
+            except Exception as error:
+                self.hooks.emit("on_error", migration, size=size, elapsed=time.monotonic() - migration.started,
+                                error=error)
+                raise
+            finally:
+                # History rows are written once the whole group is done
+                migration.execution_time_ms = round((time.monotonic() - migration.started) * 1000)
+            span.set("db.rows_affected", migration.rows_affected)
+            self.hooks.emit("after_migration", migration, size=size, elapsed=migration.execution_time_ms / 1000,
+                            rows_affected=migration.rows_affected)
+        self._touch(script)
+
+    def _record_failure(self, migration: Migration) -> None:
+        # The failed attempt gets a history row of its own, which does not count as applied
+        migration.success = False
+        try:
+            self._db.upgrade_version(migration)
+        except Exception as error:
+            logger.error(f"Could not record the failure of {migration.name}: {error}")
+
+    def _forget_failures(self, migration: Migration) -> None:
+        if migration.version in self.failed:
+            History.forget_failures(self._db, str(self.args.database_type), str(self.args.database_table), migration)
+
+    def _bulk(self, directives: Dict[str, str], migration: Migration) -> bool:
+        bulk = BulkLoad.enabled(self.args, directives, migration.name)
+        with self._lock:
+            self.bulk_loaded = self.bulk_loaded or bulk
+        return bulk
+
+    def _touch(self, script: str, table: str = '') -> None:
+        # Tables written to by this run, for analyze_tables
+        if not Utils.to_bool(self.args.analyze_tables):
+            return
+        tables = [table] if table else Analyze.tables(Splitter(str(self.args.database_type)).split(script))
+        with self._lock:
+            self.touched += [t for t in tables if t not in self.touched]
+
+    def _apply(self, script: str, migration: Migration) -> None:
+        # Backends that can send the script and the history insert together do so, unless the
+        # statements are to be committed, checkpointed, retried or traced one by one or need session settings
+        apply_migration = getattr(self._db, 'apply_migration', None)
+        directives = Directives.from_script(script)
+        if Utils.to_bool(directives.get('online')):
+            OnlineSchemaChange(self._db, self.args, PARAMSTYLES[str(self.args.database_type)], migration).run(
+                script, directives)
+            self._db.upgrade_version(migration)
+        elif Executor.required(self.args, script) or self.hooks.statements or tracer.enabled:
+            self._bulk(directives, migration)
+            Executor(self._db, self.args, self.hooks).run(script, migration)
+        elif apply_migration:
+            apply_migration(script, migration)
+        elif self.args.insert_batch_size:
+            Executor(self._db, self.args, self.hooks).run(script, migration)
+        else:
+            self._db.execute(script, migration)
+            self._db.upgrade_version(migration)
+        self._touch(script)
+
+    def _load_data(self, path: str, migration: Migration) -> None:
+        load_data = getattr(self._db, 'load_data', None)
+        if not load_data:
+            raise ValueError(EXTENSION_NOT_SUPPORTED % (migration.name, migration.extension, self.args.database_type))
+        directives = Directives.read(path)[0]
+        self._bulk(directives, migration)
+        load_data(path, migration, settings=Executor.session_settings(self.args, directives, migration.name))
+        # Parquet files load into the table named by the migration description
+        self._touch('', directives.get('table') or Utils.get_description_from_name(migration.name))
+
     def _get_migration_files_to_be_executed(self) -> List:
         all_local_migrations = self._get_all_local_migrations()
-        all_db_migrations = Migration.from_list(self._db.get_all_schema_migrations())
+        with tracer.span("history fetch", {"db.system": self.args.database_type,
+                                           "db.sql.table": self.args.database_table}) as span:
+            db_migrations = self._db.get_all_schema_migrations()
+            span.set("pyway.migrations", len(db_migrations))
+        # Failed attempts are pending until they succeed
+        self.history = db_migrations
+        self.failed = [m.version for m in db_migrations if m.success is False]
+        all_db_migrations = Migration.from_list([m for m in db_migrations if m.success is not False])
 
         if all_db_migrations and not all_local_migrations:
             raise RuntimeError(MIGRATIONS_NOT_FOUND % self.migration_dir)
         return Utils.subtract(all_local_migrations, all_db_migrations)
 
     def _get_all_local_migrations(self) -> List:
-        local_files = Utils.get_local_files(self.migration_dir)
-        if not local_files:
-            return []
-        migrations = [Migration.from_name(local_file, self.migration_dir) for local_file in local_files]
-        return Utils.sort_migrations_list(migrations)
+        with tracer.span("local scan", {"pyway.migration_dir": self.migration_dir}) as span:
+            local_files = Utils.get_local_files(self.migration_dir)
+            span.set("pyway.migrations", len(local_files))
+            if not local_files:
+                return []
+            migrations = [Migration.from_name(local_file, self.migration_dir) for local_file in local_files]
+            return Utils.sort_migrations_list(migrations)
@@ -1,27 +1,46 @@
+import os
 from pyway.helpers import Utils
+from pyway.tracing import tracer
 from typing import List, Any, Optional, Type
 
 
 class Migration():
     def __init__(self, version: Any, extension: Any, name: Any,
-                 checksum: Any, apply_timestamp: Optional[Any]) -> None:
+                 checksum: Any, apply_timestamp: Optional[Any], execution_time_ms: Optional[int] = None,
+                 rows_affected: Optional[int] = None, success: Optional[Any] = None,
+                 installed_by: Optional[str] = None) -> None:
         self.version: str = version
         self.extension: str = extension
         self.name: str = name
         self.checksum: str = checksum
         self.apply_timestamp: Optional[Any] = apply_timestamp
+        self.execution_time_ms: Optional[int] = execution_time_ms
+        self.rows_affected: Optional[int] = rows_affected
+        # Booleans come back as 1 or 0 from some databases, None from rows written before the column existed
+        self.success: Optional[bool] = None if success is None else bool(success)
+        self.installed_by: Optional[str] = installed_by
+        # Set while the migration runs, for its execution time
+        self.started: Optional[float] = None
 
     @classmethod
     def from_name(cls: Type['Migration'], name: str, path: str, **kwargs: str) -> 'Migration':
         version = Utils.format_version(kwargs.get('version', Utils.get_version_from_name(name)))
         extension = kwargs.get('extension', Utils.get_extension_from_name(name))
-        checksum = kwargs.get('checksum', Utils.load_checksum_from_name(name, path))
+        checksum = kwargs['checksum'] if 'checksum' in kwargs else cls.load_checksum(name, path)
         apply_timestamp = kwargs.get('apply_timestamp')
         return cls(version, extension, name, checksum, apply_timestamp)
 
+    @staticmethod
+    def load_checksum(name: str, path: str) -> str:
+        with tracer.span("checksum", {"pyway.migration": name}) as span:
+            if tracer.enabled:
+                span.set("pyway.file.size", os.path.getsize(os.path.join(os.getcwd(), path, name)))
+            return Utils.load_checksum_from_name(name, path)
+
     @classmethod
     def from_list(cls, list_: List['Migration']) -> List['Migration']:
-        return [cls(m.version, m.extension, m.name, m.checksum, m.apply_timestamp) for m in list_]
+        return [cls(m.version, m.extension, m.name, m.checksum, m.apply_timestamp, m.execution_time_ms,
+                    m.rows_affected, m.success, m.installed_by) for m in list_]
 
     def __str__(self) -> str:
         return f"version={self.version}, extension={self.extension}, name={self.name}, " \
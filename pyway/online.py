@@ -0,0 +1,214 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyway.backfill import Backfill, BACKFILL_CHUNK_SIZE, BACKFILL_WORKERS
+from pyway.configfile import ConfigFile
+from pyway.errors import ONLINE_ALTER_ONLY, ONLINE_NOT_SUPPORTED
+from pyway.helpers import Utils
+from pyway.log import logger
+from pyway.migration import Migration
+from pyway.splitter import Splitter
+from pyway.throttle import Throttle
+
+
+ALTER_TABLE = re.compile(r"ALTER\s+TABLE\s+(?:ONLY\s+)?([^\s(]+)\s+(.+)$", re.IGNORECASE | re.DOTALL)
+QUOTES = "`\""
+# Catalog queries; MySQL gets the schema (or NULL) and table name, Postgres the table name
+COLUMNS = {
+    "mysql": "SELECT column_name FROM information_schema.columns "
+             "WHERE table_schema = COALESCE(%s, DATABASE()) AND table_name = %s ORDER BY ordinal_position",
+    "postgres": "SELECT attname FROM pg_attribute "
+                "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum",
+}
+PRIMARY_KEY = {
+    "mysql": "SELECT column_name FROM information_schema.key_column_usage "
+             "WHERE table_schema = COALESCE(%s, DATABASE()) AND table_name = %s AND constraint_name = 'PRIMARY'",
+    "postgres": "SELECT a.attname FROM pg_index i "
+                "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+                "WHERE i.indrelid = %s::regclass AND i.indisprimary",
+}
+REFERENCED = {
+    "mysql": "SELECT count(*) FROM information_schema.key_column_usage "
+             "WHERE referenced_table_schema = COALESCE(%s, DATABASE()) AND referenced_table_name = %s",
+    "postgres": "SELECT count(*) FROM pg_constraint WHERE confrelid = %s::regclass AND contype = 'f'",
+}
+SERIAL_SEQUENCE = "SELECT pg_get_serial_sequence(%s, %s)"
+
+
+# Applies a single "ALTER TABLE" without holding a lock for the whole copy,
+# the way pt-online-schema-change does: the change is made on an empty shadow
+# table, triggers mirror writes to it, the rows are copied over in resumable
+# chunks and the two tables are swapped by a rename.
+class OnlineSchemaChange():
+
+    def __init__(self, db: Any, config: ConfigFile, paramstyle: str, migration: Migration) -> None:
+        self._db = db
+        self.config = config
+        self.dialect = str(config.database_type)
+        self.family = "mysql" if self.dialect == "mysql" else "postgres"
+        self.paramstyle = paramstyle
+        self.migration = migration
+        if self.dialect not in ("mysql", "postgres", "psycopg"):
+            raise ValueError(ONLINE_NOT_SUPPORTED % (migration.name, self.dialect))
+
+    @staticmethod
+    def parse(statements: List[str], name: str) -> Tuple[str, str]:
+        match = ALTER_TABLE.match(statements[0]) if len(statements) == 1 else None
+        if match is None:
+            raise ValueError(ONLINE_ALTER_ONLY % name)
+        return match.group(1), match.group(2).strip()
+
+    @staticmethod
+    def names(table: str) -> Tuple[Optional[str], str]:
+        schema, _, name = table.rpartition(".")
+        return schema.strip(QUOTES) or None, name.strip(QUOTES)
+
+    def run(self, script: str, directives: Dict[str, str]) -> None:
+        table, alteration = self.parse(Splitter(self.dialect).split(script), self.migration.name)
+        schema, name = self.names(table)
+        prefix = f"{schema}." if schema else ""
+        shadow, old = f"{prefix}_{name}_new", f"{prefix}_{name}_old"
+
+        columns = self._query(COLUMNS[self.family], schema, name, table)
+        key = self._query(PRIMARY_KEY[self.family], schema, name, table)
+        if len(key) != 1 or self._query(REFERENCED[self.family], schema, name, table)[0] != 0:
+            raise ValueError(ONLINE_NOT_SUPPORTED % (self.migration.name, f"{table} (needs a single-column primary key"
+                                                     " and no foreign keys referencing it)"))
+        pk = key[0]
+
+        logger.info(f"  online change of {table}: shadow {shadow}")
+        self._execute(self._create(table, shadow, alteration))
+        backfill = Backfill(self._db, self.dialect, self.paramstyle, str(self.config.database_table),
+                            f"{self.migration.name}:copy", Throttle.from_config(self._db, self.config))
+        try:
+            shared = [c for c in self._query(COLUMNS[self.family], *self.names(shadow), shadow) if c in columns]
+            self._execute(self._triggers(table, shadow, name, prefix, shared, pk))
+            backfill.run(table, self._quote(pk), self._copy(table, shadow, shared, pk),
+                         int(directives.get("chunk_size") or BACKFILL_CHUNK_SIZE),
+                         int(directives.get("workers") or BACKFILL_WORKERS))
+            self._swap(table, shadow, old, name, prefix, shared)
+        except Exception:
+            # Nothing has changed for the application until the swap; drop the copy
+            backfill.clear()
+            self._execute(self._cleanup(table, shadow, name, prefix), ignore_errors=True)
+            raise
+        # The change is live once swapped; an old table left behind does not fail the migration
+        self._execute(self._cleanup(old, old, name, prefix), ignore_errors=True)
+
+    def _create(self, table: str, shadow: str, alteration: str) -> List[str]:
+        if self.family == "mysql":
+            return [f"CREATE TABLE {shadow} LIKE {table}", f"ALTER TABLE {shadow} {alteration}"]
+        return [f"CREATE TABLE {shadow} (LIKE {table} INCLUDING ALL)", f"ALTER TABLE {shadow} {alteration}"]
+
+    def _triggers(self, table: str, shadow: str, name: str, prefix: str, columns: List[str], pk: str) -> List[str]:
+        names = ", ".join(self._quote(c) for c in columns)
+        values = ", ".join(f"NEW.{self._quote(c)}" for c in columns)
+        key = self._quote(pk)
+        if self.family == "mysql":
+            trigger = f"{prefix}_{name}_osc"
+            return [
+                f"CREATE TRIGGER {trigger}_ins AFTER INSERT ON {table} FOR EACH ROW "
+                f"REPLACE INTO {shadow} ({names}) VALUES ({values})",
+                f"CREATE TRIGGER {trigger}_upd AFTER UPDATE ON {table} FOR EACH ROW BEGIN "
+                f"DELETE IGNORE FROM {shadow} WHERE {key} = OLD.{key} AND NOT (OLD.{key} <=> NEW.{key}); "
+                f"REPLACE INTO {shadow} ({names}) VALUES ({values}); END",
+                f"CREATE TRIGGER {trigger}_del AFTER DELETE ON {table} FOR EACH ROW "
+                f"DELETE IGNORE FROM {shadow} WHERE {key} = OLD.{key}",
+            ]
+        # An upsert, as a chunk copied meanwhile may already hold the row
+        updates = ", ".join(f"{self._quote(c)} = EXCLUDED.{self._quote(c)}" for c in columns if c != pk)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        function = f"{prefix}_{name}_osc"
+        return [
+            f"CREATE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+            f"IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.{key} IS DISTINCT FROM NEW.{key}) THEN "
+            f"DELETE FROM {shadow} WHERE {key} = OLD.{key}; END IF; "
+            f"IF TG_OP IN ('INSERT', 'UPDATE') THEN INSERT INTO {shadow} ({names}) OVERRIDING SYSTEM VALUE "
+            f"VALUES ({values}) ON CONFLICT ({key}) {conflict}; END IF; RETURN NULL; END $$",
+            f"CREATE TRIGGER _{name}_osc AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE PROCEDURE {function}()",
+        ]
+
+    def _copy(self, table: str, shadow: str, columns: List[str], pk: str) -> str:
+        names = ", ".join(self._quote(c) for c in columns)
+        key = self._quote(pk)
+        if self.family == "mysql":
+            return f"INSERT IGNORE INTO {shadow} ({names}) SELECT {names} FROM {table} " \
+                   f"WHERE {key} >= {{start}} AND {key} < {{end}} LOCK IN SHARE MODE"
+        # Locking the chunk makes writers wait for it, so their triggers see the copied rows
+        return f"INSERT INTO {shadow} ({names}) OVERRIDING SYSTEM VALUE SELECT {names} FROM {table} " \
+               f"WHERE {key} >= {{start}} AND {key} < {{end}} FOR SHARE ON CONFLICT DO NOTHING"
+
+    def _swap(self, table: str, shadow: str, old: str, name: str, prefix: str, columns: List[str]) -> None:
+        if self.family == "mysql":
+            # Atomic for every session; the triggers move along with the old table
+            self._execute([f"RENAME TABLE {table} TO {old}, {shadow} TO {table}"])
+            return
+
+        cnx = self._db.connect()
+        cursor = cnx.cursor()
+        try:
+            if self.config.lock_timeout:
+                cursor.execute(f"SET lock_timeout = {Utils.to_milliseconds(self.config.lock_timeout)}")
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"DROP TRIGGER _{name}_osc ON {table}")
+            cursor.execute(f"ALTER TABLE {table} RENAME TO _{name}_old")
+            cursor.execute(f"ALTER TABLE {shadow} RENAME TO {name}")
+            # Sequences owned by the old table would be dropped with it; identity columns of
+            # the new table start over and have to skip the copied keys
+            for column in columns:
+                cursor.execute(SERIAL_SEQUENCE, [old, column])
+                sequence = cursor.fetchone()[0]
+                if sequence:
+                    cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.{self._quote(column)}")
+                cursor.execute(SERIAL_SEQUENCE, [table, column])
+                sequence = cursor.fetchone()[0]
+                if sequence:
+                    cursor.execute(f"SELECT setval('{sequence}', greatest((SELECT last_value FROM {sequence}), "
+                                   f"(SELECT coalesce(max({self._quote(column)}), 1) FROM {table})))")
+            cnx.commit()
+        finally:
+            cursor.close()
+            cnx.close()
+
+    def _cleanup(self, table: str, shadow: str, name: str, prefix: str) -> List[str]:
+        if self.family == "mysql":
+            trigger = f"{prefix}_{name}_osc"
+            return [f"DROP TRIGGER IF EXISTS {trigger}_ins", f"DROP TRIGGER IF EXISTS {trigger}_upd",
+                    f"DROP TRIGGER IF EXISTS {trigger}_del", f"DROP TABLE IF EXISTS {shadow}"]
+        return [f"DROP TRIGGER IF EXISTS _{name}_osc ON {table}", f"DROP TABLE IF EXISTS {shadow}",
+                f"DROP FUNCTION IF EXISTS {prefix}_{name}_osc()"]
+
+    def _quote(self, column: str) -> str:
+        quote = "`" if self.family == "mysql" else '"'
+        return f"{quote}{column}{quote}"
+
+    def _query(self, query: str, schema: Optional[str], name: str, table: str) -> List[Any]:
+        params = [schema, name] if self.family == "mysql" else [table]
+        cnx = self._db.connect()
+        cursor = cnx.cursor()
+        try:
+            cursor.execute(query, params)
+            rows = [row[0] for row in cursor.fetchall()]
+            cnx.commit()
+        finally:
+            cursor.close()
+            cnx.close()
+        return rows
+
+    def _execute(self, statements: List[str], ignore_errors: bool = False) -> None:
+        cnx = self._db.connect()
+        cursor = cnx.cursor()
+        try:
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                    cnx.commit()
+                except Exception as error:
+                    if not ignore_errors:
+                        raise
+                    logger.error(f"  {statement} failed: {error}")
+                    cnx.rollback()
+        finally:
+            cursor.close()
+            cnx.close()
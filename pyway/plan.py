@@ -0,0 +1,233 @@
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from tabulate import tabulate
+
+from pyway.analyze import Analyze
+from pyway.configfile import ConfigFile
+from pyway.directives import Directives
+from pyway.helpers import Utils
+from pyway.migrate import Migrate, SCRIPT_EXTENSION, PYTHON_EXTENSION
+from pyway.migration import Migration
+from pyway.online import OnlineSchemaChange
+from pyway.splitter import LEADING, Splitter
+
+
+# What a statement does to its table and which sessions it blocks while it runs:
+# "ddl" only changes the catalog, "scan" reads the whole table, "rewrite" copies it and
+# "write" changes rows. Locks are "none", "rows", "writes" (blocked) or "all" (reads and writes).
+# Rules are tried in order; a dialect limits a rule to that database.
+PLAN_RULES: List[Tuple[str, Optional[str], str, str]] = [
+    (r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\b", None, "scan", "none"),
+    (r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", "mysql", "scan", "none"),
+    (r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", None, "scan", "writes"),
+    (r"ALTER\s+TABLE\b.*\b(?:ALTER\s+(?:COLUMN\s+)?\S+\s+(?:SET\s+DATA\s+)?TYPE|MODIFY|CHANGE)\b", None,
+     "rewrite", "all"),
+    (r"ALTER\s+TABLE\b.*\bNOT\s+VALID\b", None, "ddl", "all"),
+    (r"ALTER\s+TABLE\b.*\bADD\s+(?:CONSTRAINT\s+\S+\s+)?(?:PRIMARY\s+KEY|UNIQUE|INDEX|KEY)\b", None, "scan", "writes"),
+    (r"ALTER\s+TABLE\b.*\b(?:FOREIGN\s+KEY|CHECK|SET\s+NOT\s+NULL)\b", None, "scan", "all"),
+    (r"ALTER\s+TABLE\b.*\bADD\s+(?:COLUMN\s+)?", "mysql", "ddl", "none"),
+    (r"ALTER\s+TABLE\b", "mysql", "rewrite", "writes"),
+    (r"ALTER\s+TABLE\b", None, "ddl", "all"),
+    (r"(?:VACUUM\s+FULL|CLUSTER|OPTIMIZE\s+TABLE)\b", None, "rewrite", "all"),
+    (r"(?:UPDATE|DELETE)\b(?!.*\bWHERE\b)", None, "write", "rows"),
+    (r"(?:INSERT|UPDATE|DELETE|MERGE|REPLACE|COPY|LOAD\s+DATA)\b", None, "write", "rows"),
+    (r"CREATE\s+TABLE\b.*\bAS\b", None, "write", "none"),
+    (r"(?:DROP|TRUNCATE)\b", None, "ddl", "all"),
+]
+PLAN_PATTERNS = [(re.compile(pattern, re.IGNORECASE | re.DOTALL), dialect, kind, lock)
+                 for pattern, dialect, kind, lock in PLAN_RULES]
+# Statements EXPLAIN can estimate, per dialect
+EXPLAINABLE = re.compile(r"(?:INSERT|UPDATE|DELETE|SELECT|WITH|MERGE|REPLACE)\b", re.IGNORECASE)
+EXPLAIN = {"postgres": "EXPLAIN {}", "psycopg": "EXPLAIN {}", "mysql": "EXPLAIN {}", "sqlite": "EXPLAIN QUERY PLAN {}"}
+EXPLAIN_ROWS = re.compile(r"\brows=(\d+)")
+# Estimated rows and bytes of a table from the catalog, given the schema (or None) and table name
+TABLE_SIZES = {
+    "postgres": "SELECT c.reltuples::bigint, pg_total_relation_size(c.oid) FROM pg_class c "
+                "WHERE c.oid = to_regclass(%s)",
+    "mysql": "SELECT table_rows, data_length + index_length FROM information_schema.tables "
+             "WHERE table_schema = COALESCE(%s, DATABASE()) AND table_name = %s",
+    "duckdb": "SELECT estimated_size, NULL FROM duckdb_tables() WHERE schema_name = COALESCE(?, 'main') "
+              "AND table_name = ?",
+    "oracle": "SELECT t.num_rows, (SELECT SUM(s.bytes) FROM all_segments s WHERE s.owner = t.owner "
+              "AND s.segment_name = t.table_name) FROM all_tables t "
+              "WHERE t.owner = COALESCE(:1, USER) AND t.table_name = :2",
+    "sqlite": "SELECT count(*), NULL FROM {table}",
+}
+TABLE_SIZES["psycopg"] = TABLE_SIZES["postgres"]
+# Table size on SQLite builds that include the dbstat virtual table
+SQLITE_DBSTAT = "SELECT SUM(pgsize) FROM dbstat WHERE name = ?"
+PLAN_LARGE_BYTES = 1024 ** 3
+PLAN_LARGE_ROWS = 10_000_000
+PLAN_SMALL_BYTES = 100 * 1024 ** 2
+PLAN_SMALL_ROWS = 100_000
+STATEMENT_WIDTH = 60
+
+
+# Estimates what the pending migrations will cost before they run, reading
+# the database only: each statement is classified by what it does to its
+# table and the lock it takes, the table's rows and size come from the
+# catalog, and DML is run through EXPLAIN.
+class Plan():
+
+    def __init__(self, config: ConfigFile) -> None:
+        self.config = config
+        self.dialect = str(config.database_type)
+        self._migrate = Migrate(config)
+        self._db = self._migrate._db
+        self.headers = ["migration", "statement", "table", "rows", "size", "explain", "lock", "cost", "note"]
+        self.tablefmt = "psql"
+        self._sizes: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+
+    def run(self) -> str:
+        rows = self.estimate()
+        if not rows:
+            return "Nothing to do"
+        return tabulate([[row[h] for h in self.headers] for row in rows], headers=self.headers,
+                        tablefmt=self.tablefmt)
+
+    def estimate(self) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for migration in self._migrate._get_migration_files_to_be_executed():
+            path = self._migrate._path(migration)
+            if migration.extension == SCRIPT_EXTENSION:
+                with open(path, "r", encoding='utf-8') as sqlfile:
+                    rows += self._script(sqlfile.read(), migration)
+            elif migration.extension == PYTHON_EXTENSION:
+                rows.append(self._row(migration, "migrate(conn, ctx)", kind="python"))
+            else:
+                directives = Directives.read(path)[0]
+                table = directives.get("table") or Utils.get_description_from_name(migration.name)
+                rows.append(self._row(migration, f"load {os.path.getsize(path)} byte file", table, "write", "rows"))
+        return rows
+
+    def _script(self, script: str, migration: Migration) -> List[Dict[str, Any]]:
+        statements = Splitter(self.dialect).split(script)
+        if Utils.to_bool(Directives.from_script(script).get("online")):
+            # Copied in chunks behind triggers; the swap at the end takes a short exclusive lock
+            table = OnlineSchemaChange.parse(statements, migration.name)[0]
+            return [self._row(migration, statements[0], table, "rewrite", "none")]
+
+        rows = []
+        for statement in statements:
+            statement = statement[LEADING.match(statement).end():]  # type: ignore[union-attr]
+            kind, lock = self.classify(statement, self.dialect)
+            tables = Analyze.tables([statement])
+            rows.append(self._row(migration, statement, tables[0] if tables else None, kind, lock))
+        return rows
+
+    @staticmethod
+    def classify(statement: str, dialect: str) -> Tuple[str, str]:
+        for pattern, only, kind, lock in PLAN_PATTERNS:
+            if (only is None or only == dialect) and pattern.match(statement):
+                return kind, lock
+        return "ddl", "none"
+
+    def _row(self, migration: Migration, statement: str, table: Optional[str] = None, kind: str = "ddl",
+             lock: str = "none") -> Dict[str, Any]:
+        count, size = self.size(table) if table else (None, None)
+        explained = self.explain(statement) if kind == "write" and table else None
+        cost, note = self.cost(kind, lock, table, count, size, explained)
+        if kind == "python":
+            cost, note = "unknown", "Python migrations are not estimated"
+        return {"migration": migration.name, "statement": " ".join(statement.split())[:STATEMENT_WIDTH],
+                "table": table or "", "rows": "" if count is None else count, "size": self.human(size),
+                "explain": "" if explained is None else explained, "lock": lock, "cost": cost, "note": note}
+
+    @staticmethod
+    def cost(kind: str, lock: str, table: Optional[str], count: Optional[int], size: Optional[int],
+             explained: Optional[str]) -> Tuple[str, str]:
+        if kind == "ddl" or table is None:
+            return "low", ""
+        if count is None and size is None:
+            return "medium", f"size of {table} unknown"
+        big = (size or 0) >= PLAN_LARGE_BYTES or (count or 0) >= PLAN_LARGE_ROWS
+        small = (size or 0) < PLAN_SMALL_BYTES and (count or 0) < PLAN_SMALL_ROWS
+        what = f"{Plan.human(size)} table {table}" if size is not None else f"table {table} ({count} rows)"
+        if kind == "rewrite":
+            note = f"rewrites {what}"
+        elif kind == "scan":
+            note = f"scans {what}"
+        elif explained is None or not explained.isdigit():
+            note = f"writes to {what}"
+        else:
+            note = f"writes about {explained} rows of {what}"
+        if lock == "all" and not small:
+            note += ", blocking reads and writes"
+        elif lock == "writes" and not small:
+            note += ", blocking writes"
+        return ("high" if big else "low" if small else "medium"), note
+
+    def size(self, table: str) -> Tuple[Optional[int], Optional[int]]:
+        if table not in self._sizes:
+            self._sizes[table] = self._query_size(table)
+        return self._sizes[table]
+
+    def _query_size(self, table: str) -> Tuple[Optional[int], Optional[int]]:
+        query = TABLE_SIZES.get(self.dialect)
+        if query is None:
+            return None, None
+        schema, name = OnlineSchemaChange.names(table)
+        if self.dialect in ("postgres", "psycopg"):
+            params: List[Any] = [table]
+        elif self.dialect == "sqlite":
+            query, params = query.format(table=table), []
+        elif self.dialect == "oracle":
+            params = [schema.upper() if schema else None, name.upper()]
+        else:
+            params = [schema, name]
+        row = self._fetch(query, params)
+        if row is None:
+            return None, None
+        if self.dialect == "sqlite":
+            row = (row[0], (self._fetch(SQLITE_DBSTAT, [name]) or [None])[0])
+        return (None if row[0] is None or row[0] < 0 else int(row[0])), (None if row[1] is None else int(row[1]))
+
+    def explain(self, statement: str) -> Optional[str]:
+        if self.dialect not in EXPLAIN or not EXPLAINABLE.match(statement):
+            return None
+        cnx = self._db.connect()
+        cursor = cnx.cursor()
+        try:
+            cursor.execute(EXPLAIN[self.dialect].format(statement))
+            plan = cursor.fetchall()
+            columns = [column[0].lower() for column in cursor.description]
+        except Exception:
+            # Tables created by earlier pending migrations do not exist yet
+            return None
+        finally:
+            cursor.close()
+            cnx.rollback()
+            cnx.close()
+        if self.dialect == "mysql":
+            return str(max(int(row[columns.index("rows")] or 0) for row in plan))
+        if self.dialect == "sqlite":
+            return "; ".join(str(row[-1]) for row in plan)
+        match = EXPLAIN_ROWS.search(str(plan[0][0]))
+        return match.group(1) if match else None
+
+    def _fetch(self, query: str, params: List[Any]) -> Any:
+        cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone()
+        except Exception:
+            return None
+        finally:
+            if cursor is not cnx:
+                cursor.close()
+                cnx.rollback()
+            cnx.close()
+
+    @staticmethod
+    def human(size: Optional[int]) -> str:
+        if size is None:
+            return ""
+        value = float(size)
+        for unit in ("B", "kB", "MB", "GB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}"
+            value /= 1024
+        return f"{value:.0f} TB"
@@ -0,0 +1,117 @@
+import random
+import time
+from typing import Any, Callable, List
+
+from pyway.log import logger
+
+
+LOCK_RETRY_TIMEOUT = "2s"
+LOCK_RETRY_DELAY = "1s"
+LOCK_RETRY_MAX_DELAY = 60.0
+# Lock timeout and deadlock errors: SQLSTATE for Postgres, error numbers for MySQL and Oracle
+LOCK_ERRORS = {
+    "postgres": ("55P03", "40P01"),
+    "psycopg": ("55P03", "40P01"),
+    "mysql": (1205, 1213),
+    "oracle": (54, 60, 30006),
+}
+# Statements to set, roll back to and release the savepoint a retried statement runs under.
+# SQLite would commit on releasing the savepoint that opened the transaction, so it keeps them.
+# MySQL and Oracle commit around DDL, which drops savepoints, so their statements commit one at a time.
+SAVEPOINT = "pyway_statement"
+SAVEPOINTS = {
+    "postgres": ("SAVEPOINT %s", "ROLLBACK TO SAVEPOINT %s", "RELEASE SAVEPOINT %s"),
+    "psycopg": ("SAVEPOINT %s", "ROLLBACK TO SAVEPOINT %s", "RELEASE SAVEPOINT %s"),
+    "sqlite": ("SAVEPOINT %s", "ROLLBACK TO SAVEPOINT %s", None),
+}
+# Sessions holding the locks others are waiting for
+CONTENTION_QUERIES = {
+    "postgres": "SELECT a.pid, a.state, a.wait_event_type, now() - a.xact_start, left(a.query, 120) "
+                "FROM pg_stat_activity a WHERE a.pid IN "
+                "(SELECT unnest(pg_blocking_pids(l.pid)) FROM pg_locks l WHERE NOT l.granted)",
+    "mysql": "SELECT t.PROCESSLIST_ID, t.PROCESSLIST_STATE, t.PROCESSLIST_TIME, LEFT(t.PROCESSLIST_INFO, 120) "
+             "FROM performance_schema.data_lock_waits w "
+             "JOIN performance_schema.threads t ON t.THREAD_ID = w.BLOCKING_THREAD_ID",
+    "oracle": "SELECT sid, blocking_session, event, seconds_in_wait FROM v$session WHERE blocking_session IS NOT NULL",
+}
+CONTENTION_QUERIES["psycopg"] = CONTENTION_QUERIES["postgres"]
+
+
+# Retries a statement that gave up waiting for a lock (or lost a deadlock),
+# with exponential backoff and jitter, so a migration can yield to application
+# traffic instead of queueing it up behind its own lock request. Given the
+# cursor of a transaction, each attempt runs under a savepoint where the
+# database has them, so a retry only undoes the failed statement.
+class LockRetry():
+
+    def __init__(self, db: Any, dialect: str, retries: int, delay: float) -> None:
+        self._db = db
+        self.dialect = dialect
+        self.retries = retries
+        self.delay = delay
+        self.sleep: Callable[[float], None] = time.sleep
+        # Seconds the last call lost to lock timeouts and backoff before its final attempt
+        self.waited = 0.0
+
+    def call(self, cnx: Any, action: Callable[[], Any], summary: str, cursor: Any = None) -> Any:
+        savepoint = SAVEPOINTS.get(self.dialect) if cursor is not None else None
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            self.waited = time.monotonic() - started
+            if savepoint is not None:
+                cursor.execute(savepoint[0] % SAVEPOINT)
+            try:
+                result = action()
+            except Exception as error:
+                if attempt >= self.retries or not self.is_lock_error(error):
+                    raise
+                attempt += 1
+                if savepoint is not None:
+                    cursor.execute(savepoint[1] % SAVEPOINT)
+                else:
+                    cnx.rollback()
+                delay = self.backoff(attempt)
+                logger.info(f"  lock wait on [{summary}]: {str(error).strip()}; "
+                            f"retry {attempt}/{self.retries} in {delay:.1f}s")
+                for blocker in self.contention():
+                    logger.info(f"    blocked by {blocker}")
+                self.sleep(delay)
+                continue
+            if savepoint is not None and savepoint[2] is not None:
+                cursor.execute(savepoint[2] % SAVEPOINT)
+            return result
+
+    def backoff(self, attempt: int) -> float:
+        # Half of the exponential delay is fixed and half is random, so retrying migrations spread out
+        delay = min(LOCK_RETRY_MAX_DELAY, self.delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def is_lock_error(self, error: Exception) -> bool:
+        if self.dialect == "sqlite":
+            return "locked" in str(error)
+        if self.dialect == "oracle":
+            code = getattr(error.args[0], "code", None) if error.args else None
+        else:
+            code = getattr(error, "pgcode", None) or getattr(error, "sqlstate", None) or getattr(error, "errno", None)
+        return code in LOCK_ERRORS.get(self.dialect, ())
+
+    def contention(self) -> List[Any]:
+        query = CONTENTION_QUERIES.get(self.dialect)
+        if query is None:
+            return []
+        try:
+            cnx = self._db.connect()
+            try:
+                cursor = cnx.cursor()
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                cursor.close()
+                cnx.rollback()
+            finally:
+                cnx.close()
+        except Exception as error:
+            # Missing privileges on the catalog must not fail the migration
+            logger.debug(f"  could not read lock contention: {error}")
+            return []
+        return rows
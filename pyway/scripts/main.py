@@ -9,7 +9,11 @@ from pyway.migrate import Migrate
 from pyway.validate import Validate
 from pyway.import_ import Import
 from pyway.checksum import Checksum
+from pyway.plan import Plan
+from pyway.lint import Lint
+from pyway.dryrun import DryRun
 from pyway.helpers import Utils
+from pyway.tracing import tracer
 from pyway.version import __version__
 
 
@@ -17,6 +21,14 @@ def migrate(config: ConfigFile) -> None:
     # Validate first
     validate(config, skip_errors=True)
 
+    if Utils.to_bool(config.dry_run):
+        logger.info('Starting dry run...')
+        dry_run = DryRun(config)
+        logger.info(dry_run.run())
+        if dry_run.failures:
+            sys.exit(1)
+        return
+
     logger.info('Starting migration process...')
     output = Migrate(config).run()
     logger.info(output)
@@ -48,13 +60,45 @@ def checksum(config: ConfigFile) -> None:
     logger.info(f"{name} checksum updated to {checksum}")
 
 
-def cli() -> None:
-    logger.info(f"PyWay {__version__}")
+def plan(config: ConfigFile) -> None:
+    logger.info('Estimating pending migrations...')
+    tbl = Plan(config).run()
+    logger.info(tbl)
+
+
+def lint(config: ConfigFile) -> None:
+    report, count = Lint(config).run(config.files)
+    if report:
+        print(report)
+    if count:
+        sys.exit(1)
 
+
+def cli() -> None:
     config = Settings.parse_arguments()
+    # Lint output may be machine-readable, so it goes to stdout alone
+    if config.cmd != "lint" or config.version:
+        logger.info(f"PyWay {__version__}")
+    if config.version:
+        sys.exit(1)
     config_file = Settings.parse_config_file(config.config)
     config.merge(config_file)
 
+    tracer.configure(config)
+    try:
+        attributes = {"pyway.command": config.cmd, "pyway.version": __version__, "db.system": config.database_type}
+        with tracer.span(f"pyway {config.cmd}", attributes):
+            run(config)
+    finally:
+        tracer.shutdown()
+
+
+def run(config: ConfigFile) -> None:
+    # Lint reads migration files only and needs no connection settings
+    if config.cmd == "lint":
+        lint(config)
+        return
+
     # Base validation - required for all databases
     required_vars = ["database_type", "database_table", "database_name"]
     
@@ -88,6 +132,8 @@ def cli() -> None:
         import_(config)
     elif config.cmd == "checksum":
         checksum(config)
+    elif config.cmd == "plan":
+        plan(config)
     else:
         logger.error(f"Command '{config.cmd}' not recognized, exiting!")
         sys.exit(1)
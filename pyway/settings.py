@@ -11,9 +11,12 @@ from pyway.configfile import MockArgs
 SQL_MIGRATION_PREFIX = os.environ.get('PYWAY_SQL_MIGRATION_PREFIX', 'V')
 SQL_MIGRATION_SEPARATOR = os.environ.get('PYWAY_SQL_MIGRATION_SEPARATOR', '__')
 SQL_MIGRATION_SUFFIXES = os.environ.get('PYWAY_SQL_MIGRATION_SUFFIXES', '.sql')
+PYTHON_MIGRATION_SUFFIX = '.py'
+DATA_MIGRATION_SUFFIXES = ('.csv', '.tsv', '.copy', '.parquet')
 ARGS = ['database_migration_dir', 'database_table', 'database_type', 'database_host',
         'database_port', 'database_name', 'database_username', 'database_password',
-        'database_collation', 'schema_file', 'checksum_file', 'config', 'version', 'cmd']
+        'database_collation', 'schema_file', 'checksum_file', 'lint_format', 'dry_run', 'time_budget', 'trace_file',
+        'budget_dry_run', 'config', 'version', 'cmd', 'files']
 
 
 class Settings():
@@ -30,7 +33,7 @@ class Settings():
         parser: argparse.ArgumentParser = argparse.ArgumentParser()
         parser.add_argument("--database-migration-dir", help="Database migration directory")
         parser.add_argument("--database-table", help="Database table that stores pyway metadata")
-        parser.add_argument("--database-type", help="Database type [postgres|mysql|duckdb|sqlite|oracle]")
+        parser.add_argument("--database-type", help="Database type [postgres|psycopg|mysql|duckdb|sqlite|oracle]")
         parser.add_argument("--database-host", help="Database host")
         parser.add_argument("--database-port", help="Database port")
         parser.add_argument("--database-name", help="Database name")
@@ -40,15 +43,23 @@ class Settings():
 
         parser.add_argument("--schema-file", help="Schema file for import")
         parser.add_argument("--checksum-file", help="Checksum to update")
+        parser.add_argument("--dry-run", help="Run migrate against a shadow copy and report timings",
+                            action='store_true')
+        parser.add_argument("--time-budget", help="Do not start a migration predicted to run past this, e.g. 20m")
+        parser.add_argument("--budget-dry-run", help="Time migrations without an estimate by a dry run first",
+                            action='store_true')
+        parser.add_argument("--trace-file", help="Append spans of this run to this JSON-lines file")
+        parser.add_argument("--lint-format", choices=["text", "json"], help="Output format of lint")
         parser.add_argument("-c", "--config", help="Config file")
         parser.add_argument("-v", "--version", help="Version", action='store_true')
-        parser.add_argument("cmd", nargs="?", help="info|validate|migrate|import|checksum")
+        parser.add_argument("cmd", nargs="?", help="info|validate|migrate|import|checksum|plan|lint")
+        parser.add_argument("files", nargs="*", help="Migration files to lint (default: the migration directory)")
 
-        config: ConfigFile = self.parse_args(parser.parse_args())
+        config: ConfigFile = self.parse_args(parser.parse_intermixed_args())
 
-        # We already display the version so exit
+        # The caller displays the version and exits
         if config.version:
-            sys.exit(1)
+            return config
 
         # If no arg is specified, show help
         if not config.cmd:
@@ -0,0 +1,120 @@
+import re
+from typing import List, Pattern
+
+
+# Whitespace and comments in front of a statement
+LEADING = re.compile(r"(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*", re.DOTALL)
+# MySQL keeps executable comments and optimizer hints (/*! ... */, /*+ ... */) as statement text
+LEADING_HASH = re.compile(r"(?:\s+|(?:--|\#)[^\n]*(?:\n|$)|/\*(?![!+]).*?\*/)*", re.DOTALL)
+# Oracle also drops the SQL*Plus "/" that re-runs the buffer after a plain statement
+LEADING_SLASH = re.compile(r"(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/|/[ \t]*(?=\n|$))*", re.DOTALL)
+# Statements whose body may contain semicolons between BEGIN ... END
+BLOCK_STATEMENT = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:TEMP\s+|TEMPORARY\s+)?"
+                             r"(?:TRIGGER|FUNCTION|PROCEDURE)\b", re.IGNORECASE)
+# END IF, END LOOP, END WHILE and END REPEAT close control flow, whose openers are not counted
+BLOCK_KEYWORDS = r"\b(?:BEGIN|CASE|END(?:\s+(?:IF|LOOP|WHILE|REPEAT|CASE)\b)?)\b"
+BLOCK_CLOSERS = ("END", "END CASE")
+# PL/SQL units run until a line holding only "/"
+PLSQL_BLOCK = re.compile(r"(?:CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+                         r"(?:PROCEDURE|FUNCTION|PACKAGE|TRIGGER|TYPE|LIBRARY)|DECLARE|BEGIN)\b", re.IGNORECASE)
+EXECUTABLE_COMMENT = r"/\*[!+]\d*"
+SLASH_LINE = r"^[ \t]*/[ \t]*$"
+DOLLAR_QUOTE = r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$"
+QUOTED = {
+    "'": re.compile(r"(?:[^']|'')*'", re.DOTALL),
+    '"': re.compile(r'(?:[^"]|"")*"', re.DOTALL),
+    '`': re.compile(r"(?:[^`]|``)*`", re.DOTALL),
+}
+QUOTED_BACKSLASH = {
+    "'": re.compile(r"(?:[^'\\]|\\.|'')*'", re.DOTALL),
+    '"': re.compile(r'(?:[^"\\]|\\.|"")*"', re.DOTALL),
+    '`': re.compile(r"(?:[^`]|``)*`", re.DOTALL),
+}
+DIALECTS = ("postgres", "psycopg", "mysql", "sqlite", "duckdb", "oracle")
+
+
+# Splits a migration script into single statements (without the trailing
+# delimiter), honouring quotes, comments, trigger/function bodies and
+# slash-terminated PL/SQL blocks
+class Splitter():
+
+    def __init__(self, dialect: str = "postgres") -> None:
+        if dialect not in DIALECTS:
+            raise ValueError(f"Unsupported dialect for statement splitting: {dialect}")
+        self.dialect = dialect
+        self.quoted = QUOTED_BACKSLASH if dialect == "mysql" else QUOTED
+        self.leading = {"mysql": LEADING_HASH, "oracle": LEADING_SLASH}.get(dialect, LEADING)
+        self.block = PLSQL_BLOCK if dialect == "oracle" else BLOCK_STATEMENT
+        self.token = self._token_pattern()
+
+    def _token_pattern(self) -> Pattern:
+        if self.dialect == "oracle":
+            return re.compile("|".join([SLASH_LINE, r"--", r"/\*", r"['\";]"]), re.MULTILINE)
+        tokens = [r"--", r"/\*", r"['\"`;]", BLOCK_KEYWORDS]
+        if self.dialect in ("postgres", "psycopg"):
+            tokens.append(r"(?<![A-Za-z0-9_])" + DOLLAR_QUOTE)
+        if self.dialect == "mysql":
+            # The body of an executable comment or optimizer hint is SQL, scanned like the rest
+            tokens = [EXECUTABLE_COMMENT] + tokens + [r"\#"]
+        return re.compile("|".join(tokens), re.IGNORECASE)
+
+    def split(self, script: str) -> List[str]:
+        statements: List[str] = []
+        length = len(script)
+        pos = 0
+        head = -1
+        depth = 0
+        block = False
+
+        while pos < length:
+            if head < 0:
+                pos = self.leading.match(script, pos).end()  # type: ignore[union-attr]
+                if pos >= length:
+                    break
+                head = pos
+                depth = 0
+                block = self.block.match(script, pos) is not None
+
+            match = self.token.search(script, pos)
+            if match is None:
+                break
+            token = match.group(0)
+            pos = match.end()
+
+            if token in ("--", "#"):
+                newline = script.find("\n", pos)
+                pos = length if newline < 0 else newline + 1
+            elif token[:3] in ("/*!", "/*+"):
+                continue
+            elif token == "/*":
+                end = script.find("*/", pos)
+                pos = length if end < 0 else end + 2
+            elif token in self.quoted:
+                quoted = self.quoted[token].match(script, pos)
+                pos = length if quoted is None else quoted.end()
+            elif token.startswith("$"):
+                end = script.find(token, pos)
+                pos = length if end < 0 else end + len(token)
+            elif token == ";":
+                if depth == 0 and not (block and self.dialect == "oracle"):
+                    self._append(statements, script[head:match.start()])
+                    head = -1
+            elif token.strip() == "/":
+                self._append(statements, script[head:match.start()])
+                head = -1
+            elif block:
+                keyword = " ".join(token.upper().split())
+                if keyword in ("BEGIN", "CASE"):
+                    depth += 1
+                elif keyword in BLOCK_CLOSERS and depth > 0:
+                    depth -= 1
+
+        if head >= 0:
+            self._append(statements, script[head:])
+        return statements
+
+    @staticmethod
+    def _append(statements: List[str], statement: str) -> None:
+        statement = statement.strip()
+        if statement:
+            statements.append(statement)
@@ -0,0 +1,74 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from pyway.configfile import ConfigFile
+from pyway.helpers import Utils
+from pyway.log import logger
+
+
+THROTTLE_PROBE = "SELECT 1"
+THROTTLE_PROBES = {"oracle": "SELECT 1 FROM dual"}
+THROTTLE_MIN_PAUSE = 0.1
+THROTTLE_MAX_PAUSE = 30.0
+
+
+# Slows a heavy migration down while the database is slow to answer a probe
+# query on a separate connection: the pause between statements (or backfill
+# chunks) doubles while the probe is over the latency target and halves once
+# it is back under it.
+class Throttle():
+
+    def __init__(self, db: Any, dialect: str, latency: float, probe: Optional[str] = None) -> None:
+        self._db = db
+        self.dialect = dialect
+        self.latency = latency
+        self.probe = probe or THROTTLE_PROBES.get(dialect, THROTTLE_PROBE)
+        self.pause = 0.0
+        self.sleep: Callable[[float], None] = time.sleep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def from_config(db: Any, config: ConfigFile) -> Optional['Throttle']:
+        if not config.throttle_latency:
+            return None
+        return Throttle(db, str(config.database_type), Utils.to_milliseconds(config.throttle_latency) / 1000,
+                        config.throttle_probe)
+
+    def wait(self) -> None:
+        latency = self.measure()
+        with self._lock:
+            if latency > self.latency:
+                self.pause = min(THROTTLE_MAX_PAUSE, max(THROTTLE_MIN_PAUSE, self.pause * 2))
+                logger.info(f"  throttle: probe took {latency * 1000:.0f}ms (target {self.latency * 1000:.0f}ms),"
+                            f" pausing {self.pause:.1f}s")
+            elif self.pause:
+                self.pause = self.pause / 2 if self.pause / 2 >= THROTTLE_MIN_PAUSE else 0.0
+                if not self.pause:
+                    logger.info(f"  throttle: probe back under {self.latency * 1000:.0f}ms")
+            pause = self.pause
+        if pause:
+            self.sleep(pause)
+
+    def measure(self) -> float:
+        # One probe connection per thread, as backfill workers share the throttle
+        cnx = getattr(self._local, "cnx", None)
+        if cnx is None:
+            cnx = self._local.cnx = self._db.connect()
+        cursor = cnx if self.dialect == "duckdb" else cnx.cursor()
+        started = time.monotonic()
+        cursor.execute(self.probe)
+        cursor.fetchall()
+        latency = time.monotonic() - started
+        if cursor is not cnx:
+            cursor.close()
+            cnx.rollback()
+        return latency
+
+    def release(self) -> None:
+        # Closes the probe connection of the calling thread, where some drivers require it
+        cnx = getattr(self._local, "cnx", None)
+        if cnx is not None:
+            self._local.cnx = None
+            cnx.close()
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+from pyway.configfile import ConfigFile
+from pyway.errors import TRACING_NOT_INSTALLED
+from pyway.log import logger
+
+
+# Standard OpenTelemetry settings naming a collector
+OTLP_ENDPOINTS = ("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "OTEL_EXPORTER_OTLP_ENDPOINT")
+TRACER_NAME = "pyway"
+STATEMENT_WIDTH = 200
+
+
+# A timed operation of a pyway run. Ids are hex, of the sizes OpenTelemetry
+# uses, and times are nanoseconds since the epoch.
+class Span():
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = {}
+        for key, value in attributes.items():
+            self.set(key, value)
+        self.start = time.time_ns()
+        self.end: Optional[int] = None
+        self.error: Optional[str] = None
+        self.otel: Any = None
+
+    def set(self, key: str, value: Any) -> None:
+        # Unknown values are left out rather than exported as null
+        if value is not None:
+            self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "trace_id": self.trace_id, "span_id": self.span_id,
+                "parent_span_id": self.parent_id, "start_time_unix_nano": self.start,
+                "end_time_unix_nano": self.end, "duration_ms": ((self.end or self.start) - self.start) / 1e6,
+                "status": "ERROR" if self.error else "OK", "error": self.error, "attributes": self.attributes}
+
+
+# Spans for each command, history fetch, local scan, checksum, migration and
+# statement, so a deploy shows where its time went. They are exported over
+# OTLP when a collector is configured through the standard OTEL_EXPORTER_OTLP_*
+# settings and the OpenTelemetry SDK is installed, else appended to the
+# trace_file as JSON lines. Without either, spans cost next to nothing.
+# Spans nest per thread; those of parallel workers hang off the command span.
+class Tracer():
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.file: Optional[IO[str]] = None
+        self.otel: Any = None
+        self.provider: Any = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._root: Optional[Span] = None
+
+    def configure(self, config: ConfigFile) -> None:
+        self.shutdown()
+        if any(os.environ.get(name) for name in OTLP_ENDPOINTS):
+            self.otel = self._otlp()
+        if self.otel is None and config.trace_file:
+            self.file = open(str(config.trace_file), "a", encoding="utf-8")
+        self.enabled = self.otel is not None or self.file is not None
+
+    def _otlp(self) -> Any:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.error(TRACING_NOT_INSTALLED)
+            return None
+        resource = Resource.create({"service.name": os.environ.get("OTEL_SERVICE_NAME", TRACER_NAME)})
+        self.provider = TracerProvider(resource=resource)
+        self.provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        return self.provider.get_tracer(TRACER_NAME)
+
+    def shutdown(self) -> None:
+        # Flushes spans still queued for the collector
+        if self.provider is not None:
+            self.provider.shutdown()
+        if self.file is not None:
+            self.file.close()
+        self.enabled = False
+        self.file = None
+        self.otel = None
+        self.provider = None
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        if not self.enabled:
+            yield Span(name, "", "", None, {})
+            return
+        stack = self._stack()
+        parent = stack[-1] if stack else self._root
+        span = Span(name, parent.trace_id if parent is not None else os.urandom(16).hex(), os.urandom(8).hex(),
+                    parent.span_id if parent is not None else None, attributes or {})
+        if self.otel is not None:
+            from opentelemetry import trace
+            context = trace.set_span_in_context(parent.otel) if parent is not None and parent.otel else None
+            span.otel = self.otel.start_span(name, context=context, start_time=span.start)
+        if self._root is None and threading.current_thread() is threading.main_thread():
+            self._root = span
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as error:
+            # Exiting with status 0 is not an error
+            if not isinstance(error, SystemExit) or error.code not in (None, 0):
+                span.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            stack.pop()
+            if self._root is span:
+                self._root = None
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        span.end = time.time_ns()
+        if span.otel is not None:
+            from opentelemetry.trace import Status, StatusCode
+            span.otel.set_attributes(span.attributes)
+            if span.error:
+                span.otel.set_status(Status(StatusCode.ERROR, span.error))
+            span.otel.end(end_time=span.end)
+        if self.file is not None:
+            with self._lock:
+                self.file.write(json.dumps(span.to_dict(), default=str) + "\n")
+                self.file.flush()
+
+
+tracer = Tracer()
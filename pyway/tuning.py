@@ -0,0 +1,78 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from pyway.configfile import ConfigFile
+from pyway.errors import DIRECTIVE_NOT_SUPPORTED, TUNING_PROFILE_MISSING, TUNING_SETTING_INVALID
+from pyway.log import logger
+
+
+SETTING_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+NUMBER = re.compile(r"^-?\d+(?:\.\d+)?$")
+# Changing a setting of the migration session
+SETTING_STATEMENTS = {
+    "postgres": "SET {name} = {value}",
+    "mysql": "SET SESSION {name} = {value}",
+    "duckdb": "SET {name} = {value}",
+    "sqlite": "PRAGMA {name} = {value}",
+}
+CURRENT_SETTING = "SELECT current_setting('{name}')"
+SETTING_STATEMENTS["psycopg"] = SETTING_STATEMENTS["postgres"]
+
+
+# Applies a named profile of session settings from tuning_profiles, such as
+# a larger maintenance_work_mem for index builds, to the connection of a
+# migration. The settings end with the connection, except on DuckDB where
+# they are shared by the whole database and the previous values are put back.
+class Tuning():
+
+    def __init__(self, dialect: str, settings: Dict[str, Any]) -> None:
+        self.dialect = dialect
+        self.settings = settings
+        self.restore: List[str] = []
+
+    @staticmethod
+    def from_config(config: ConfigFile, directives: Dict[str, str], name: str) -> Optional['Tuning']:
+        # "-- pyway:tuning=<profile>" of a migration wins over tuning_profile
+        dialect = str(config.database_type)
+        profile = directives.get("tuning") or config.tuning_profile
+        if not profile:
+            return None
+        profiles = config.tuning_profiles or {}
+        if profile not in profiles:
+            raise ValueError(TUNING_PROFILE_MISSING % (name, profile))
+        if dialect not in SETTING_STATEMENTS:
+            raise ValueError(DIRECTIVE_NOT_SUPPORTED % (name, "tuning", dialect))
+        settings = profiles[profile] or {}
+        for setting in settings:
+            if not SETTING_NAME.match(str(setting)):
+                raise ValueError(TUNING_SETTING_INVALID % (profile, setting))
+        return Tuning(dialect, settings)
+
+    @staticmethod
+    def literal(value: Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if NUMBER.match(str(value)):
+            return str(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def apply(self, cursor: Any) -> None:
+        change = SETTING_STATEMENTS[self.dialect]
+        for name, value in self.settings.items():
+            if self.dialect == "duckdb":
+                cursor.execute(CURRENT_SETTING.format(name=name))
+                self.restore.append(change.format(name=name, value=self.literal(cursor.fetchone()[0])))
+            cursor.execute(change.format(name=name, value=self.literal(value)))
+            if cursor.description is not None:
+                cursor.fetchall()
+            logger.debug(f"  {name} = {value}")
+
+    def reset(self, cursor: Any) -> None:
+        for statement in reversed(self.restore):
+            try:
+                cursor.execute(statement)
+                if cursor.description is not None:
+                    cursor.fetchall()
+            except Exception as error:
+                logger.error(f"  could not restore [{statement}]: {error}")
+        self.restore = []
@@ -5,6 +5,7 @@ from pyway.helpers import bcolors
 from pyway.helpers import Utils
 from pyway.dbms.database import factory
 from pyway.migration import Migration
+from pyway.tracing import tracer
 from pyway.errors import (OUT_OF_DATE_ERROR, DIFF_NAME_ERROR, DIFF_CHECKSUM_ERROR,
                           MIGRATIONS_NOT_FOUND, MIGRATIONS_NOT_STARTED,
                           DIFF_CHECKSUM_ERROR_DOS)
@@ -19,7 +20,11 @@ class Validate():
 
     def run(self,  skip_initial_check: bool = False) -> str:
         local_migrations = self._get_all_local_migrations()
-        db_migrations = self._db.get_all_schema_migrations()
+        # Failed attempts are not applied, so their files may have changed since
+        with tracer.span("history fetch", {"db.system": self.args.database_type,
+                                           "db.sql.table": self.args.database_table}) as span:
+            db_migrations = [m for m in self._db.get_all_schema_migrations() if m.success is not False]
+            span.set("pyway.migrations", len(db_migrations))
         output = ""
 
         if not db_migrations:
@@ -63,11 +68,13 @@ class Validate():
         return bool(local_migration.checksum == db_migration.checksum)
 
     def _get_all_local_migrations(self) -> List:
-        local_files = Utils.get_local_files(self.migration_dir)
-        if not local_files:
-            return []
-        migrations = [Migration.from_name(local_file, self.migration_dir) for local_file in local_files]
-        return Utils.sort_migrations_list(migrations)
+        with tracer.span("local scan", {"pyway.migration_dir": self.migration_dir}) as span:
+            local_files = Utils.get_local_files(self.migration_dir)
+            span.set("pyway.migrations", len(local_files))
+            if not local_files:
+                return []
+            migrations = [Migration.from_name(local_file, self.migration_dir) for local_file in local_files]
+            return Utils.sort_migrations_list(migrations)
 
     def _has_dos_line_endings(self, file_path: str) -> bool:
         with open(file_path, 'rb') as file:
@@ -0,0 +1,2 @@
+CREATE TABLE accounts AS SELECT range AS id, 'User' || range || '@Example.com' AS email FROM range(1, 20001);
+ALTER TABLE accounts ADD COLUMN email_lower VARCHAR;
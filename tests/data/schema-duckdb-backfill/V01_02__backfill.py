@@ -0,0 +1,3 @@
+def migrate(conn, ctx):
+    ctx.backfill("accounts", "id", "UPDATE accounts SET email_lower = lower(email) WHERE id >= {start} AND id < {end}",
+                 chunk_size=2500, workers=4)
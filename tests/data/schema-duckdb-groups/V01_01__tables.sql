@@ -0,0 +1,3 @@
+CREATE TABLE orders AS SELECT range AS id, range % 97 AS customer_id FROM range(50000);
+CREATE TABLE invoices AS SELECT range AS id, range % 89 AS order_id FROM range(50000);
+CREATE TABLE payments AS SELECT range AS id, range % 83 AS invoice_id FROM range(50000);
@@ -0,0 +1,2 @@
+-- pyway:group=indexes
+CREATE INDEX orders_customer_id ON orders (customer_id);
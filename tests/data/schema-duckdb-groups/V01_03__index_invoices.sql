@@ -0,0 +1,2 @@
+-- pyway:group=indexes
+CREATE INDEX invoices_order_id ON invoices (order_id);
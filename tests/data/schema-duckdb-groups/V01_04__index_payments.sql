@@ -0,0 +1,2 @@
+-- pyway:group=indexes
+CREATE INDEX payments_invoice_id ON payments (invoice_id);
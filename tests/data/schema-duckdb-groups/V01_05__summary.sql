@@ -0,0 +1 @@
+CREATE TABLE summary AS SELECT count(*) AS orders FROM orders;
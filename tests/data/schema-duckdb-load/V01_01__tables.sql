@@ -0,0 +1,2 @@
+CREATE TABLE events (id INTEGER, name VARCHAR);
+CREATE TABLE regions (code VARCHAR, label VARCHAR);
@@ -0,0 +1,4 @@
+CREATE TABLE countries (
+    code CHAR(2) PRIMARY KEY,
+    name VARCHAR(100)
+);
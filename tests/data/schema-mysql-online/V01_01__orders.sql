@@ -0,0 +1,2 @@
+CREATE TABLE orders (id int NOT NULL AUTO_INCREMENT PRIMARY KEY, total decimal(10, 2), note varchar(20));
+INSERT INTO orders (total, note) VALUES (10.50, 'a'), (20.00, 'b'), (30.25, 'c');
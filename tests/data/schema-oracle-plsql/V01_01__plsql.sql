@@ -0,0 +1,29 @@
+-- Oracle multi-statement migration with PL/SQL units
+CREATE TABLE plsqltable (
+    id NUMBER PRIMARY KEY,
+    name VARCHAR2(50)
+);
+
+INSERT INTO plsqltable (id, name) VALUES (1, 'one');
+INSERT INTO plsqltable (id, name) VALUES (2, 'two; with delimiter');
+INSERT INTO plsqltable (id, name) VALUES (3, NULL);
+
+CREATE OR REPLACE PACKAGE plsqlpkg AS
+    FUNCTION total RETURN NUMBER;
+END plsqlpkg;
+/
+
+CREATE OR REPLACE PACKAGE BODY plsqlpkg AS
+    FUNCTION total RETURN NUMBER IS
+        result NUMBER;
+    BEGIN
+        SELECT COUNT(*) INTO result FROM plsqltable;
+        RETURN result;
+    END;
+END plsqlpkg;
+/
+
+BEGIN
+    UPDATE plsqltable SET name = 'three' WHERE id = 3;
+END;
+/
@@ -0,0 +1,2 @@
+CREATE TABLE orders (id integer PRIMARY KEY, customer_id integer);
+INSERT INTO orders SELECT i, i % 50 FROM generate_series(1, 1000) AS i;
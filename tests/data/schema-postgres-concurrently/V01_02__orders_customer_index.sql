@@ -0,0 +1,4 @@
+-- pyway:transaction=false
+-- pyway:lock_timeout=2s
+-- pyway:statement_timeout=30m
+CREATE INDEX CONCURRENTLY orders_customer_id ON orders (customer_id);
@@ -0,0 +1,5 @@
+CREATE TABLE countries (
+    code char(2) PRIMARY KEY,
+    name varchar(100),
+    population bigint
+);
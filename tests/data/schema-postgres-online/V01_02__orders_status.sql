@@ -0,0 +1,3 @@
+-- pyway:online=true
+-- pyway:chunk_size=2
+ALTER TABLE orders ADD COLUMN status varchar(10) NOT NULL DEFAULT 'new', DROP COLUMN note;
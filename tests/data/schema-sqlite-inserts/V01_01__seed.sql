@@ -0,0 +1,257 @@
+CREATE TABLE seedtable (
+  id INTEGER PRIMARY KEY,
+  name TEXT,
+  score REAL
+);
+INSERT INTO seedtable (id, name, score) VALUES (1, 'name 1''s', 1.5);
+INSERT INTO seedtable (id, name, score) VALUES (2, 'name 2''s', 2.5);
+INSERT INTO seedtable (id, name, score) VALUES (3, 'name 3''s', 3.5);
+INSERT INTO seedtable (id, name, score) VALUES (4, 'name 4''s', 4.5);
+INSERT INTO seedtable (id, name, score) VALUES (5, 'name 5''s', 5.5);
+INSERT INTO seedtable (id, name, score) VALUES (6, 'name 6''s', 6.5);
+INSERT INTO seedtable (id, name, score) VALUES (7, 'name 7''s', 7.5);
+INSERT INTO seedtable (id, name, score) VALUES (8, 'name 8''s', 8.5);
+INSERT INTO seedtable (id, name, score) VALUES (9, 'name 9''s', 9.5);
+INSERT INTO seedtable (id, name, score) VALUES (10, 'name 10''s', 10.5);
+INSERT INTO seedtable (id, name, score) VALUES (11, 'name 11''s', 11.5);
+INSERT INTO seedtable (id, name, score) VALUES (12, 'name 12''s', 12.5);
+INSERT INTO seedtable (id, name, score) VALUES (13, 'name 13''s', 13.5);
+INSERT INTO seedtable (id, name, score) VALUES (14, 'name 14''s', 14.5);
+INSERT INTO seedtable (id, name, score) VALUES (15, 'name 15''s', 15.5);
+INSERT INTO seedtable (id, name, score) VALUES (16, 'name 16''s', 16.5);
+INSERT INTO seedtable (id, name, score) VALUES (17, 'name 17''s', 17.5);
+INSERT INTO seedtable (id, name, score) VALUES (18, 'name 18''s', 18.5);
+INSERT INTO seedtable (id, name, score) VALUES (19, 'name 19''s', 19.5);
+INSERT INTO seedtable (id, name, score) VALUES (20, 'name 20''s', 20.5);
+INSERT INTO seedtable (id, name, score) VALUES (21, 'name 21''s', 21.5);
+INSERT INTO seedtable (id, name, score) VALUES (22, 'name 22''s', 22.5);
+INSERT INTO seedtable (id, name, score) VALUES (23, 'name 23''s', 23.5);
+INSERT INTO seedtable (id, name, score) VALUES (24, 'name 24''s', 24.5);
+INSERT INTO seedtable (id, name, score) VALUES (25, 'name 25''s', 25.5);
+INSERT INTO seedtable (id, name, score) VALUES (26, 'name 26''s', 26.5);
+INSERT INTO seedtable (id, name, score) VALUES (27, 'name 27''s', 27.5);
+INSERT INTO seedtable (id, name, score) VALUES (28, 'name 28''s', 28.5);
+INSERT INTO seedtable (id, name, score) VALUES (29, 'name 29''s', 29.5);
+INSERT INTO seedtable (id, name, score) VALUES (30, 'name 30''s', 30.5);
+INSERT INTO seedtable (id, name, score) VALUES (31, 'name 31''s', 31.5);
+INSERT INTO seedtable (id, name, score) VALUES (32, 'name 32''s', 32.5);
+INSERT INTO seedtable (id, name, score) VALUES (33, 'name 33''s', 33.5);
+INSERT INTO seedtable (id, name, score) VALUES (34, 'name 34''s', 34.5);
+INSERT INTO seedtable (id, name, score) VALUES (35, 'name 35''s', 35.5);
+INSERT INTO seedtable (id, name, score) VALUES (36, 'name 36''s', 36.5);
+INSERT INTO seedtable (id, name, score) VALUES (37, 'name 37''s', 37.5);
+INSERT INTO seedtable (id, name, score) VALUES (38, 'name 38''s', 38.5);
+INSERT INTO seedtable (id, name, score) VALUES (39, 'name 39''s', 39.5);
+INSERT INTO seedtable (id, name, score) VALUES (40, 'name 40''s', 40.5);
+INSERT INTO seedtable (id, name, score) VALUES (41, 'name 41''s', 41.5);
+INSERT INTO seedtable (id, name, score) VALUES (42, 'name 42''s', 42.5);
+INSERT INTO seedtable (id, name, score) VALUES (43, 'name 43''s', 43.5);
+INSERT INTO seedtable (id, name, score) VALUES (44, 'name 44''s', 44.5);
+INSERT INTO seedtable (id, name, score) VALUES (45, 'name 45''s', 45.5);
+INSERT INTO seedtable (id, name, score) VALUES (46, 'name 46''s', 46.5);
+INSERT INTO seedtable (id, name, score) VALUES (47, 'name 47''s', 47.5);
+INSERT INTO seedtable (id, name, score) VALUES (48, 'name 48''s', 48.5);
+INSERT INTO seedtable (id, name, score) VALUES (49, 'name 49''s', 49.5);
+INSERT INTO seedtable (id, name, score) VALUES (50, 'name 50''s', 50.5);
+INSERT INTO seedtable (id, name, score) VALUES (51, 'name 51''s', 51.5);
+INSERT INTO seedtable (id, name, score) VALUES (52, 'name 52''s', 52.5);
+INSERT INTO seedtable (id, name, score) VALUES (53, 'name 53''s', 53.5);
+INSERT INTO seedtable (id, name, score) VALUES (54, 'name 54''s', 54.5);
+INSERT INTO seedtable (id, name, score) VALUES (55, 'name 55''s', 55.5);
+INSERT INTO seedtable (id, name, score) VALUES (56, 'name 56''s', 56.5);
+INSERT INTO seedtable (id, name, score) VALUES (57, 'name 57''s', 57.5);
+INSERT INTO seedtable (id, name, score) VALUES (58, 'name 58''s', 58.5);
+INSERT INTO seedtable (id, name, score) VALUES (59, 'name 59''s', 59.5);
+INSERT INTO seedtable (id, name, score) VALUES (60, 'name 60''s', 60.5);
+INSERT INTO seedtable (id, name, score) VALUES (61, 'name 61''s', 61.5);
+INSERT INTO seedtable (id, name, score) VALUES (62, 'name 62''s', 62.5);
+INSERT INTO seedtable (id, name, score) VALUES (63, 'name 63''s', 63.5);
+INSERT INTO seedtable (id, name, score) VALUES (64, 'name 64''s', 64.5);
+INSERT INTO seedtable (id, name, score) VALUES (65, 'name 65''s', 65.5);
+INSERT INTO seedtable (id, name, score) VALUES (66, 'name 66''s', 66.5);
+INSERT INTO seedtable (id, name, score) VALUES (67, 'name 67''s', 67.5);
+INSERT INTO seedtable (id, name, score) VALUES (68, 'name 68''s', 68.5);
+INSERT INTO seedtable (id, name, score) VALUES (69, 'name 69''s', 69.5);
+INSERT INTO seedtable (id, name, score) VALUES (70, 'name 70''s', 70.5);
+INSERT INTO seedtable (id, name, score) VALUES (71, 'name 71''s', 71.5);
+INSERT INTO seedtable (id, name, score) VALUES (72, 'name 72''s', 72.5);
+INSERT INTO seedtable (id, name, score) VALUES (73, 'name 73''s', 73.5);
+INSERT INTO seedtable (id, name, score) VALUES (74, 'name 74''s', 74.5);
+INSERT INTO seedtable (id, name, score) VALUES (75, 'name 75''s', 75.5);
+INSERT INTO seedtable (id, name, score) VALUES (76, 'name 76''s', 76.5);
+INSERT INTO seedtable (id, name, score) VALUES (77, 'name 77''s', 77.5);
+INSERT INTO seedtable (id, name, score) VALUES (78, 'name 78''s', 78.5);
+INSERT INTO seedtable (id, name, score) VALUES (79, 'name 79''s', 79.5);
+INSERT INTO seedtable (id, name, score) VALUES (80, 'name 80''s', 80.5);
+INSERT INTO seedtable (id, name, score) VALUES (81, 'name 81''s', 81.5);
+INSERT INTO seedtable (id, name, score) VALUES (82, 'name 82''s', 82.5);
+INSERT INTO seedtable (id, name, score) VALUES (83, 'name 83''s', 83.5);
+INSERT INTO seedtable (id, name, score) VALUES (84, 'name 84''s', 84.5);
+INSERT INTO seedtable (id, name, score) VALUES (85, 'name 85''s', 85.5);
+INSERT INTO seedtable (id, name, score) VALUES (86, 'name 86''s', 86.5);
+INSERT INTO seedtable (id, name, score) VALUES (87, 'name 87''s', 87.5);
+INSERT INTO seedtable (id, name, score) VALUES (88, 'name 88''s', 88.5);
+INSERT INTO seedtable (id, name, score) VALUES (89, 'name 89''s', 89.5);
+INSERT INTO seedtable (id, name, score) VALUES (90, 'name 90''s', 90.5);
+INSERT INTO seedtable (id, name, score) VALUES (91, 'name 91''s', 91.5);
+INSERT INTO seedtable (id, name, score) VALUES (92, 'name 92''s', 92.5);
+INSERT INTO seedtable (id, name, score) VALUES (93, 'name 93''s', 93.5);
+INSERT INTO seedtable (id, name, score) VALUES (94, 'name 94''s', 94.5);
+INSERT INTO seedtable (id, name, score) VALUES (95, 'name 95''s', 95.5);
+INSERT INTO seedtable (id, name, score) VALUES (96, 'name 96''s', 96.5);
+INSERT INTO seedtable (id, name, score) VALUES (97, 'name 97''s', 97.5);
+INSERT INTO seedtable (id, name, score) VALUES (98, 'name 98''s', 98.5);
+INSERT INTO seedtable (id, name, score) VALUES (99, 'name 99''s', 99.5);
+INSERT INTO seedtable (id, name, score) VALUES (100, 'name 100''s', 100.5);
+INSERT INTO seedtable (id, name, score) VALUES (1000, NULL, NULL);
+INSERT INTO seedtable (id, name, score) VALUES (101, 'name 101''s', 101.5);
+INSERT INTO seedtable (id, name, score) VALUES (102, 'name 102''s', 102.5);
+INSERT INTO seedtable (id, name, score) VALUES (103, 'name 103''s', 103.5);
+INSERT INTO seedtable (id, name, score) VALUES (104, 'name 104''s', 104.5);
+INSERT INTO seedtable (id, name, score) VALUES (105, 'name 105''s', 105.5);
+INSERT INTO seedtable (id, name, score) VALUES (106, 'name 106''s', 106.5);
+INSERT INTO seedtable (id, name, score) VALUES (107, 'name 107''s', 107.5);
+INSERT INTO seedtable (id, name, score) VALUES (108, 'name 108''s', 108.5);
+INSERT INTO seedtable (id, name, score) VALUES (109, 'name 109''s', 109.5);
+INSERT INTO seedtable (id, name, score) VALUES (110, 'name 110''s', 110.5);
+INSERT INTO seedtable (id, name, score) VALUES (111, 'name 111''s', 111.5);
+INSERT INTO seedtable (id, name, score) VALUES (112, 'name 112''s', 112.5);
+INSERT INTO seedtable (id, name, score) VALUES (113, 'name 113''s', 113.5);
+INSERT INTO seedtable (id, name, score) VALUES (114, 'name 114''s', 114.5);
+INSERT INTO seedtable (id, name, score) VALUES (115, 'name 115''s', 115.5);
+INSERT INTO seedtable (id, name, score) VALUES (116, 'name 116''s', 116.5);
+INSERT INTO seedtable (id, name, score) VALUES (117, 'name 117''s', 117.5);
+INSERT INTO seedtable (id, name, score) VALUES (118, 'name 118''s', 118.5);
+INSERT INTO seedtable (id, name, score) VALUES (119, 'name 119''s', 119.5);
+INSERT INTO seedtable (id, name, score) VALUES (120, 'name 120''s', 120.5);
+INSERT INTO seedtable (id, name, score) VALUES (121, 'name 121''s', 121.5);
+INSERT INTO seedtable (id, name, score) VALUES (122, 'name 122''s', 122.5);
+INSERT INTO seedtable (id, name, score) VALUES (123, 'name 123''s', 123.5);
+INSERT INTO seedtable (id, name, score) VALUES (124, 'name 124''s', 124.5);
+INSERT INTO seedtable (id, name, score) VALUES (125, 'name 125''s', 125.5);
+INSERT INTO seedtable (id, name, score) VALUES (126, 'name 126''s', 126.5);
+INSERT INTO seedtable (id, name, score) VALUES (127, 'name 127''s', 127.5);
+INSERT INTO seedtable (id, name, score) VALUES (128, 'name 128''s', 128.5);
+INSERT INTO seedtable (id, name, score) VALUES (129, 'name 129''s', 129.5);
+INSERT INTO seedtable (id, name, score) VALUES (130, 'name 130''s', 130.5);
+INSERT INTO seedtable (id, name, score) VALUES (131, 'name 131''s', 131.5);
+INSERT INTO seedtable (id, name, score) VALUES (132, 'name 132''s', 132.5);
+INSERT INTO seedtable (id, name, score) VALUES (133, 'name 133''s', 133.5);
+INSERT INTO seedtable (id, name, score) VALUES (134, 'name 134''s', 134.5);
+INSERT INTO seedtable (id, name, score) VALUES (135, 'name 135''s', 135.5);
+INSERT INTO seedtable (id, name, score) VALUES (136, 'name 136''s', 136.5);
+INSERT INTO seedtable (id, name, score) VALUES (137, 'name 137''s', 137.5);
+INSERT INTO seedtable (id, name, score) VALUES (138, 'name 138''s', 138.5);
+INSERT INTO seedtable (id, name, score) VALUES (139, 'name 139''s', 139.5);
+INSERT INTO seedtable (id, name, score) VALUES (140, 'name 140''s', 140.5);
+INSERT INTO seedtable (id, name, score) VALUES (141, 'name 141''s', 141.5);
+INSERT INTO seedtable (id, name, score) VALUES (142, 'name 142''s', 142.5);
+INSERT INTO seedtable (id, name, score) VALUES (143, 'name 143''s', 143.5);
+INSERT INTO seedtable (id, name, score) VALUES (144, 'name 144''s', 144.5);
+INSERT INTO seedtable (id, name, score) VALUES (145, 'name 145''s', 145.5);
+INSERT INTO seedtable (id, name, score) VALUES (146, 'name 146''s', 146.5);
+INSERT INTO seedtable (id, name, score) VALUES (147, 'name 147''s', 147.5);
+INSERT INTO seedtable (id, name, score) VALUES (148, 'name 148''s', 148.5);
+INSERT INTO seedtable (id, name, score) VALUES (149, 'name 149''s', 149.5);
+INSERT INTO seedtable (id, name, score) VALUES (150, 'name 150''s', 150.5);
+INSERT INTO seedtable (id, name, score) VALUES (151, 'name 151''s', 151.5);
+INSERT INTO seedtable (id, name, score) VALUES (152, 'name 152''s', 152.5);
+INSERT INTO seedtable (id, name, score) VALUES (153, 'name 153''s', 153.5);
+INSERT INTO seedtable (id, name, score) VALUES (154, 'name 154''s', 154.5);
+INSERT INTO seedtable (id, name, score) VALUES (155, 'name 155''s', 155.5);
+INSERT INTO seedtable (id, name, score) VALUES (156, 'name 156''s', 156.5);
+INSERT INTO seedtable (id, name, score) VALUES (157, 'name 157''s', 157.5);
+INSERT INTO seedtable (id, name, score) VALUES (158, 'name 158''s', 158.5);
+INSERT INTO seedtable (id, name, score) VALUES (159, 'name 159''s', 159.5);
+INSERT INTO seedtable (id, name, score) VALUES (160, 'name 160''s', 160.5);
+INSERT INTO seedtable (id, name, score) VALUES (161, 'name 161''s', 161.5);
+INSERT INTO seedtable (id, name, score) VALUES (162, 'name 162''s', 162.5);
+INSERT INTO seedtable (id, name, score) VALUES (163, 'name 163''s', 163.5);
+INSERT INTO seedtable (id, name, score) VALUES (164, 'name 164''s', 164.5);
+INSERT INTO seedtable (id, name, score) VALUES (165, 'name 165''s', 165.5);
+INSERT INTO seedtable (id, name, score) VALUES (166, 'name 166''s', 166.5);
+INSERT INTO seedtable (id, name, score) VALUES (167, 'name 167''s', 167.5);
+INSERT INTO seedtable (id, name, score) VALUES (168, 'name 168''s', 168.5);
+INSERT INTO seedtable (id, name, score) VALUES (169, 'name 169''s', 169.5);
+INSERT INTO seedtable (id, name, score) VALUES (170, 'name 170''s', 170.5);
+INSERT INTO seedtable (id, name, score) VALUES (171, 'name 171''s', 171.5);
+INSERT INTO seedtable (id, name, score) VALUES (172, 'name 172''s', 172.5);
+INSERT INTO seedtable (id, name, score) VALUES (173, 'name 173''s', 173.5);
+INSERT INTO seedtable (id, name, score) VALUES (174, 'name 174''s', 174.5);
+INSERT INTO seedtable (id, name, score) VALUES (175, 'name 175''s', 175.5);
+INSERT INTO seedtable (id, name, score) VALUES (176, 'name 176''s', 176.5);
+INSERT INTO seedtable (id, name, score) VALUES (177, 'name 177''s', 177.5);
+INSERT INTO seedtable (id, name, score) VALUES (178, 'name 178''s', 178.5);
+INSERT INTO seedtable (id, name, score) VALUES (179, 'name 179''s', 179.5);
+INSERT INTO seedtable (id, name, score) VALUES (180, 'name 180''s', 180.5);
+INSERT INTO seedtable (id, name, score) VALUES (181, 'name 181''s', 181.5);
+INSERT INTO seedtable (id, name, score) VALUES (182, 'name 182''s', 182.5);
+INSERT INTO seedtable (id, name, score) VALUES (183, 'name 183''s', 183.5);
+INSERT INTO seedtable (id, name, score) VALUES (184, 'name 184''s', 184.5);
+INSERT INTO seedtable (id, name, score) VALUES (185, 'name 185''s', 185.5);
+INSERT INTO seedtable (id, name, score) VALUES (186, 'name 186''s', 186.5);
+INSERT INTO seedtable (id, name, score) VALUES (187, 'name 187''s', 187.5);
+INSERT INTO seedtable (id, name, score) VALUES (188, 'name 188''s', 188.5);
+INSERT INTO seedtable (id, name, score) VALUES (189, 'name 189''s', 189.5);
+INSERT INTO seedtable (id, name, score) VALUES (190, 'name 190''s', 190.5);
+INSERT INTO seedtable (id, name, score) VALUES (191, 'name 191''s', 191.5);
+INSERT INTO seedtable (id, name, score) VALUES (192, 'name 192''s', 192.5);
+INSERT INTO seedtable (id, name, score) VALUES (193, 'name 193''s', 193.5);
+INSERT INTO seedtable (id, name, score) VALUES (194, 'name 194''s', 194.5);
+INSERT INTO seedtable (id, name, score) VALUES (195, 'name 195''s', 195.5);
+INSERT INTO seedtable (id, name, score) VALUES (196, 'name 196''s', 196.5);
+INSERT INTO seedtable (id, name, score) VALUES (197, 'name 197''s', 197.5);
+INSERT INTO seedtable (id, name, score) VALUES (198, 'name 198''s', 198.5);
+INSERT INTO seedtable (id, name, score) VALUES (199, 'name 199''s', 199.5);
+INSERT INTO seedtable (id, name, score) VALUES (200, 'name 200''s', 200.5);
+INSERT INTO seedtable (id, name, score) VALUES (201, 'name 201''s', 201.5);
+INSERT INTO seedtable (id, name, score) VALUES (202, 'name 202''s', 202.5);
+INSERT INTO seedtable (id, name, score) VALUES (203, 'name 203''s', 203.5);
+INSERT INTO seedtable (id, name, score) VALUES (204, 'name 204''s', 204.5);
+INSERT INTO seedtable (id, name, score) VALUES (205, 'name 205''s', 205.5);
+INSERT INTO seedtable (id, name, score) VALUES (206, 'name 206''s', 206.5);
+INSERT INTO seedtable (id, name, score) VALUES (207, 'name 207''s', 207.5);
+INSERT INTO seedtable (id, name, score) VALUES (208, 'name 208''s', 208.5);
+INSERT INTO seedtable (id, name, score) VALUES (209, 'name 209''s', 209.5);
+INSERT INTO seedtable (id, name, score) VALUES (210, 'name 210''s', 210.5);
+INSERT INTO seedtable (id, name, score) VALUES (211, 'name 211''s', 211.5);
+INSERT INTO seedtable (id, name, score) VALUES (212, 'name 212''s', 212.5);
+INSERT INTO seedtable (id, name, score) VALUES (213, 'name 213''s', 213.5);
+INSERT INTO seedtable (id, name, score) VALUES (214, 'name 214''s', 214.5);
+INSERT INTO seedtable (id, name, score) VALUES (215, 'name 215''s', 215.5);
+INSERT INTO seedtable (id, name, score) VALUES (216, 'name 216''s', 216.5);
+INSERT INTO seedtable (id, name, score) VALUES (217, 'name 217''s', 217.5);
+INSERT INTO seedtable (id, name, score) VALUES (218, 'name 218''s', 218.5);
+INSERT INTO seedtable (id, name, score) VALUES (219, 'name 219''s', 219.5);
+INSERT INTO seedtable (id, name, score) VALUES (220, 'name 220''s', 220.5);
+INSERT INTO seedtable (id, name, score) VALUES (221, 'name 221''s', 221.5);
+INSERT INTO seedtable (id, name, score) VALUES (222, 'name 222''s', 222.5);
+INSERT INTO seedtable (id, name, score) VALUES (223, 'name 223''s', 223.5);
+INSERT INTO seedtable (id, name, score) VALUES (224, 'name 224''s', 224.5);
+INSERT INTO seedtable (id, name, score) VALUES (225, 'name 225''s', 225.5);
+INSERT INTO seedtable (id, name, score) VALUES (226, 'name 226''s', 226.5);
+INSERT INTO seedtable (id, name, score) VALUES (227, 'name 227''s', 227.5);
+INSERT INTO seedtable (id, name, score) VALUES (228, 'name 228''s', 228.5);
+INSERT INTO seedtable (id, name, score) VALUES (229, 'name 229''s', 229.5);
+INSERT INTO seedtable (id, name, score) VALUES (230, 'name 230''s', 230.5);
+INSERT INTO seedtable (id, name, score) VALUES (231, 'name 231''s', 231.5);
+INSERT INTO seedtable (id, name, score) VALUES (232, 'name 232''s', 232.5);
+INSERT INTO seedtable (id, name, score) VALUES (233, 'name 233''s', 233.5);
+INSERT INTO seedtable (id, name, score) VALUES (234, 'name 234''s', 234.5);
+INSERT INTO seedtable (id, name, score) VALUES (235, 'name 235''s', 235.5);
+INSERT INTO seedtable (id, name, score) VALUES (236, 'name 236''s', 236.5);
+INSERT INTO seedtable (id, name, score) VALUES (237, 'name 237''s', 237.5);
+INSERT INTO seedtable (id, name, score) VALUES (238, 'name 238''s', 238.5);
+INSERT INTO seedtable (id, name, score) VALUES (239, 'name 239''s', 239.5);
+INSERT INTO seedtable (id, name, score) VALUES (240, 'name 240''s', 240.5);
+INSERT INTO seedtable (id, name, score) VALUES (241, 'name 241''s', 241.5);
+INSERT INTO seedtable (id, name, score) VALUES (242, 'name 242''s', 242.5);
+INSERT INTO seedtable (id, name, score) VALUES (243, 'name 243''s', 243.5);
+INSERT INTO seedtable (id, name, score) VALUES (244, 'name 244''s', 244.5);
+INSERT INTO seedtable (id, name, score) VALUES (245, 'name 245''s', 245.5);
+INSERT INTO seedtable (id, name, score) VALUES (246, 'name 246''s', 246.5);
+INSERT INTO seedtable (id, name, score) VALUES (247, 'name 247''s', 247.5);
+INSERT INTO seedtable (id, name, score) VALUES (248, 'name 248''s', 248.5);
+INSERT INTO seedtable (id, name, score) VALUES (249, 'name 249''s', 249.5);
+INSERT INTO seedtable (id, name, score) VALUES (250, 'name 250''s', 250.5);
+CREATE INDEX seedtable_name ON seedtable (name);
@@ -0,0 +1,6 @@
+CREATE TABLE accounts (
+  id INTEGER PRIMARY KEY,
+  email TEXT
+);
+INSERT INTO accounts (id, email) VALUES (1, 'ONE@EXAMPLE.COM');
+INSERT INTO accounts (id, email) VALUES (2, 'Two@Example.com');
@@ -0,0 +1,7 @@
+def migrate(conn, ctx):
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE accounts ADD COLUMN email_lower TEXT")
+    rows = cursor.execute("SELECT id, email FROM accounts").fetchall()
+    cursor.executemany("UPDATE accounts SET email_lower = ? WHERE id = ?",
+                       [(email.lower(), id_) for id_, email in rows])
+    ctx.log.info(f"{ctx.migration.name}: {len(rows)} rows on {ctx.dialect}")
@@ -0,0 +1,31 @@
+import pytest
+from pyway.analyze import Analyze
+
+
+@pytest.mark.analyze_test
+def test_tables() -> None:
+    statements = [
+        "-- seed\nINSERT INTO public.accounts (id) VALUES (1)",
+        "insert or replace into settings values (1)",
+        "UPDATE ONLY orders SET status = 'new'",
+        "DELETE FROM \"Order Lines\" WHERE id < 10",
+        "COPY events (id, name) FROM STDIN",
+        "COPY events TO '/tmp/events.csv'",
+        "CREATE UNIQUE INDEX CONCURRENTLY accounts_email ON accounts (email)",
+        "CREATE TABLE archive AS SELECT * FROM orders",
+        "CREATE TABLE plain (id INTEGER)",
+        "LOAD DATA LOCAL INFILE 'x.csv' INTO TABLE `shop`.`regions`",
+        "SELECT * FROM accounts",
+        "insert into accounts (id) values (2)",
+    ]
+    assert Analyze.tables(statements) == ["public.accounts", "settings", "orders", "\"Order Lines\"", "events",
+                                          "accounts", "archive", "`shop`.`regions`"]
+
+
+@pytest.mark.analyze_test
+def test_statements() -> None:
+    assert Analyze(None, "mysql").statement("orders") == "ANALYZE TABLE orders"
+    assert Analyze(None, "oracle").statement("orders") == \
+        "BEGIN DBMS_STATS.GATHER_TABLE_STATS(USER, 'ORDERS'); END;"
+    assert Analyze(None, "oracle").statement('shop."Orders"') == \
+        "BEGIN DBMS_STATS.GATHER_TABLE_STATS('SHOP', 'Orders'); END;"
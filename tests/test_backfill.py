@@ -0,0 +1,72 @@
+import os
+import pytest
+from pyway.backfill import Backfill
+from pyway.settings import ConfigFile
+
+from pyway.dbms.database import factory
+
+
+STATEMENT = "UPDATE items SET hits = hits + 1, label = CASE WHEN fail = 1 THEN NULL ELSE 'done' END " \
+            "WHERE id >= {start} AND id < {end}"
+
+
+@pytest.fixture
+def sqlite_connect(autouse: bool = True):
+    # Delete any existing databases
+    try:
+        os.remove("./unittest-backfill.sqlite")
+    except Exception:
+        pass
+
+    args = ConfigFile()
+    args.database_type = "sqlite"
+    args.database_name = "./unittest-backfill.sqlite"
+    args.database_table = "pyway"
+
+    db = factory(args.database_type)(args)
+    cnx = db.connect()
+    cnx.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, hits INTEGER NOT NULL, label TEXT NOT NULL, fail INTEGER)")
+    cnx.executemany("INSERT INTO items VALUES (?, 0, 'new', ?)", [(i, int(i == 2500)) for i in range(1, 5001)])
+    cnx.commit()
+    cnx.close()
+    return db
+
+
+@pytest.mark.backfill_test
+@pytest.mark.sqlite_test
+def test_backfill_chunks(sqlite_connect) -> None:
+    rows = Backfill(sqlite_connect, "sqlite", "qmark", "pyway", "V01_02__backfill.py").run(
+        "items", "id", STATEMENT.replace("fail = 1", "fail = 2"), chunk_size=1000)
+
+    assert rows == 5000
+    cnx = sqlite_connect.connect()
+    assert cnx.execute("select min(hits), max(hits), min(label) from items").fetchone() == (1, 1, "done")
+    assert cnx.execute("select count(*) from pyway_backfill").fetchone() == (0,)
+
+
+@pytest.mark.backfill_test
+@pytest.mark.sqlite_test
+def test_backfill_resume(sqlite_connect) -> None:
+    backfill = Backfill(sqlite_connect, "sqlite", "qmark", "pyway", "V01_02__backfill.py")
+    with pytest.raises(Exception):
+        backfill.run("items", "id", STATEMENT, chunk_size=1000)
+
+    cnx = sqlite_connect.connect()
+    checkpoints = cnx.execute("select chunk_start, chunk_end, rows_affected from pyway_backfill order by 1").fetchall()
+    assert checkpoints == [(0, 1000, 999), (1000, 2000, 1000)]
+    cnx.execute("UPDATE items SET fail = 0")
+    cnx.commit()
+
+    rows = Backfill(sqlite_connect, "sqlite", "qmark", "pyway", "V01_02__backfill.py").run(
+        "items", "id", STATEMENT, chunk_size=1000)
+
+    # Only the chunks missing a checkpoint ran again
+    assert rows == 3001
+    assert cnx.execute("select min(hits), max(hits), min(label) from items").fetchone() == (1, 1, "done")
+
+
+@pytest.mark.backfill_test
+@pytest.mark.sqlite_test
+def test_backfill_requires_range(sqlite_connect) -> None:
+    with pytest.raises(ValueError):
+        Backfill(sqlite_connect, "sqlite", "qmark", "pyway", "x").run("items", "id", "UPDATE items SET hits = 1")
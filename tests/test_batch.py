@@ -0,0 +1,48 @@
+import pytest
+from decimal import Decimal
+from pyway.batch import Batch, Batcher
+
+
+@pytest.mark.batch_test
+def test_group_same_shape_inserts() -> None:
+    grouped = Batcher("oracle").group([
+        "insert into t (a, b) values (1, 'x')",
+        "insert into t (a, b) values (2, 'it''s')",
+        "insert into t (a, b) values (3.5, NULL)",
+    ])
+    assert len(grouped) == 1
+    assert isinstance(grouped[0], Batch)
+    assert grouped[0].rows == [(1, 'x'), (2, "it's"), (Decimal('3.5'), None)]
+    assert grouped[0].sql("numeric") == "INSERT INTO t (a, b) VALUES (:1, :2)"
+    assert grouped[0].sql("qmark") == "INSERT INTO t (a, b) VALUES (?, ?)"
+    assert grouped[0].sql("format") == "INSERT INTO t (a, b) VALUES (%s, %s)"
+
+
+@pytest.mark.batch_test
+def test_group_keeps_order_and_other_statements() -> None:
+    statements = [
+        "insert into t (a) values (1)",
+        "insert into t (a) values (2)",
+        "create index i on t (a)",
+        "insert into t (a) values (3)",
+        "insert into u (a) values (4)",
+    ]
+    grouped = Batcher("sqlite").group(statements)
+    assert isinstance(grouped[0], Batch) and grouped[0].rows == [(1,), (2,)]
+    assert grouped[1:] == statements[2:]
+
+
+@pytest.mark.batch_test
+def test_group_batch_size() -> None:
+    grouped = Batcher("sqlite", batch_size=2).group([f"insert into t (a) values ({i})" for i in range(5)])
+    assert [len(g) for g in grouped[:2]] == [2, 2]
+    assert grouped[2] == "insert into t (a) values (4)"
+
+
+@pytest.mark.batch_test
+def test_parse_rejects_non_literals() -> None:
+    batcher = Batcher("mysql")
+    assert batcher.parse("insert into t (a) values (now())") is None
+    assert batcher.parse("insert into t (a) values (1), (2)") is None
+    assert batcher.parse("insert into t (a) values ('a\\'b')") is None
+    assert batcher.parse("insert into t (a) select 1") is None
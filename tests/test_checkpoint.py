@@ -0,0 +1,89 @@
+import sqlite3
+import duckdb
+import pytest
+from pyway.checkpoint import StatementCheckpoints
+from pyway.migration import Migration
+
+
+class PostgresError(Exception):
+    def __init__(self, pgcode: str) -> None:
+        super().__init__("relation does not exist")
+        self.pgcode = pgcode
+
+
+class MysqlError(Exception):
+    def __init__(self, errno: int) -> None:
+        super().__init__("Table doesn't exist")
+        self.errno = errno
+
+
+class OracleError():
+    def __init__(self, code: int) -> None:
+        self.code = code
+
+
+class Broken():
+    # Connection where reading the checkpoint fails with the given error
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+        self.created = False
+
+    def connect(self) -> 'Broken':
+        return self
+
+    def cursor(self) -> 'Broken':
+        return self
+
+    def execute(self, statement, params=None) -> None:
+        if statement.startswith("select"):
+            raise self.error
+        self.created = self.created or statement.startswith("create table")
+
+    def fetchone(self) -> None:
+        return None
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def checkpoints(dialect: str, db=None) -> StatementCheckpoints:
+    return StatementCheckpoints(db, dialect, "format", "pyway")
+
+
+@pytest.mark.checkpoint_test
+def test_is_undefined_table() -> None:
+    assert checkpoints("postgres").is_undefined_table(PostgresError("42P01"))
+    assert not checkpoints("postgres").is_undefined_table(PostgresError("42501"))
+    assert checkpoints("mysql").is_undefined_table(MysqlError(1146))
+    assert not checkpoints("mysql").is_undefined_table(MysqlError(2013))
+    assert checkpoints("oracle").is_undefined_table(Exception(OracleError(942)))
+    assert not checkpoints("oracle").is_undefined_table(Exception(OracleError(1031)))
+    assert checkpoints("sqlite").is_undefined_table(sqlite3.OperationalError("no such table: pyway_progress"))
+    assert not checkpoints("sqlite").is_undefined_table(sqlite3.OperationalError("database is locked"))
+    with pytest.raises(duckdb.CatalogException) as e:
+        duckdb.connect().execute("select * from pyway_progress")
+    assert checkpoints("duckdb").is_undefined_table(e.value)
+
+
+@pytest.mark.checkpoint_test
+def test_start_creates_missing_table() -> None:
+    db = Broken(PostgresError("42P01"))
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    assert checkpoints("postgres", db).start(migration, ["select 1"]) == 0
+    assert db.created
+
+
+@pytest.mark.checkpoint_test
+def test_start_raises_other_errors() -> None:
+    # Missing privileges must not be taken for a first run, which would start over from statement 0
+    db = Broken(PostgresError("42501"))
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    with pytest.raises(PostgresError):
+        checkpoints("postgres", db).start(migration, ["select 1"])
+    assert not db.created
@@ -0,0 +1,69 @@
+import pytest
+import os
+from pyway.configfile import ConfigFile
+from pyway.dbms.postgres import Postgres
+from pyway.directives import Directives
+from pyway.executor import Executor
+from pyway.migration import Migration
+
+
+@pytest.mark.directives_test
+def test_read_directives() -> None:
+    path = os.path.join('tests', 'data', 'schema-postgres-copy', 'V01_02__load_countries.csv')
+    directives, offset = Directives.read(path)
+    assert directives == {'table': 'countries', 'columns': 'code, name, population', 'header': 'true'}
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        assert f.readline() == b'code,name,population\n'
+
+
+@pytest.mark.directives_test
+def test_read_no_directives() -> None:
+    directives, offset = Directives.read(os.path.join('tests', 'data', 'schema', 'V01_01__test1.sql'))
+    assert directives == {}
+    assert offset == 0
+
+
+@pytest.mark.directives_test
+def test_directives_from_script() -> None:
+    script = "-- pyway:transaction=false\n-- pyway:Lock_Timeout = 2s\nCREATE INDEX i ON t (c);\n-- pyway:group=x\n"
+    assert Directives.from_script(script) == {'transaction': 'false', 'lock_timeout': '2s'}
+
+
+@pytest.mark.directives_test
+def test_copy_header() -> None:
+    for header in ("true", "1", "yes", "On"):
+        statement = Postgres._copy_statement({"table": "countries", "header": header}, "csv")
+        assert statement == "COPY countries FROM STDIN WITH (FORMAT csv, HEADER true)"
+    assert "HEADER" not in Postgres._copy_statement({"table": "countries", "header": "0"}, "csv")
+
+
+class Connection():
+    # Records what a migration sends, without a database
+    def __init__(self):
+        self.executed = []
+
+    def connect(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, params=None):
+        self.executed.append(statement)
+
+    def close(self):
+        pass
+
+
+@pytest.mark.directives_test
+def test_mysql_statement_timeout_not_supported() -> None:
+    config = ConfigFile()
+    config.database_type = "mysql"
+    db = Connection()
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    with pytest.raises(ValueError) as e:
+        Executor(db, config).run("-- pyway:statement_timeout=30m\nUPDATE t SET c = 1;", migration)
+    assert "[statement_timeout] which is not supported by mysql" in str(e.value)
+    assert db.executed == []
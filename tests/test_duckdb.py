@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+import os
 import pytest
 
 from pyway.configfile import ConfigFile
 from pyway.dbms.database import factory
 from pyway.dbms import duckdb
+from pyway.dryrun import DryRun
+from pyway.migrate import Migrate
 from pyway.migration import Migration
 
 
@@ -69,3 +72,194 @@ def test_migrations() -> None:
     assert fetched.extension == updated.extension
 
     db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_insert_batches() -> None:
+    if os.path.exists("./unittest-batch.duckdb"):
+        os.remove("./unittest-batch.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-batch.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite-inserts')
+    config.insert_batch_size = 100
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    assert db.connect().sql("select count(*), sum(score) from seedtable").fetchone() == (251, 31500.0)
+    assert len(db.get_all_schema_migrations()) == 1
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_load_data() -> None:
+    if os.path.exists("./unittest-load.duckdb"):
+        os.remove("./unittest-load.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-load.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-duckdb-load')
+    config.duckdb_threads = '2'
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    cursor = db.connect()
+    assert cursor.sql("select count(*), max(name) from events").fetchone() == (1000, 'event 999')
+    assert cursor.sql("select * from regions order by code").fetchall() == [
+        ('NE', 'North East'), ('SW', 'South West')]
+    assert cursor.sql("select current_setting('threads')").fetchone() == (2,)
+    assert [(m.extension, m.rows_affected) for m in db.get_all_schema_migrations()] == [
+        ('SQL', 0), ('PARQUET', 1000), ('TSV', 2)]
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_rows_affected(tmp_path) -> None:
+    if os.path.exists("./unittest-rows.duckdb"):
+        os.remove("./unittest-rows.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-rows.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path)
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER);\n"
+                                                 "INSERT INTO orders VALUES (1), (2), (3);\n"
+                                                 "UPDATE orders SET id = id + 10 WHERE id > 1;\n")
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    assert [m.rows_affected for m in db.get_all_schema_migrations()] == [5]
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_load_data_bulk() -> None:
+    if os.path.exists("./unittest-bulk.duckdb"):
+        os.remove("./unittest-bulk.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-bulk.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-duckdb-load')
+    config.bulk_load = 'true'
+    config.duckdb_threads = '2'
+    config.tuning_profile = 'loads'
+    config.tuning_profiles = {'loads': {'threads': 1, 'memory_limit': '1GB'}}
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    cursor = db.connect()
+    assert cursor.sql("select count(*) from events").fetchone() == (1000,)
+    assert cursor.sql("select current_setting('preserve_insertion_order')").fetchone() == (True,)
+    assert cursor.sql("select current_setting('threads')").fetchone() == (2,)
+    assert [m.extension for m in db.get_all_schema_migrations()] == ['SQL', 'PARQUET', 'TSV']
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_python_backfill() -> None:
+    if os.path.exists("./unittest-backfill.duckdb"):
+        os.remove("./unittest-backfill.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-backfill.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-duckdb-backfill')
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    cursor = db.connect()
+    assert cursor.sql("select count(*) from accounts where email_lower = lower(email)").fetchone() == (20000,)
+    assert cursor.sql("select count(*) from pyway_backfill").fetchone() == (0,)
+    assert [m.extension for m in db.get_all_schema_migrations()] == ['SQL', 'PY']
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_parallel_group() -> None:
+    if os.path.exists("./unittest-groups.duckdb"):
+        os.remove("./unittest-groups.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-groups.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-duckdb-groups')
+    config.parallel_workers = '3'
+
+    migrate = Migrate(config)
+    assert [len(stage) for stage in migrate._stages(migrate._get_migration_files_to_be_executed(), 3)] == [1, 3, 1]
+    output = migrate.run()
+
+    db: duckdb.Duckdb = migrate._db
+    cursor = db.connect()
+    assert output.count("SUCCESS") == 5
+    assert cursor.sql("select count(*) from duckdb_indexes()").fetchone() == (3,)
+    assert [m.name for m in db.get_all_schema_migrations()] == [
+        'V01_01__tables.sql', 'V01_02__index_orders.sql', 'V01_03__index_invoices.sql',
+        'V01_04__index_payments.sql', 'V01_05__summary.sql']
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_parallel_group_failure(tmp_path) -> None:
+    if os.path.exists("./unittest-groups.duckdb"):
+        os.remove("./unittest-groups.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-groups.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path)
+    config.parallel_workers = '2'
+    (tmp_path / "V01_01__first.sql").write_text("-- pyway:group=tables\nCREATE TABLE first (id INTEGER);\n")
+    (tmp_path / "V01_02__broken.sql").write_text("-- pyway:group=tables\nCREATE TABLE broken (id UNKNOWNTYPE);\n")
+
+    migrate = Migrate(config)
+    with pytest.raises(RuntimeError):
+        _ = migrate.run()
+
+    # The migration that succeeded is still recorded, next to the failed attempt
+    db: duckdb.Duckdb = migrate._db
+    assert [(m.name, m.success) for m in db.get_all_schema_migrations()] == [
+        ('V01_01__first.sql', True), ('V01_02__broken.sql', False)]
+    db.disconnect()
+
+
+@pytest.mark.duckdb_test
+def test_migrate_dry_run(tmp_path) -> None:
+    if os.path.exists("./unittest-dryrun.duckdb"):
+        os.remove("./unittest-dryrun.duckdb")
+    config = ConfigFile()
+    config.database_type = "duckdb"
+    config.database_name = "./unittest-dryrun.duckdb"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path)
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER);\n"
+                                                 "INSERT INTO orders SELECT range FROM range(1000);\n")
+    (tmp_path / "V01_02__broken.sql").write_text("CREATE TABLE broken (id UNKNOWNTYPE);\n")
+
+    db: duckdb.Duckdb = factory(config.database_type)(config)
+    db.create_version_table_if_not_exists()
+    db.disconnect()
+
+    dry_run = DryRun(config)
+    report = dry_run.run()
+    assert (dry_run.statements, dry_run.failures) == (3, 1)
+    assert "V01_02__broken.sql" in report and "failed:" in report
+
+    db = factory(config.database_type)(config)
+    cursor = db.connect()
+    assert cursor.sql("select count(*) from duckdb_tables() where table_name = 'orders'").fetchone() == (0,)
+    assert db.get_all_schema_migrations() == []
+    db.disconnect()
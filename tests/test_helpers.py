@@ -1,5 +1,6 @@
 import pytest
 import os
+import zlib
 from pyway.helpers import Utils
 from pyway.migration import Migration
 
@@ -94,3 +95,55 @@ def test_semantic_version_name_major_minor_period() -> None:
 @pytest.mark.helpers_test
 def test_semantic_version_name_minor_over_2digits() -> None:
     assert Utils.is_file_name_valid('V1_0_100__test1.sql')
+
+
+@pytest.mark.helpers_test
+def test_to_bool() -> None:
+    assert Utils.to_bool('true')
+    assert Utils.to_bool('Yes')
+    assert Utils.to_bool(True)
+    assert not Utils.to_bool('false')
+    assert not Utils.to_bool('0')
+    assert not Utils.to_bool(None)
+
+
+@pytest.mark.helpers_test
+def test_get_description_from_name() -> None:
+    assert Utils.get_description_from_name('V05_01__events.parquet') == 'events'
+    assert Utils.get_description_from_name('V01_01_01__load_countries.csv') == 'load_countries'
+
+
+@pytest.mark.helpers_test
+def test_load_checksum_binary_file() -> None:
+    path = os.path.join('tests', 'data', 'schema-duckdb-load')
+    with open(os.path.join(path, 'V01_02__events.parquet'), 'rb') as f:
+        expected = "%X" % (zlib.crc32(f.read()) & 0xFFFFFFFF)
+    assert Utils.load_checksum_from_name('V01_02__events.parquet', path) == expected
+
+
+@pytest.mark.helpers_test
+def test_python_and_data_names() -> None:
+    assert Utils.is_file_name_valid('V07_02__backfill.py')
+    assert Utils.is_file_name_valid('V05_01__events.parquet')
+    assert Utils.is_file_name_valid('V1_1__load.CSV')
+    assert not Utils.is_file_name_valid('V07_02__backfill.pyc')
+    assert not Utils.is_file_name_valid('V07__backfill.py')
+    assert not Utils.is_file_name_valid('notes.txt')
+
+
+@pytest.mark.helpers_test
+def test_lenient_descriptions() -> None:
+    assert Utils.is_file_name_valid('V01_01__add-users.sql')
+    assert Utils.is_file_name_valid('V01_02__users v2.0.sql')
+    assert Utils.is_file_name_valid('V01_03__load.orders.csv')
+
+
+@pytest.mark.helpers_test
+def test_to_milliseconds() -> None:
+    assert Utils.to_milliseconds('30m') == 1800000
+    assert Utils.to_milliseconds('2s') == 2000
+    assert Utils.to_milliseconds('1.5 s') == 1500
+    assert Utils.to_milliseconds('250') == 250
+    assert Utils.to_milliseconds('1H') == 3600000
+    with pytest.raises(ValueError):
+        Utils.to_milliseconds('soon')
@@ -0,0 +1,90 @@
+import os
+import pytest
+
+from pyway.configfile import ConfigFile
+from pyway.dbms.database import factory
+from pyway.hooks import Hooks
+from pyway.migrate import Migrate
+
+
+class Recorder():
+    events: list = []
+
+    def before_migration(self, event):
+        self.events.append((event.name, event.migration.name, event.size))
+
+    def after_migration(self, event):
+        self.events.append((event.name, event.migration.name, event.rows_affected))
+
+    def before_statement(self, event):
+        self.events.append((event.name, event.statement, event.size))
+
+    def after_statement(self, event):
+        assert event.elapsed >= 0
+        self.events.append((event.name, event.statement, event.connection["name"]))
+
+    def on_error(self, event):
+        self.events.append((event.name, event.migration.name, type(event.error).__name__))
+
+
+class Broken():
+
+    def before_migration(self, event):
+        raise ValueError("broken hook")
+
+
+@pytest.fixture
+def config(tmp_path):
+    if os.path.exists("./unittest-hooks.sqlite"):
+        os.remove("./unittest-hooks.sqlite")
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = "./unittest-hooks.sqlite"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path)
+    factory(config.database_type)(config)
+    Recorder.events = []
+    return config
+
+
+@pytest.mark.hooks_test
+@pytest.mark.sqlite_test
+def test_hooks_events(config, tmp_path) -> None:
+    config.hooks = f"{__name__}.Recorder, {__name__}.Broken"
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER);\nINSERT INTO orders VALUES (1);\n")
+    (tmp_path / "V01_02__broken.sql").write_text("INSERT INTO missing VALUES (1);\n")
+
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+    assert Recorder.events == [
+        ("before_migration", "V01_01__orders.sql", 65),
+        ("before_statement", "CREATE TABLE orders (id INTEGER)", 32),
+        ("after_statement", "CREATE TABLE orders (id INTEGER)", "./unittest-hooks.sqlite"),
+        ("before_statement", "INSERT INTO orders VALUES (1)", 29),
+        ("after_statement", "INSERT INTO orders VALUES (1)", "./unittest-hooks.sqlite"),
+        ("after_migration", "V01_01__orders.sql", 1),
+        ("before_migration", "V01_02__broken.sql", 32),
+        ("before_statement", "INSERT INTO missing VALUES (1)", 30),
+        ("on_error", "V01_02__broken.sql", "OperationalError"),
+    ]
+
+
+@pytest.mark.hooks_test
+@pytest.mark.sqlite_test
+def test_hooks_entry_points(config, monkeypatch) -> None:
+    class Point():
+        def load(self):
+            return Recorder
+
+    monkeypatch.setattr(Hooks, "entry_points", staticmethod(lambda: [Point()]))
+    hooks = Hooks.from_config(config)
+    assert [type(hook) for hook in hooks.hooks] == [Recorder]
+    assert hooks.statements
+
+
+@pytest.mark.hooks_test
+def test_hooks_not_found() -> None:
+    config = ConfigFile()
+    config.hooks = ["pyway.missing.Profiler"]
+    with pytest.raises(ValueError):
+        Hooks.from_config(config)
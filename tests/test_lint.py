@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from pyway.configfile import ConfigFile
+from pyway.lint import Lint
+
+SCRIPT = """-- orders
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY,
+    customer_id INTEGER REFERENCES customers (id),
+    region_id INTEGER,
+    FOREIGN KEY (region_id) REFERENCES regions (id)
+);
+CREATE INDEX orders_region ON orders (region_id);
+ALTER TABLE orders ADD COLUMN status varchar(10) DEFAULT 'new';
+ALTER TABLE orders ALTER COLUMN status TYPE text;
+UPDATE orders SET status = 'new';
+DELETE FROM orders WHERE id < 0;
+CREATE INDEX CONCURRENTLY orders_status ON orders (status);
+"""
+
+
+def config(dialect: str = "postgres") -> ConfigFile:
+    config = ConfigFile()
+    config.database_type = dialect
+    return config
+
+
+@pytest.mark.lint_test
+def test_check_postgres() -> None:
+    assert Lint(config()).check(SCRIPT) == [(2, "PW006"), (8, "PW001"), (9, "PW003"), (10, "PW004"),
+                                            (11, "PW005"), (13, "PW002")]
+
+
+@pytest.mark.lint_test
+def test_check_mysql() -> None:
+    # MySQL indexes foreign keys itself and has no CONCURRENTLY
+    assert Lint(config("mysql")).check(SCRIPT) == [(9, "PW003"), (10, "PW004"), (11, "PW005")]
+
+
+@pytest.mark.lint_test
+def test_check_clean() -> None:
+    script = ("-- pyway:transaction=false\n"
+              "CREATE INDEX CONCURRENTLY orders_customer ON public.orders (customer_id, id);\n"
+              "ALTER TABLE orders ADD CONSTRAINT fk FOREIGN KEY (customer_id) REFERENCES customers (id);\n")
+    assert Lint(config()).check(script) == []
+
+
+@pytest.mark.lint_test
+def test_run_json(tmp_path) -> None:
+    (tmp_path / "V01_01__orders.sql").write_text("DELETE FROM orders;\n")
+    (tmp_path / "V01_02__seed.csv").write_text("id\n1\n")
+    lint_config = config()
+    lint_config.database_migration_dir = str(tmp_path)
+    lint_config.lint_format = "json"
+
+    report, count = Lint(lint_config).run()
+    assert count == 1
+    assert json.loads(report) == [{"file": str(tmp_path / "V01_01__orders.sql"), "line": 1, "code": "PW005",
+                                   "message": "UPDATE or DELETE without WHERE touches every row"}]
+
+    lint_config.lint_format = "text"
+    report, count = Lint(lint_config).run([str(tmp_path / "V01_01__orders.sql")])
+    assert report == f"{tmp_path / 'V01_01__orders.sql'}:1: PW005 UPDATE or DELETE without WHERE touches every row"
+
+
+@pytest.mark.lint_test
+def test_check_reports_once() -> None:
+    lint = Lint(config())
+    assert lint.check("CREATE TABLE t (id int, p int REFERENCES p (id), FOREIGN KEY (p) REFERENCES p (id));") == \
+        [(1, "PW006")]
+    assert lint.check("ALTER TABLE t ADD COLUMN status varchar(10) DEFAULT 'change';") == [(1, "PW003")]
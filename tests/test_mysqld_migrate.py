@@ -85,3 +85,112 @@ def test_pyway_migrate_no_local_files(mysqld_connect: Mysqld) -> None:
         _ = Migrate(config).run()
 
     assert bool("no local migration files found" in str(e.value))
+
+
+@pytest.mark.migrate_test
+@pytest.mark.mysqld_test
+def test_pyway_migrate_cext_compress(mysqld_connect: Mysqld) -> None:
+    config = ConfigFile()
+    config.database_type = "mysql"
+    config.database_host = mysqld_connect.host
+    config.database_username = mysqld_connect.username
+    config.database_password = mysqld_connect.password
+    config.database_port = mysqld_connect.port
+    config.database_name = 'test'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema')
+    config.mysql_use_pure = False
+    config.mysql_compress = True
+
+    migrate = Migrate(config)
+    output = migrate.run()
+    assert strip_ansi(output) == MIGRATE_OUTPUT
+    assert migrate._db.get_schema_migration("01.02").name == "V01_02__test2.sql"
+
+
+@pytest.mark.migrate_test
+@pytest.mark.mysqld_test
+def test_pyway_execute_cext(mysqld_connect: Mysqld) -> None:
+    config = ConfigFile()
+    config.database_type = "mysql"
+    config.database_host = mysqld_connect.host
+    config.database_username = mysqld_connect.username
+    config.database_password = mysqld_connect.password
+    config.database_port = mysqld_connect.port
+    config.database_name = 'test'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'empty')
+    config.mysql_use_pure = False
+
+    db = Migrate(config)._db
+    cnx = db.connect()
+    assert type(cnx).__name__ == "CMySQLConnection"
+    cnx.close()
+
+    db.execute("CREATE TABLE a (x INT);\nCREATE TABLE b (y INT);\n"
+               "CREATE TRIGGER t AFTER INSERT ON a FOR EACH ROW BEGIN\n"
+               "  IF NEW.x > 1 THEN INSERT INTO b VALUES (NEW.x); END IF;\n"
+               "END;\n"
+               "SELECT 1;\nINSERT INTO a VALUES (1), (2);\n")
+    cnx = db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("SELECT y FROM b")
+    assert cursor.fetchall() == [(2,)]
+    cursor.close()
+    cnx.close()
+
+
+@pytest.mark.migrate_test
+@pytest.mark.mysqld_test
+def test_pyway_migrate_load_data(mysqld_connect: Mysqld) -> None:
+    config = ConfigFile()
+    config.database_type = "mysql"
+    config.database_host = mysqld_connect.host
+    config.database_username = mysqld_connect.username
+    config.database_password = mysqld_connect.password
+    config.database_port = mysqld_connect.port
+    config.database_name = 'test'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-mysql-load')
+
+    migrate = Migrate(config)
+    migrate._db.execute("SET GLOBAL local_infile = 1")
+    _ = migrate.run()
+
+    cnx = migrate._db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("select code, name from countries order by code")
+    assert cursor.fetchall() == [('CI', "Côte d'Ivoire, Republic of"), ('US', 'United States')]
+    cnx.close()
+    assert [m.extension for m in migrate._db.get_all_schema_migrations()] == ['SQL', 'CSV']
+
+
+@pytest.mark.migrate_test
+@pytest.mark.mysqld_test
+def test_pyway_migrate_online(mysqld_connect: Mysqld) -> None:
+    config = ConfigFile()
+    config.database_type = "mysql"
+    config.database_host = mysqld_connect.host
+    config.database_username = mysqld_connect.username
+    config.database_password = mysqld_connect.password
+    config.database_port = mysqld_connect.port
+    config.database_name = 'test'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-mysql-online')
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    cnx = migrate._db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("select id, total, status from orders order by id")
+    rows = [(row[0], float(row[1]), row[2]) for row in cursor.fetchall()]
+    assert rows == [(1, 10.5, 'new'), (2, 20.0, 'new'), (3, 30.25, 'new')]
+    cursor.execute("insert into orders (total) values (1)")
+    cursor.execute("select max(id) from orders")
+    assert cursor.fetchone() == (4,)
+    cursor.execute("select count(*) from information_schema.tables where table_name like '\\_orders\\_%'")
+    assert cursor.fetchone() == (0,)
+    cnx.close()
+    assert [m.name for m in migrate._db.get_all_schema_migrations()] == ['V01_01__orders.sql',
+                                                                         'V01_02__orders_status.sql']
@@ -0,0 +1,92 @@
+import pytest
+from pyway.migration import Migration
+from pyway.online import OnlineSchemaChange
+from pyway.settings import ConfigFile
+
+
+def online(dialect: str) -> OnlineSchemaChange:
+    config = ConfigFile()
+    config.database_type = dialect
+    config.database_table = "pyway"
+    return OnlineSchemaChange(None, config, "format", Migration("01.02", "SQL", "V01_02__alter.sql", "0", None))
+
+
+@pytest.mark.online_test
+def test_parse() -> None:
+    assert OnlineSchemaChange.parse(["ALTER TABLE orders ADD COLUMN note varchar(20)"], "x") == \
+        ("orders", "ADD COLUMN note varchar(20)")
+    assert OnlineSchemaChange.parse(["alter table only public.orders\n  drop column note"], "x") == \
+        ("public.orders", "drop column note")
+    with pytest.raises(ValueError):
+        OnlineSchemaChange.parse(["ALTER TABLE a ADD c int", "ALTER TABLE b ADD c int"], "x")
+    with pytest.raises(ValueError):
+        OnlineSchemaChange.parse(["CREATE INDEX i ON t (c)"], "x")
+
+
+@pytest.mark.online_test
+def test_names() -> None:
+    assert OnlineSchemaChange.names("orders") == (None, "orders")
+    assert OnlineSchemaChange.names("`shop`.`orders`") == ("shop", "orders")
+    assert OnlineSchemaChange.names('public."orders"') == ("public", "orders")
+
+
+@pytest.mark.online_test
+def test_copy_statement() -> None:
+    assert online("mysql")._copy("orders", "_orders_new", ["id", "total"], "id") == \
+        "INSERT IGNORE INTO _orders_new (`id`, `total`) SELECT `id`, `total` FROM orders " \
+        "WHERE `id` >= {start} AND `id` < {end} LOCK IN SHARE MODE"
+    assert online("postgres")._copy("orders", "_orders_new", ["id"], "id") == \
+        'INSERT INTO _orders_new ("id") OVERRIDING SYSTEM VALUE SELECT "id" FROM orders ' \
+        'WHERE "id" >= {start} AND "id" < {end} FOR SHARE ON CONFLICT DO NOTHING'
+
+
+@pytest.mark.online_test
+def test_postgres_trigger_upserts() -> None:
+    function = online("postgres")._triggers("orders", "_orders_new", "orders", "", ["id", "total"], "id")[0]
+    assert 'ON CONFLICT ("id") DO UPDATE SET "total" = EXCLUDED."total"' in function
+    assert 'OLD."id" IS DISTINCT FROM NEW."id"' in function
+    function = online("postgres")._triggers("orders", "_orders_new", "orders", "", ["id"], "id")[0]
+    assert 'ON CONFLICT ("id") DO NOTHING' in function
+
+
+class DropFails():
+    # Connection whose DROP statements fail, e.g. for want of privileges
+    def __init__(self):
+        self.executed = []
+
+    def connect(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, params=None):
+        if statement.startswith("DROP"):
+            raise RuntimeError("permission denied")
+        self.executed.append(statement)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.online_test
+def test_cleanup_after_swap_logs_errors(monkeypatch) -> None:
+    change = online("postgres")
+    change._db = DropFails()
+    monkeypatch.setattr(change, "_query", lambda query, *args: [0] if "count" in query else ["id"])
+    monkeypatch.setattr(change, "_swap", lambda *args: None)
+    monkeypatch.setattr("pyway.online.Backfill.run", lambda *args: None)
+    change.run("ALTER TABLE orders ADD COLUMN note varchar(20);", {})
+    assert change._db.executed[0] == "CREATE TABLE _orders_new (LIKE orders INCLUDING ALL)"
+
+
+@pytest.mark.online_test
+def test_not_supported() -> None:
+    with pytest.raises(ValueError):
+        online("sqlite")
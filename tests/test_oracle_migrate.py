@@ -141,3 +141,21 @@ def test_pyway_migrate_full_dsn(oracle_connect: Oracle) -> None:
 
     output = Migrate(config).run()
     assert strip_ansi(output) == MIGRATE_OUTPUT
+
+
+@pytest.mark.migrate_test
+@pytest.mark.oracle_test
+@skip_if_oracle_unavailable()
+def test_pyway_migrate_plsql(oracle_connect: Oracle) -> None:
+    config = ConfigFile()
+    config.database_type = "oracle"
+    config.database_host = oracle_connect.host
+    config.database_username = oracle_connect.username
+    config.database_password = oracle_connect.password
+    config.database_port = oracle_connect.port
+    config.database_name = oracle_connect.database_name
+    config.database_table = 'pyway_plsql_history'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-oracle-plsql')
+
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__plsql.sql\nV01_01__plsql.sql SUCCESS\n"
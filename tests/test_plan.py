@@ -0,0 +1,59 @@
+import os
+import sqlite3
+
+import pytest
+from pyway.configfile import ConfigFile
+from pyway.plan import Plan
+
+
+@pytest.mark.plan_test
+def test_classify() -> None:
+    assert Plan.classify("CREATE INDEX orders_status ON orders (status)", "postgres") == ("scan", "writes")
+    assert Plan.classify("CREATE INDEX CONCURRENTLY orders_status ON orders (status)", "postgres") == ("scan", "none")
+    assert Plan.classify("CREATE INDEX orders_status ON orders (status)", "mysql") == ("scan", "none")
+    assert Plan.classify("ALTER TABLE orders ALTER COLUMN total TYPE numeric(12,2)", "postgres") == ("rewrite", "all")
+    assert Plan.classify("ALTER TABLE orders ADD COLUMN type text", "postgres") == ("ddl", "all")
+    assert Plan.classify("ALTER TABLE orders ADD CONSTRAINT fk FOREIGN KEY (c) REFERENCES c (id) NOT VALID",
+                         "postgres") == ("ddl", "all")
+    assert Plan.classify("ALTER TABLE orders ADD CONSTRAINT fk FOREIGN KEY (c) REFERENCES c (id)",
+                         "postgres") == ("scan", "all")
+    assert Plan.classify("UPDATE orders SET status = 'new'", "sqlite") == ("write", "rows")
+    assert Plan.classify("CREATE TABLE plain (id INTEGER)", "sqlite") == ("ddl", "none")
+
+
+@pytest.mark.plan_test
+def test_cost() -> None:
+    assert Plan.cost("rewrite", "all", "orders", 300_000_000, 200 * 1024 ** 3, None) == \
+        ("high", "rewrites 200 GB table orders, blocking reads and writes")
+    assert Plan.cost("scan", "writes", "orders", 10, 8192, None) == ("low", "scans 8 kB table orders")
+    assert Plan.cost("write", "rows", "orders", 500_000, None, "1200") == \
+        ("medium", "writes about 1200 rows of table orders (500000 rows)")
+    assert Plan.cost("ddl", "all", "orders", 500_000, None, None) == ("low", "")
+
+
+@pytest.mark.plan_test
+@pytest.mark.sqlite_test
+def test_estimate(tmp_path) -> None:
+    if os.path.exists("./unittest-plan.sqlite"):
+        os.remove("./unittest-plan.sqlite")
+    cnx = sqlite3.connect("./unittest-plan.sqlite")
+    cnx.execute("CREATE TABLE orders (id INTEGER, status TEXT)")
+    cnx.executemany("INSERT INTO orders VALUES (?, 'new')", [(i,) for i in range(50)])
+    cnx.commit()
+    cnx.close()
+    (tmp_path / "V01_01__index.sql").write_text("CREATE INDEX orders_status ON orders (status);\n"
+                                                "UPDATE orders SET status = 'paid';\n"
+                                                "CREATE TABLE audit (id INTEGER);\n")
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = "./unittest-plan.sqlite"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path)
+
+    rows = Plan(config).estimate()
+    assert [(r["table"], r["rows"], r["lock"], r["cost"]) for r in rows] == [
+        ("orders", 50, "writes", "low"), ("orders", 50, "rows", "low"), ("", "", "none", "low")]
+    assert rows[1]["explain"] == "SCAN orders"
+    assert rows[1]["note"].startswith("writes to")
+    assert "V01_01__index.sql" in Plan(config).run()
+    assert sqlite3.connect("./unittest-plan.sqlite").execute("SELECT count(*) FROM pyway").fetchone() == (0,)
@@ -82,3 +82,79 @@ def test_pyway_migrate_no_local_files(postgresql_connect: PostgreSQL) -> None:
         _ = Migrate(config).run()
 
     assert bool("no local migration files found" in str(e.value))
+
+
+@pytest.mark.migrate_test
+@pytest.mark.postgresql_test
+def test_pyway_migrate_copy(postgresql_connect: PostgreSQL) -> None:
+    config = ConfigFile()
+    config.database_type = "postgres"
+    config.database_host = postgresql_connect.host
+    config.database_username = postgresql_connect.username
+    config.database_port = postgresql_connect.port
+    config.database_name = 'test'
+    config.database_table = 'public.pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-postgres-copy')
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    cnx = migrate._db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("select code, name from countries order by code")
+    assert cursor.fetchall() == [('CI', "Côte d'Ivoire, Republic of"), ('DE', 'Germany'), ('FR', 'France'),
+                                 ('IT', None), ('US', 'United States')]
+    cnx.close()
+
+    migrations = migrate._db.get_all_schema_migrations()
+    assert [m.extension for m in migrations] == ['SQL', 'CSV', 'COPY']
+
+
+@pytest.mark.migrate_test
+@pytest.mark.postgresql_test
+def test_pyway_migrate_concurrently(postgresql_connect: PostgreSQL) -> None:
+    config = ConfigFile()
+    config.database_type = "postgres"
+    config.database_host = postgresql_connect.host
+    config.database_username = postgresql_connect.username
+    config.database_port = postgresql_connect.port
+    config.database_name = 'test'
+    config.database_table = 'public.pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-postgres-concurrently')
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    cnx = migrate._db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("select indexname from pg_indexes where tablename = 'orders' order by indexname")
+    assert cursor.fetchall() == [('orders_customer_id',), ('orders_pkey',)]
+    cnx.close()
+
+
+@pytest.mark.migrate_test
+@pytest.mark.postgresql_test
+def test_pyway_migrate_online(postgresql_connect: PostgreSQL) -> None:
+    config = ConfigFile()
+    config.database_type = "postgres"
+    config.database_host = postgresql_connect.host
+    config.database_username = postgresql_connect.username
+    config.database_port = postgresql_connect.port
+    config.database_name = 'test'
+    config.database_table = 'public.pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-postgres-online')
+
+    migrate = Migrate(config)
+    _ = migrate.run()
+
+    cnx = migrate._db.connect()
+    cursor = cnx.cursor()
+    cursor.execute("select id, total, status from orders order by id")
+    rows = [(row[0], float(row[1]), row[2]) for row in cursor.fetchall()]
+    assert rows == [(1, 10.5, 'new'), (2, 20.0, 'new'), (3, 30.25, 'new')]
+    # The serial sequence now belongs to the new table
+    cursor.execute("insert into orders (total) values (1) returning id")
+    assert cursor.fetchone() == (4,)
+    cursor.execute("select count(*) from pg_class where relname like '\\_orders\\_%'")
+    assert cursor.fetchone() == (0,)
+    cnx.close()
@@ -0,0 +1,176 @@
+import pytest
+from pyway.configfile import ConfigFile
+from pyway.executor import Executor
+from pyway.migration import Migration
+from pyway.retry import LockRetry
+
+
+class PostgresError(Exception):
+    def __init__(self, pgcode: str) -> None:
+        super().__init__("canceling statement due to lock timeout")
+        self.pgcode = pgcode
+
+
+class MysqlError(Exception):
+    def __init__(self, errno: int) -> None:
+        super().__init__("Lock wait timeout exceeded; try restarting transaction")
+        self.errno = errno
+
+
+class OracleError():
+    def __init__(self, code: int) -> None:
+        self.code = code
+
+
+class Connection():
+    def __init__(self) -> None:
+        self.rollbacks = 0
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+@pytest.mark.retry_test
+def test_is_lock_error() -> None:
+    assert LockRetry(None, "postgres", 3, 1.0).is_lock_error(PostgresError("55P03"))
+    assert LockRetry(None, "postgres", 3, 1.0).is_lock_error(PostgresError("40P01"))
+    assert not LockRetry(None, "postgres", 3, 1.0).is_lock_error(PostgresError("42P01"))
+    assert LockRetry(None, "mysql", 3, 1.0).is_lock_error(MysqlError(1213))
+    assert not LockRetry(None, "mysql", 3, 1.0).is_lock_error(MysqlError(1146))
+    assert LockRetry(None, "oracle", 3, 1.0).is_lock_error(Exception(OracleError(54)))
+    assert LockRetry(None, "sqlite", 3, 1.0).is_lock_error(Exception("database is locked"))
+    assert not LockRetry(None, "duckdb", 3, 1.0).is_lock_error(Exception("database is locked"))
+
+
+@pytest.mark.retry_test
+def test_backoff() -> None:
+    retry = LockRetry(None, "postgres", 10, 1.0)
+    for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (10, 60.0)]:
+        delay = retry.backoff(attempt)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+@pytest.mark.retry_test
+def test_call_retries_lock_errors() -> None:
+    retry = LockRetry(None, "mysql", 3, 0.5)
+    delays = []
+    retry.sleep = delays.append
+    errors = [MysqlError(1205), MysqlError(1213)]
+
+    def action() -> str:
+        if errors:
+            raise errors.pop(0)
+        return "done"
+
+    cnx = Connection()
+    assert retry.call(cnx, action, "ALTER TABLE t ADD COLUMN c int") == "done"
+    assert cnx.rollbacks == 2
+    assert len(delays) == 2
+
+
+@pytest.mark.retry_test
+def test_call_gives_up() -> None:
+    retry = LockRetry(None, "mysql", 2, 0.5)
+    retry.sleep = lambda delay: None
+
+    def action() -> None:
+        raise MysqlError(1205)
+
+    with pytest.raises(MysqlError):
+        retry.call(Connection(), action, "ALTER TABLE t ADD COLUMN c int")
+
+
+class Transaction():
+    # Postgres connection where SETs and changes only last if their transaction commits
+    def __init__(self, failures: int = 1, fail_on: str = "UPDATE") -> None:
+        self.committed = {"lock_timeout": None, "rows": []}
+        self.pending = {"lock_timeout": None, "rows": []}
+        self.savepoints = []
+        self.failures = failures
+        self.fail_on = fail_on
+        self.timeouts = []
+        self.description = None
+        self.rowcount = 0
+
+    def connect(self) -> 'Transaction':
+        return self
+
+    def cursor(self) -> 'Transaction':
+        return self
+
+    def execute(self, statement, params=None) -> None:
+        if statement.startswith("SET "):
+            name, value = statement[4:].split(" = ")
+            self.pending[name] = value
+        elif statement.startswith("SAVEPOINT"):
+            self.savepoints.append({"lock_timeout": self.pending["lock_timeout"], "rows": list(self.pending["rows"])})
+        elif statement.startswith("ROLLBACK TO SAVEPOINT"):
+            self.pending = {"lock_timeout": self.savepoints[-1]["lock_timeout"],
+                            "rows": list(self.savepoints[-1]["rows"])}
+        elif statement.startswith("RELEASE SAVEPOINT"):
+            self.savepoints.pop()
+        else:
+            self.timeouts.append(self.pending["lock_timeout"])
+            if statement.startswith(self.fail_on) and self.failures:
+                self.failures -= 1
+                raise PostgresError("55P03")
+            self.pending["rows"].append(statement)
+
+    def fetchall(self) -> list:
+        return []
+
+    def commit(self) -> None:
+        self.committed = self.pending
+        self.pending = {"lock_timeout": self.committed["lock_timeout"], "rows": list(self.committed["rows"])}
+        self.savepoints = []
+
+    def rollback(self) -> None:
+        self.pending = {"lock_timeout": self.committed["lock_timeout"], "rows": list(self.committed["rows"])}
+        self.savepoints = []
+
+    def close(self) -> None:
+        self.rollback()
+
+    def upgrade_version(self, migration) -> None:
+        pass
+
+
+def retrying_executor(db: Transaction, retries: str) -> Executor:
+    config = ConfigFile()
+    config.database_type = "postgres"
+    config.lock_retries = retries
+    config.lock_retry_delay = "1ms"
+    executor = Executor(db, config)
+    executor.retry.sleep = lambda delay: None
+    executor.retry.contention = lambda: []
+    return executor
+
+
+@pytest.mark.retry_test
+def test_lock_timeout_survives_retry() -> None:
+    db = Transaction()
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    retrying_executor(db, "1").run("-- pyway:lock_timeout=500ms\nUPDATE t SET c = 1;", migration)
+    assert db.timeouts == ["500", "500"]
+    assert db.committed["rows"] == ["UPDATE t SET c = 1"]
+
+
+@pytest.mark.retry_test
+def test_retry_keeps_migration_atomic() -> None:
+    # The third statement runs out of retries, and the first two must not stay committed
+    db = Transaction(failures=3, fail_on="ALTER")
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    with pytest.raises(PostgresError):
+        retrying_executor(db, "2").run("CREATE TABLE t (c int);\nINSERT INTO t VALUES (1);\n"
+                                       "ALTER TABLE u ADD COLUMN c int;\n", migration)
+    assert db.committed["rows"] == []
+
+
+@pytest.mark.retry_test
+def test_retry_rolls_back_only_the_statement() -> None:
+    db = Transaction(failures=1, fail_on="ALTER")
+    migration = Migration("01.01", "SQL", "V01_01__t.sql", "0", None)
+    retrying_executor(db, "2").run("CREATE TABLE t (c int);\nINSERT INTO t VALUES (1);\n"
+                                   "ALTER TABLE u ADD COLUMN c int;\n", migration)
+    assert db.committed["rows"] == ["CREATE TABLE t (c int)", "INSERT INTO t VALUES (1)",
+                                    "ALTER TABLE u ADD COLUMN c int"]
@@ -141,3 +141,10 @@ def test_env_var_interpolation() -> None:
     config.config = 'tests/data/pyway_variable.conf'
     config = Settings.parse_config_file(config.config)
     assert config.database_username == "unittest_sometest"
+
+
+@pytest.mark.settings_test
+def test_settings_mysql_connection_mode() -> None:
+    config = ConfigFile()
+    assert config.mysql_use_pure == 'true'
+    assert config.mysql_compress == 'false'
@@ -0,0 +1,110 @@
+import pytest
+import os
+from pyway.splitter import Splitter
+
+
+@pytest.mark.splitter_test
+def test_split_statements() -> None:
+    statements = Splitter().split("create table a (id int);\nalter table a add column b int;\n")
+    assert statements == ["create table a (id int)", "alter table a add column b int"]
+
+
+@pytest.mark.splitter_test
+def test_split_without_trailing_delimiter() -> None:
+    statements = Splitter().split("select 1; select 2")
+    assert statements == ["select 1", "select 2"]
+
+
+@pytest.mark.splitter_test
+def test_split_skips_comments() -> None:
+    statements = Splitter().split("-- header; comment\n/* block; comment */\nselect 1;\n-- trailing comment\n")
+    assert statements == ["select 1"]
+
+
+@pytest.mark.splitter_test
+def test_split_quoted_delimiter() -> None:
+    statements = Splitter().split("insert into a values ('x;''y'); select \"a;b\" from a;")
+    assert statements == ["insert into a values ('x;''y')", "select \"a;b\" from a"]
+
+
+@pytest.mark.splitter_test
+def test_split_postgres_dollar_quote() -> None:
+    script = "create function f() returns int as $body$ begin; return 1; end; $body$ language plpgsql;\nselect f();"
+    statements = Splitter("postgres").split(script)
+    assert len(statements) == 2
+    assert statements[0].endswith("language plpgsql")
+
+
+@pytest.mark.splitter_test
+def test_split_sqlite_trigger() -> None:
+    script = "create trigger t after insert on a begin " \
+             "update a set b = case when b > 1 then 1 else 2 end; delete from c; end;\nselect 1;"
+    statements = Splitter("sqlite").split(script)
+    assert len(statements) == 2
+    assert statements[0].endswith("end")
+
+
+@pytest.mark.splitter_test
+def test_split_mysql_trigger_control_flow() -> None:
+    script = "CREATE TRIGGER t AFTER INSERT ON a FOR EACH ROW BEGIN " \
+             "IF NEW.x > 1 THEN UPDATE b SET y = 1; END IF; INSERT INTO c VALUES (1); END;\nSELECT 2;"
+    statements = Splitter("mysql").split(script)
+    assert len(statements) == 2
+    assert statements[0].endswith("INSERT INTO c VALUES (1); END")
+    assert statements[1] == "SELECT 2"
+
+
+@pytest.mark.splitter_test
+def test_split_mysql_procedure_loops() -> None:
+    script = "CREATE PROCEDURE p() BEGIN\n" \
+             "  DECLARE i INT DEFAULT 0;\n" \
+             "  counter: LOOP SET i = i + 1; IF i > 3 THEN LEAVE counter; END IF; END LOOP counter;\n" \
+             "  WHILE i > 0 DO SET i = i - 1; END WHILE;\n" \
+             "  REPEAT SET i = i + 1; UNTIL i > 2 END REPEAT;\n" \
+             "  CASE i WHEN 3 THEN SET i = 0; ELSE BEGIN SET i = 1; END; END CASE;\n" \
+             "  SET i = CASE WHEN i > 0 THEN 1 ELSE 0 END;\n" \
+             "END;\nSELECT 1;"
+    statements = Splitter("mysql").split(script)
+    assert len(statements) == 2
+    assert statements[0].startswith("CREATE PROCEDURE p()")
+    assert statements[0].endswith("ELSE 0 END;\nEND")
+    assert statements[1] == "SELECT 1"
+
+
+@pytest.mark.splitter_test
+def test_split_mysql_escapes() -> None:
+    statements = Splitter("mysql").split("insert into a values ('x\\';y'); # comment;\nselect 1;")
+    assert statements == ["insert into a values ('x\\';y')", "select 1"]
+
+
+@pytest.mark.splitter_test
+def test_split_mysql_executable_comments() -> None:
+    script = "/*!40101 SET NAMES utf8mb4 */;\n/*!40014 SET FOREIGN_KEY_CHECKS=0 */;\n/* dump header; */\n" \
+             "CREATE TABLE a (id int);\nINSERT /*+ SET_VAR(unique_checks=OFF) */ INTO a VALUES (1);\n"
+    statements = Splitter("mysql").split(script)
+    assert statements == ["/*!40101 SET NAMES utf8mb4 */", "/*!40014 SET FOREIGN_KEY_CHECKS=0 */",
+                          "CREATE TABLE a (id int)", "INSERT /*+ SET_VAR(unique_checks=OFF) */ INTO a VALUES (1)"]
+
+
+@pytest.mark.splitter_test
+def test_split_unknown_dialect() -> None:
+    with pytest.raises(ValueError):
+        _ = Splitter("unknown")
+
+
+@pytest.mark.splitter_test
+def test_split_oracle_plsql() -> None:
+    with open(os.path.join('tests', 'data', 'schema-oracle-plsql', 'V01_01__plsql.sql'), encoding='utf-8') as f:
+        statements = Splitter("oracle").split(f.read())
+    assert len(statements) == 7
+    assert statements[0].startswith("CREATE TABLE plsqltable")
+    assert statements[2] == "INSERT INTO plsqltable (id, name) VALUES (2, 'two; with delimiter')"
+    assert statements[5].startswith("CREATE OR REPLACE PACKAGE BODY plsqlpkg")
+    assert statements[5].endswith("END plsqlpkg;")
+    assert statements[6].endswith("END;")
+
+
+@pytest.mark.splitter_test
+def test_split_oracle_slash_after_statement() -> None:
+    statements = Splitter("oracle").split("create table a (id number);\n/\nselect a/b from c\n/\n")
+    assert statements == ["create table a (id number)", "select a/b from c"]
@@ -6,14 +6,24 @@ from pyway.settings import ConfigFile
 
 from pyway.dbms.database import factory
 
-INFO_OUTPUT = """+-----------+-------------+-------------------+------------+-------------------+
-|   version | extension   | name              | checksum   | apply_timestamp   |
-|-----------+-------------+-------------------+------------+-------------------|
-|      1.01 | SQL         | V01_01__test1.sql | new        | new               |
-|      1.02 | SQL         | V01_02__test2.sql | new        | new               |
-|      1.03 | SQL         | V01_03__test3.sql | new        | new               |
-|      1.04 | SQL         | V01_04__test4.sql | new        | new               |
-+-----------+-------------+-------------------+------------+-------------------+"""
+INFO_OUTPUT = "\n".join([
+    "+-----------+-------------+-------------------+------------+-------------------+"
+    "---------------------+-----------------+-----------+----------------+",
+    "|   version | extension   | name              | checksum   | apply_timestamp   |"
+    " execution_time_ms   | rows_affected   | success   | installed_by   |",
+    "|-----------+-------------+-------------------+------------+-------------------+"
+    "---------------------+-----------------+-----------+----------------|",
+    "|      1.01 | SQL         | V01_01__test1.sql | new        | new               |"
+    "                     |                 |           |                |",
+    "|      1.02 | SQL         | V01_02__test2.sql | new        | new               |"
+    "                     |                 |           |                |",
+    "|      1.03 | SQL         | V01_03__test3.sql | new        | new               |"
+    "                     |                 |           |                |",
+    "|      1.04 | SQL         | V01_04__test4.sql | new        | new               |"
+    "                     |                 |           |                |",
+    "+-----------+-------------+-------------------+------------+-------------------+"
+    "---------------------+-----------------+-----------+----------------+",
+])
 
 
 @pytest.fixture
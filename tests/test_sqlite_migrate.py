@@ -1,10 +1,16 @@
 import pytest
 import os
+import sqlite3
+import threading
 from strip_ansi import strip_ansi
 from pyway.migrate import Migrate
+from pyway.dryrun import DryRun
+from pyway.budget import Budget
+from pyway.migration import Migration
 from pyway.settings import ConfigFile
 
 from pyway.dbms.database import factory
+from pyway.helpers import Utils
 
 MIGRATE_OUTPUT = """Migrating --> V01_01__test1.sql
 V01_01__test1.sql SUCCESS
@@ -85,3 +91,471 @@ def test_pyway_migrate_no_local_files(sqlite_connect) -> None:
         _ = Migrate(config).run()
 
     assert bool("no local migration files found" in str(e.value))
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_insert_batches(sqlite_connect) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite-inserts')
+    config.insert_batch_size = '100'
+
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__seed.sql\nV01_01__seed.sql SUCCESS\n"
+
+    rows = sqlite_connect.connect().execute("select count(*), sum(score), max(name) from seedtable").fetchone()
+    assert rows == (251, 31500.0, "name 99's")
+    assert [m.name for m in sqlite_connect.get_all_schema_migrations()] == ["V01_01__seed.sql"]
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_data_not_supported(sqlite_connect) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-postgres-copy')
+
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+
+    assert "not supported by sqlite" in str(e.value)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_python(sqlite_connect) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite-python')
+
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__create.sql\nV01_01__create.sql SUCCESS\n" \
+                                 "Migrating --> V01_02__backfill.py\nV01_02__backfill.py SUCCESS\n"
+
+    rows = sqlite_connect.connect().execute("select email_lower from accounts order by id").fetchall()
+    assert rows == [("one@example.com",), ("two@example.com",)]
+    migration = sqlite_connect.get_schema_migration("01.02")
+    assert migration.extension == "PY"
+    assert migration.checksum == Utils.load_checksum_from_name("V01_02__backfill.py", config.database_migration_dir)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_python_without_migrate(sqlite_connect) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite-python-missing')
+
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+
+    assert "does not define migrate(conn, ctx)" in str(e.value)
+    assert [m.success for m in sqlite_connect.get_all_schema_migrations()] == [False]
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_resume_statements(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.statement_checkpoints = 'true'
+
+    script = tmp_path / "V01_01__resume.sql"
+    script.write_text("CREATE TABLE resumed (id INTEGER);\nINSERT INTO resumed VALUES (1);\n"
+                      "INSERT INTO missing VALUES (2);\nINSERT INTO resumed VALUES (3);\n")
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+    cnx = sqlite_connect.connect()
+    assert cnx.execute("select name, statement_index from pyway_progress").fetchall() == [("V01_01__resume.sql", 2)]
+
+    # Fixing the failed statement resumes after the committed ones
+    script.write_text("CREATE TABLE resumed (id INTEGER);\nINSERT INTO resumed VALUES (1);\n"
+                      "INSERT INTO resumed VALUES (2);\nINSERT INTO resumed VALUES (3);\n")
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__resume.sql\nV01_01__resume.sql SUCCESS\n"
+    assert cnx.execute("select id from resumed order by id").fetchall() == [(1,), (2,), (3,)]
+    assert cnx.execute("select count(*) from pyway_progress").fetchone() == (0,)
+    assert [m.name for m in sqlite_connect.get_all_schema_migrations()] == ["V01_01__resume.sql"]
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_resume_changed(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.statement_checkpoints = 'true'
+
+    script = tmp_path / "V01_01__resume.sql"
+    script.write_text("CREATE TABLE resumed (id INTEGER);\nINSERT INTO missing VALUES (1);\n")
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+
+    script.write_text("CREATE TABLE resumed (id INTEGER, name TEXT);\nINSERT INTO resumed VALUES (1, 'x');\n")
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+    assert "changed since" in str(e.value)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_directives(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+
+    # VACUUM cannot run inside a transaction
+    (tmp_path / "V01_01__vacuum.sql").write_text("-- pyway:transaction=false\n-- pyway:lock_timeout=2s\n"
+                                                 "CREATE TABLE vacuumed (id INTEGER);\n"
+                                                 "INSERT INTO vacuumed VALUES (1);\nVACUUM;\n")
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__vacuum.sql\nV01_01__vacuum.sql SUCCESS\n"
+
+    (tmp_path / "V01_02__timeout.sql").write_text("-- pyway:statement_timeout=30m\nSELECT 1;\n")
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+    assert "[statement_timeout] which is not supported by sqlite" in str(e.value)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_lock_retries(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.lock_timeout = '100ms'
+    config.lock_retries = '5'
+    config.lock_retry_delay = '50ms'
+    (tmp_path / "V01_01__locked.sql").write_text("CREATE TABLE locked (id INTEGER);\n")
+
+    # Another session holds the write lock for a while
+    blocker = sqlite3.connect(config.database_name, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    timer = threading.Timer(0.3, blocker.rollback)
+    timer.start()
+    try:
+        output = Migrate(config).run()
+    finally:
+        timer.join()
+        blocker.close()
+
+    assert strip_ansi(output) == "Migrating --> V01_01__locked.sql\nV01_01__locked.sql SUCCESS\n"
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_lock_retries_atomic(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.lock_retries = '2'
+    (tmp_path / "V01_01__broken.sql").write_text("CREATE TABLE kept (id INTEGER);\nINSERT INTO kept VALUES (1);\n"
+                                                 "INSERT INTO missing VALUES (1);\n")
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+
+    cnx = sqlite3.connect(config.database_name)
+    assert cnx.execute("SELECT name FROM sqlite_master WHERE name = 'kept'").fetchall() == []
+    cnx.close()
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_bulk(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+
+    (tmp_path / "V01_01__tables.sql").write_text("CREATE TABLE parents (id INTEGER PRIMARY KEY);\n"
+                                                 "CREATE TABLE children (id INTEGER, "
+                                                 "parent_id INTEGER REFERENCES parents (id));\n")
+    (tmp_path / "V01_02__seed.sql").write_text("-- pyway:bulk=true\nINSERT INTO children VALUES (1, 1);\n"
+                                               "INSERT INTO parents VALUES (1);\n")
+    output = Migrate(config).run()
+    assert "V01_02__seed.sql SUCCESS" in strip_ansi(output)
+    cnx = sqlite3.connect(config.database_name)
+    assert cnx.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    cnx.close()
+
+    # Rows loaded without foreign key checks are checked once the migrations ran
+    config.bulk_load = 'true'
+    (tmp_path / "V01_03__orphans.sql").write_text("INSERT INTO children VALUES (2, 5);\n")
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+    assert "children -> parents (1 rows)" in str(e.value)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_tuning_profile(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.tuning_profiles = {"big": {"cache_size": -65536, "mmap_size": 268435456}}
+
+    (tmp_path / "V01_01__settings.py").write_text(
+        "# pyway:tuning=big\n"
+        "def migrate(conn, ctx):\n"
+        "    conn.execute('CREATE TABLE settings (cache_size INTEGER)')\n"
+        "    conn.execute('INSERT INTO settings SELECT cache_size FROM pragma_cache_size()')\n")
+    output = Migrate(config).run()
+    assert strip_ansi(output) == "Migrating --> V01_01__settings.py\nV01_01__settings.py SUCCESS\n"
+    cnx = sqlite3.connect(config.database_name)
+    assert cnx.execute("SELECT cache_size FROM settings").fetchone() == (-65536,)
+    cnx.close()
+
+    (tmp_path / "V01_02__missing.sql").write_text("-- pyway:tuning=huge\nSELECT 1;\n")
+    with pytest.raises(RuntimeError) as e:
+        _ = Migrate(config).run()
+    assert "uses tuning profile [huge] which is not in tuning_profiles" in str(e.value)
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_analyze_tables(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.analyze_tables = 'true'
+
+    sqlite_connect.create_version_table_if_not_exists()
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER, status TEXT);\n"
+                                                 "CREATE INDEX orders_status ON orders (status);\n"
+                                                 "INSERT INTO orders VALUES (1, 'new'), (2, 'new'), (3, 'paid');\n"
+                                                 "CREATE TABLE dropped (id INTEGER);\n"
+                                                 "INSERT INTO dropped VALUES (1);\nDROP TABLE dropped;\n")
+    _ = Migrate(config).run()
+    cnx = sqlite3.connect(config.database_name)
+    assert cnx.execute("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall() == [("orders", "orders_status", "3 2")]
+    cnx.close()
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_touched_by_workers(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.analyze_tables = 'true'
+
+    # Workers of a parallel group record what they touched at the same time
+    migrate = Migrate(config)
+    workers = [threading.Thread(target=lambda n=n: [migrate._touch('', f"t{n}_{i}") for i in range(200)])
+               for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(migrate.touched) == 1600
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_dry_run(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+
+    sqlite_connect.create_version_table_if_not_exists()
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER);\n"
+                                                 "INSERT INTO orders VALUES (1);\n")
+    (tmp_path / "V01_02__broken.sql").write_text("INSERT INTO orders VALUES (2);\nINSERT INTO missing VALUES (1);\n")
+    dry_run = DryRun(config)
+    report = dry_run.run()
+    assert (dry_run.statements, dry_run.failures) == (4, 1)
+    assert "failed: no such table: missing" in report
+    assert report.endswith("4 statements, 1 failed, %.2fs" % dry_run.elapsed)
+
+    # The database itself is left alone
+    cnx = sqlite3.connect(config.database_name)
+    assert cnx.execute("SELECT name FROM sqlite_master WHERE name = 'orders'").fetchall() == []
+    assert cnx.execute("SELECT count(*) FROM pyway").fetchone() == (0,)
+    cnx.close()
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_time_budget(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.time_budget = '10m'
+
+    (tmp_path / "V01_01__quick.sql").write_text("-- pyway:estimate=1s\nCREATE TABLE quick (id INTEGER);\n")
+    (tmp_path / "V01_02__slow.sql").write_text("-- pyway:estimate=1h\nCREATE TABLE slow (id INTEGER);\n")
+    (tmp_path / "V01_03__after.sql").write_text("-- pyway:estimate=1s\nCREATE TABLE after (id INTEGER);\n")
+    output = strip_ansi(Migrate(config).run())
+    assert "V01_01__quick.sql SUCCESS" in output
+    assert "Stopping before V01_02__slow.sql: predicted 3600.0s" in output
+    assert "V01_03__after.sql" not in output
+    assert [m.name for m in sqlite_connect.get_all_schema_migrations()] == ['V01_01__quick.sql']
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_time_budget_dry_run(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.time_budget = '10m'
+
+    (tmp_path / "V01_01__quick.sql").write_text("-- pyway:estimate=1s\nCREATE TABLE quick (id INTEGER);\n")
+    (tmp_path / "V01_02__slow.py").write_text("import time\n\n\ndef migrate(conn, ctx):\n    time.sleep(0.3)\n")
+    migrate = Migrate(config)
+    migrations = migrate._get_migration_files_to_be_executed()
+
+    # Without budget_dry_run nothing runs ahead of the migrations
+    budget = Budget(60)
+    budget.predict(config, migrations, [migrate._path(m) for m in migrations])
+    assert budget.predictions['V01_02__slow.py'] is None
+
+    # With it, migrations without an estimate are timed on a copy of the database, on the clock of the budget
+    budget = Budget(60, dry_run=True)
+    budget.predict(config, migrations, [migrate._path(m) for m in migrations])
+    assert budget.remaining() <= 59.7
+    assert budget.predictions['V01_01__quick.sql'] == 1.0
+    assert budget.predictions['V01_02__slow.py'] >= 0.3
+    assert sqlite_connect.get_all_schema_migrations() == []
+    assert budget.refuse(migrations[1:]) is None
+    budget.seconds = 0.0
+    assert budget.refuse(migrations[1:]) is not None
+
+    # The dry run's own time leaves too little of the window for the slow migration
+    (tmp_path / "V01_01__quick.sql").unlink()
+    config.time_budget = '500ms'
+    config.budget_dry_run = 'true'
+    output = strip_ansi(Migrate(config).run())
+    assert "Stopping before V01_02__slow.py: predicted" in output
+    assert sqlite_connect.get_all_schema_migrations() == []
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_history_columns(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.database_username = 'deployer'
+
+    (tmp_path / "V01_01__orders.sql").write_text("-- pyway:transaction=true\nCREATE TABLE orders (id INTEGER);\n"
+                                                 "INSERT INTO orders VALUES (1), (2), (3);\n"
+                                                 "UPDATE orders SET id = id + 10 WHERE id > 1;\n")
+    (tmp_path / "V01_02__broken.sql").write_text("INSERT INTO missing VALUES (1);\n")
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+
+    applied, failed = sqlite_connect.get_all_schema_migrations()
+    assert (applied.rows_affected, applied.success, applied.installed_by) == (5, True, 'deployer')
+    assert applied.execution_time_ms >= 0
+    assert (failed.name, failed.success) == ('V01_02__broken.sql', False)
+
+    # The failed attempt stays pending, and its row goes once it succeeds
+    (tmp_path / "V01_02__broken.sql").write_text("CREATE TABLE missing (id INTEGER);\n")
+    output = strip_ansi(Migrate(config).run())
+    assert output == "Migrating --> V01_02__broken.sql\nV01_02__broken.sql SUCCESS\n"
+    assert [(m.name, m.success) for m in sqlite_connect.get_all_schema_migrations()] == [
+        ('V01_01__orders.sql', True), ('V01_02__broken.sql', True)]
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_rows_affected(sqlite_connect, tmp_path) -> None:
+    # Scripts that run whole count their rows too
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+
+    (tmp_path / "V01_01__orders.sql").write_text("CREATE TABLE orders (id INTEGER);\n"
+                                                 "INSERT INTO orders VALUES (1), (2), (3);\n"
+                                                 "UPDATE orders SET id = id + 10 WHERE id > 1;\n")
+    _ = Migrate(config).run()
+    assert [m.rows_affected for m in sqlite_connect.get_all_schema_migrations()] == [5]
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_history_upgrade(sqlite_connect) -> None:
+    # A history table from before the execution columns existed
+    cnx = sqlite3.connect('./unittest-migrate.sqlite')
+    cnx.execute("DROP TABLE pyway")
+    cnx.execute("CREATE TABLE pyway (installed_rank serial PRIMARY KEY, version varchar(20) NOT NULL, "
+                "extension varchar(20) NOT NULL, name varchar(125) NOT NULL, checksum varchar(25) NOT NULL, "
+                "apply_timestamp timestamp DEFAULT CURRENT_TIMESTAMP)")
+    cnx.execute("INSERT INTO pyway (version, extension, name, checksum) VALUES ('01.01', 'SQL', 'V01_01__test1.sql', "
+                "'8D5A9F5E')")
+    cnx.commit()
+    cnx.close()
+
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    db = factory(config.database_type)(config)
+    migration = db.get_all_schema_migrations()[0]
+    assert migration.name == 'V01_01__test1.sql'
+    assert (migration.execution_time_ms, migration.rows_affected, migration.success) == (None, None, None)
+
+    # Rows from before the upgrade count as applied
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite')
+    db.update_checksum(Migration.from_name('V01_01__test1.sql', config.database_migration_dir))
+    pending = Migrate(config)._get_migration_files_to_be_executed()
+    assert [m.name for m in pending] == ['V01_02__test2.sql', 'V01_03__test3.sql', 'V01_04__test4.sql']
+
+
+@pytest.mark.migrate_test
+@pytest.mark.sqlite_test
+def test_pyway_migrate_time_budget_history(sqlite_connect, tmp_path) -> None:
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-migrate.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = str(tmp_path)
+    config.time_budget = '10m'
+
+    (tmp_path / "V01_01__slow.sql").write_text("CREATE TABLE slow (id INTEGER);\n")
+    migrate = Migrate(config)
+    migration = migrate._get_migration_files_to_be_executed()[0]
+    migration.execution_time_ms = 900000
+    migrate._record_failure(migration)
+
+    # The failed attempt took 15 minutes, which does not fit in 10
+    output = strip_ansi(Migrate(config).run())
+    assert "Stopping before V01_01__slow.sql: predicted 900.0s" in output
@@ -0,0 +1,50 @@
+import os
+import pytest
+from pyway.migrate import Migrate
+from pyway.settings import ConfigFile
+from pyway.throttle import Throttle
+
+
+@pytest.mark.throttle_test
+def test_throttle_pause() -> None:
+    throttle = Throttle(None, "postgres", 0.05)
+    latencies = iter([0.01, 0.2, 0.3, 0.2, 0.01, 0.01, 0.01])
+    throttle.measure = lambda: next(latencies)  # type: ignore[method-assign]
+    pauses = []
+    throttle.sleep = pauses.append
+
+    for _ in range(7):
+        throttle.wait()
+
+    # Doubles while over the target, halves back down once under it
+    assert pauses == [0.1, 0.2, 0.4, 0.2, 0.1]
+    assert throttle.pause == 0.0
+
+
+@pytest.mark.throttle_test
+def test_throttle_from_config() -> None:
+    config = ConfigFile()
+    config.database_type = "oracle"
+    assert Throttle.from_config(None, config) is None
+
+    config.throttle_latency = '50ms'
+    throttle = Throttle.from_config(None, config)
+    assert throttle is not None
+    assert throttle.latency == 0.05
+    assert throttle.probe == "SELECT 1 FROM dual"
+
+
+@pytest.mark.throttle_test
+@pytest.mark.sqlite_test
+def test_throttle_migrate() -> None:
+    if os.path.exists("./unittest-throttle.sqlite"):
+        os.remove("./unittest-throttle.sqlite")
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = './unittest-throttle.sqlite'
+    config.database_table = 'pyway'
+    config.database_migration_dir = os.path.join('tests', 'data', 'schema-sqlite')
+    config.throttle_latency = '1s'
+
+    output = Migrate(config).run()
+    assert output.count("SUCCESS") == 4
@@ -0,0 +1,122 @@
+import json
+import os
+import sys
+import pytest
+
+from pyway.configfile import ConfigFile
+from pyway.dbms.database import factory
+from pyway.migrate import Migrate
+from pyway.tracing import tracer
+
+
+@pytest.fixture
+def config(tmp_path):
+    if os.path.exists("./unittest-tracing.sqlite"):
+        os.remove("./unittest-tracing.sqlite")
+    config = ConfigFile()
+    config.database_type = "sqlite"
+    config.database_name = "./unittest-tracing.sqlite"
+    config.database_table = "pyway"
+    config.database_migration_dir = str(tmp_path / "migrations")
+    config.trace_file = str(tmp_path / "trace.jsonl")
+    os.mkdir(config.database_migration_dir)
+    factory(config.database_type)(config)
+    yield config
+    tracer.shutdown()
+
+
+def spans(config):
+    with open(config.trace_file, "r", encoding="utf-8") as trace:
+        return [json.loads(line) for line in trace]
+
+
+@pytest.mark.tracing_test
+@pytest.mark.sqlite_test
+def test_tracing_migrate(config) -> None:
+    config.lock_retries = "1"
+    path = os.path.join(config.database_migration_dir, "V01_01__orders.sql")
+    with open(path, "w", encoding="utf-8") as sqlfile:
+        sqlfile.write("CREATE TABLE orders (id INTEGER);\nINSERT INTO orders VALUES (1), (2);\n")
+    tracer.configure(config)
+    with tracer.span("pyway migrate", {"pyway.command": "migrate"}):
+        _ = Migrate(config).run()
+    tracer.shutdown()
+
+    found = spans(config)
+    assert [s["name"] for s in found] == ["checksum", "local scan", "history fetch", "statement", "statement",
+                                          "migration", "pyway migrate"]
+    by_name = {s["name"]: s for s in found}
+    command = by_name["pyway migrate"]
+    assert command["parent_span_id"] is None
+    assert all(s["trace_id"] == command["trace_id"] for s in found)
+    assert by_name["local scan"]["parent_span_id"] == command["span_id"]
+    assert by_name["checksum"]["parent_span_id"] == by_name["local scan"]["span_id"]
+    assert by_name["checksum"]["attributes"]["pyway.file.size"] == os.path.getsize(path)
+    assert by_name["history fetch"]["attributes"]["pyway.migrations"] == 0
+
+    migration = by_name["migration"]
+    assert migration["attributes"]["pyway.migration"] == "V01_01__orders.sql"
+    assert migration["attributes"]["db.system"] == "sqlite"
+    assert migration["attributes"]["db.rows_affected"] == 2
+    insert = found[4]
+    assert insert["parent_span_id"] == migration["span_id"]
+    assert insert["attributes"]["db.statement"] == "INSERT INTO orders VALUES (1), (2)"
+    assert insert["attributes"]["db.rows_affected"] == 2
+    assert insert["attributes"]["db.lock_wait_ms"] == 0
+    assert all(s["status"] == "OK" and s["duration_ms"] >= 0 for s in found)
+
+
+@pytest.mark.tracing_test
+@pytest.mark.sqlite_test
+def test_tracing_statements(config) -> None:
+    # Tracing alone is enough for statement spans
+    with open(os.path.join(config.database_migration_dir, "V01_01__orders.sql"), "w", encoding="utf-8") as sqlfile:
+        sqlfile.write("CREATE TABLE orders (id INTEGER);\nINSERT INTO orders VALUES (1), (2);\n")
+    tracer.configure(config)
+    _ = Migrate(config).run()
+    tracer.shutdown()
+
+    found = spans(config)
+    assert [s["name"] for s in found] == ["checksum", "local scan", "history fetch", "statement", "statement",
+                                          "migration"]
+    assert [s["attributes"]["db.statement"] for s in found[3:5]] == ["CREATE TABLE orders (id INTEGER)",
+                                                                     "INSERT INTO orders VALUES (1), (2)"]
+    assert found[4]["attributes"]["db.rows_affected"] == 2
+
+
+@pytest.mark.tracing_test
+@pytest.mark.sqlite_test
+def test_tracing_error(config) -> None:
+    with open(os.path.join(config.database_migration_dir, "V01_01__broken.sql"), "w", encoding="utf-8") as sqlfile:
+        sqlfile.write("INSERT INTO missing VALUES (1);\n")
+    tracer.configure(config)
+    with pytest.raises(RuntimeError):
+        _ = Migrate(config).run()
+    tracer.shutdown()
+
+    migration = [s for s in spans(config) if s["name"] == "migration"][0]
+    assert migration["status"] == "ERROR"
+    assert "no such table: missing" in migration["error"]
+
+
+@pytest.mark.tracing_test
+def test_tracing_disabled(tmp_path) -> None:
+    config = ConfigFile()
+    tracer.configure(config)
+    with tracer.span("pyway info", {"pyway.command": "info"}) as span:
+        span.set("pyway.migrations", 1)
+    assert not tracer.enabled
+    assert not os.listdir(tmp_path)
+
+
+@pytest.mark.tracing_test
+def test_tracing_otlp_not_installed(config, monkeypatch) -> None:
+    # Without the OpenTelemetry SDK, spans still go to the trace file
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+    monkeypatch.setitem(sys.modules, "opentelemetry.exporter.otlp.proto.http.trace_exporter", None)
+    tracer.configure(config)
+    assert tracer.otel is None
+    with tracer.span("pyway info"):
+        pass
+    tracer.shutdown()
+    assert [s["name"] for s in spans(config)] == ["pyway info"]